@@ -9,6 +9,8 @@ class Embroidery(models.Model):
     title = models.CharField(max_length=100)  # ডিজাইনের নাম/শিরোনাম
     description = models.TextField(blank=True, null=True)  # ডিজাইনের বিস্তারিত
     design_image = models.ImageField(upload_to="embroidery_designs/", blank=True, null=True)  
+    # Upload whose thumbnails exist, set by image_variants so templates need not probe storage
+    derivatives_for = models.CharField(max_length=255, blank=True, default='')
 
     fabric_type = models.CharField(max_length=50, blank=True, null=True)  # যেমন: cotton, silk, linen
     thread_type = models.CharField(max_length=50, blank=True, null=True)  # যেমন: polyester, silk thread
@@ -30,6 +32,11 @@ class Embroidery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Catalog API sync order
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='embroidery_updated_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.tailor.business_name}"
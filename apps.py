@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class DorziConfig(AppConfig):
+    name = 'dorzi'
+
+    def ready(self):
+        # Registers the catalog API, catalog cache, image derivative, earnings rollup, search index, workload
+        # and stock signals
+        from . import (catalog_api, catalog_cache, delivery_schedule, earnings, image_variants,  # noqa: F401
+                       product_search, stock)
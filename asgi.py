@@ -0,0 +1,16 @@
+"""
+ASGI config for dorzi project.
+
+Serve with an ASGI server, e.g. ``uvicorn dorzi.asgi:application``. The
+small JSON endpoints the pages call constantly (favorites, dress and
+embroidery details, tailor_api) are async views, so under ASGI they wait
+on the database without holding a worker each.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dorzi.settings')
+
+application = get_asgi_application()
@@ -0,0 +1,271 @@
+"""
+Read-only REST API over the catalog, mounted at ``api/v1/``.
+
+Tailors, pre-designed products, fabrics and embroidery designs are listed
+in ``(updated_at, id)`` order with cursor pagination, so a client can sync
+incrementally: it follows ``next`` links to the end, then comes back later
+with ``?updated_since=`` set to the newest ``updated_at`` it has.
+``?fields=id,title`` trims each object to the fields named. Each
+serializer declares the related rows it reads, and the viewset loads them
+with ``select_related``/``prefetch_related``.
+
+Responses carry an ETag and Last-Modified derived from ``updated_at``: the
+newest change and row count of the filtered list, or the object itself.
+Unchanged resources answer conditional requests with 304 before anything
+is serialized. So every change to a serialized value must move the row's
+``updated_at``: queryset updates set it with ``Now()``, and the receivers
+below touch a product when its images change and a tailor when its user's
+name changes.
+
+Deleted rows leave a CatalogDeletion behind, listed at ``deleted/`` in the
+same order and with the same ``?updated_since=`` filter, so a syncing
+client can drop them too.
+"""
+import hashlib
+
+from django.contrib.auth.models import User
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Count, Max
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
+from rest_framework import serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.routers import DefaultRouter
+
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image, PreDesigned
+from tailor.models import Tailor
+from .models import CatalogDeletion
+
+API_VERSION = 'v1'
+
+
+class CatalogCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        return (view.updated_field, 'id')
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """Drops every field not listed in the request's ``?fields=``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request else None
+        if requested:
+            wanted = {name.strip() for name in requested.split(',')}
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class TailorSerializer(SparseFieldsSerializer):
+    select_related = ('user',)
+    prefetch_related = ()
+
+    name = serializers.CharField(source='user.get_full_name', read_only=True)
+
+    class Meta:
+        model = Tailor
+        fields = ('id', 'name', 'business_name', 'business_location', 'category', 'expertise', 'price',
+                  'average_rating', 'review_count', 'is_available', 'profile_picture', 'updated_at')
+
+
+class PreDesignedSerializer(SparseFieldsSerializer):
+    select_related = ()
+    prefetch_related = ('images',)
+
+    images = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PreDesigned
+        fields = ('id', 'tailor', 'title', 'description', 'category', 'gender', 'price', 'availability',
+                  'fabric_type', 'thread_type', 'color', 'estimated_time', 'images', 'created_at', 'updated_at')
+
+    def get_images(self, product):
+        request = self.context.get('request')
+        urls = [image.image.url for image in product.images.all()]
+        return [request.build_absolute_uri(url) for url in urls] if request else urls
+
+
+class FabricSerializer(SparseFieldsSerializer):
+    select_related = ()
+    prefetch_related = ()
+
+    class Meta:
+        model = Fabric
+        fields = ('id', 'tailor', 'name', 'description', 'fabric_type', 'color', 'pattern', 'texture', 'width',
+                  'length_available', 'price_per_meter', 'image', 'is_available', 'updated_at')
+
+
+class EmbroiderySerializer(SparseFieldsSerializer):
+    select_related = ()
+    prefetch_related = ()
+
+    class Meta:
+        model = Embroidery
+        fields = ('id', 'tailor', 'title', 'description', 'design_image', 'fabric_type', 'thread_type', 'color',
+                  'complexity_level', 'price', 'estimated_time', 'updated_at')
+
+
+class DeletionSerializer(SparseFieldsSerializer):
+    select_related = ()
+    prefetch_related = ()
+
+    class Meta:
+        model = CatalogDeletion
+        fields = ('kind', 'object_id', 'deleted_at')
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+class CatalogViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = [AllowAny]
+    pagination_class = CatalogCursorPagination
+    # Fields accepted as equality filters, e.g. ?tailor=3
+    filter_fields = ()
+    # Moves on every change; orders pages and feeds the validators
+    updated_field = 'updated_at'
+
+    def get_queryset(self):
+        serializer_class = self.get_serializer_class()
+        queryset = self.queryset.select_related(*serializer_class.select_related)
+        queryset = queryset.prefetch_related(*serializer_class.prefetch_related)
+        for name in self.filter_fields:
+            value = self.request.query_params.get(name)
+            if value is not None:
+                try:
+                    queryset = queryset.filter(**{name: value})
+                except (ValueError, DjangoValidationError):
+                    raise ValidationError({name: f'Invalid value: {value}'})
+        updated_since = self.request.query_params.get('updated_since')
+        if updated_since:
+            moment = parse_datetime(updated_since)
+            if moment is None:
+                raise ValidationError({'updated_since': 'Use an ISO 8601 date and time.'})
+            queryset = queryset.filter(**{f'{self.updated_field}__gt': moment})
+        return queryset
+
+    @staticmethod
+    def _not_modified(request, etag, last_modified):
+        # get_conditional_response wants the Django request and a timestamp
+        return get_conditional_response(request._request, etag=etag,
+                                        last_modified=last_modified.timestamp() if last_modified else None)
+
+    @staticmethod
+    def _with_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Clients and proxies may store responses but must revalidate them
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # One aggregate answers the revalidation; deletes change the count
+        state = queryset.order_by().aggregate(count=Count('id'), latest=Max(self.updated_field))
+        etag = _etag(API_VERSION, request.get_full_path(), state['count'], state['latest'])
+        response = self._not_modified(request, etag, state['latest'])
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self._with_validators(response, etag, state['latest'])
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        updated = getattr(instance, self.updated_field)
+        etag = _etag(API_VERSION, request.get_full_path(), instance.pk, updated)
+        response = self._not_modified(request, etag, updated)
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self._with_validators(response, etag, updated)
+
+
+class TailorViewSet(CatalogViewSet):
+    queryset = Tailor.objects.all()
+    serializer_class = TailorSerializer
+    filter_fields = ('category', 'is_available')
+
+
+class PreDesignedViewSet(CatalogViewSet):
+    queryset = PreDesigned.objects.all()
+    serializer_class = PreDesignedSerializer
+    filter_fields = ('tailor', 'category', 'gender')
+
+
+class FabricViewSet(CatalogViewSet):
+    queryset = Fabric.objects.all()
+    serializer_class = FabricSerializer
+    filter_fields = ('tailor', 'fabric_type', 'is_available')
+
+
+class EmbroideryViewSet(CatalogViewSet):
+    queryset = Embroidery.objects.all()
+    serializer_class = EmbroiderySerializer
+    filter_fields = ('tailor', 'complexity_level')
+
+
+class DeletionViewSet(CatalogViewSet):
+    queryset = CatalogDeletion.objects.all()
+    serializer_class = DeletionSerializer
+    filter_fields = ('kind',)
+    updated_field = 'deleted_at'
+
+
+# API resource name of each catalog model, as recorded in CatalogDeletion.kind
+RESOURCE_NAMES = {Tailor: 'tailors', PreDesigned: 'products', Fabric: 'fabrics', Embroidery: 'embroidery'}
+
+
+def touch_products(product_ids):
+    """Move ``updated_at`` of products whose images changed without a product save."""
+    PreDesigned.objects.filter(pk__in=product_ids).update(updated_at=Now())
+
+
+@receiver([post_save, post_delete], sender=Image)
+def image_changed(sender, instance, **kwargs):
+    touch_products([instance.predesigned_id])
+
+
+@receiver(post_init, sender=User)
+def remember_user_name(sender, instance, **kwargs):
+    # __dict__ so users loaded with only() are not fetched again
+    instance._catalog_name = (instance.__dict__.get('first_name'), instance.__dict__.get('last_name'))
+
+
+@receiver(post_save, sender=User)
+def user_name_changed(sender, instance, created, **kwargs):
+    # TailorSerializer.name is the user's full name
+    name = (instance.__dict__.get('first_name'), instance.__dict__.get('last_name'))
+    if not created and name != instance._catalog_name:
+        Tailor.objects.filter(user_id=instance.pk).update(updated_at=Now())
+    instance._catalog_name = name
+
+
+@receiver(post_delete, sender=Tailor)
+@receiver(post_delete, sender=PreDesigned)
+@receiver(post_delete, sender=Fabric)
+@receiver(post_delete, sender=Embroidery)
+def record_deletion(sender, instance, **kwargs):
+    CatalogDeletion.objects.create(kind=RESOURCE_NAMES[sender], object_id=instance.pk)
+
+
+router = DefaultRouter()
+router.register('tailors', TailorViewSet, basename='catalog-tailor')
+router.register('products', PreDesignedViewSet, basename='catalog-product')
+router.register('fabrics', FabricViewSet, basename='catalog-fabric')
+router.register('embroidery', EmbroideryViewSet, basename='catalog-embroidery')
+router.register('deleted', DeletionViewSet, basename='catalog-deletion')
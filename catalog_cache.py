@@ -0,0 +1,188 @@
+"""
+Caching for the anonymous catalog pages.
+
+Anonymous visitors to ``home``, ``findTailor`` and ``pre_designed`` all see
+the same HTML, so ``cache_anonymous_page`` stores the rendered page and
+serves later hits without running the view. The one per-visitor value on
+those pages, the login form's CSRF token, is rendered as a placeholder and
+swapped for the visitor's own token on every response.
+
+Individual tailor cards are also cached as template fragments (see
+templatetags/catalog_tags.py), so a page miss after a single tailor changes
+re-renders only that tailor's card. Signed-in visitors, whose pages are not
+cached, share a second copy of each card. That copy is rendered for
+``PLACEHOLDER_USER``, and the visitor's name, contact details and CSRF token
+are filled in by ``fill_user_placeholders``. Their favorite hearts come
+from ``favorite_tailor_ids``.
+
+Saves and deletes of any model shown on the catalog drop the affected
+tailor's cards and bump a catalog version that is part of every page key,
+which retires all cached pages at once. With a read replica, pages filled
+within ``REPLICA_PIN_SECONDS`` of a bump read the primary, so a lagging
+replica's rows are never stored under the new version.
+"""
+import hashlib
+from functools import wraps
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image, PreDesigned
+from reviews.models import Reviews
+from tailor.models import Tailor
+from .db_router import pin_request_to_primary, replica_alias
+
+# Fragment names used with {% anonymous_cache %} for tailor cards
+TAILOR_CARD_FRAGMENTS = ('home_tailor_card', 'find_tailor_card')
+
+CSRF_PLACEHOLDER = 'csrf-token-placeholder-5f2d8c'
+# Vary-on suffix of the card copies shared by signed-in visitors
+SIGNED_IN_VARIANT = 'signed-in'
+VERSION_KEY = 'catalog:version'
+# Present for REPLICA_PIN_SECONDS after each version bump
+RECENT_BUMP_KEY = 'catalog:recent-bump'
+
+
+def cache_timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 600)
+
+
+def catalog_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+    if replica_alias():
+        cache.set(RECENT_BUMP_KEY, True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+
+def invalidate_tailor(tailor_id):
+    """Drop a tailor's cached cards and every cached catalog page."""
+    if tailor_id is not None:
+        cache.delete_many([make_template_fragment_key(name, vary_on)
+                           for name in TAILOR_CARD_FRAGMENTS
+                           for vary_on in ([tailor_id], [tailor_id, SIGNED_IN_VARIANT])])
+    bump_catalog_version()
+
+
+def csrf_placeholder(request):
+    """Context processor: render a placeholder CSRF token on pages being cached."""
+    if getattr(request, 'cacheable_page', False):
+        return {'csrf_token': CSRF_PLACEHOLDER}
+    return {}
+
+
+class _PlaceholderUser:
+    """Stands in for the signed-in visitor while a shared card is rendered."""
+    is_authenticated = True
+    is_anonymous = False
+    id = pk = None
+    email = 'user-email-placeholder-5f2d8c'
+    customer = SimpleNamespace(phone='user-phone-placeholder-5f2d8c', address='user-address-placeholder-5f2d8c')
+
+    def get_full_name(self):
+        return 'user-full-name-placeholder-5f2d8c'
+
+
+PLACEHOLDER_USER = _PlaceholderUser()
+
+
+def fill_user_placeholders(content, request):
+    """Put the visitor's own details and CSRF token into a shared card."""
+    values = getattr(request, '_card_user_values', None)
+    if values is None:
+        # Once per request, however many cards the page shows
+        user = request.user
+        customer = getattr(user, 'customer', None)
+        values = request._card_user_values = [
+            (placeholder, str(conditional_escape(value))) for placeholder, value in (
+                (PLACEHOLDER_USER.get_full_name(), user.get_full_name()),
+                (PLACEHOLDER_USER.email, user.email),
+                # As the template renders them: '' without a profile, 'None' for an empty field
+                (PLACEHOLDER_USER.customer.phone, customer.phone if customer else ''),
+                (PLACEHOLDER_USER.customer.address, customer.address if customer else ''),
+                (CSRF_PLACEHOLDER, get_token(request)),
+            )]
+    for placeholder, value in values:
+        content = content.replace(placeholder, value)
+    return mark_safe(content)
+
+
+def _with_csrf_token(request, content, content_type):
+    return HttpResponse(content.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode()),
+                        content_type=content_type)
+
+
+def _fill_csrf_token(request, response):
+    placeholder, token = CSRF_PLACEHOLDER.encode(), get_token(request).encode()
+    if response.streaming:
+        response.streaming_content = (chunk.replace(placeholder, token) for chunk in response.streaming_content)
+    else:
+        response.content = response.content.replace(placeholder, token)
+    return response
+
+
+def cache_anonymous_page(view):
+    """Serve GET requests from anonymous visitors from the page cache."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        key = f'catalog:page:{catalog_version()}:{view.__name__}:{path_hash}'
+        cached = cache.get(key)
+        if cached is not None:
+            return _with_csrf_token(request, *cached)
+
+        request.cacheable_page = True
+        if replica_alias() and cache.get(RECENT_BUMP_KEY):
+            # The replica may not have the change yet, and this page is kept under the new version
+            pin_request_to_primary()
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200 or response.streaming or response.cookies:
+            # Rendered with the placeholder but not stored: still needs the real token
+            return _fill_csrf_token(request, response)
+        cached = (response.content, response['Content-Type'])
+        cache.set(key, cached, cache_timeout())
+        return _with_csrf_token(request, *cached)
+    return wrapper
+
+
+def catalog_tailor_id(instance):
+    """Id of the tailor whose catalog cards show ``instance``, or None."""
+    if isinstance(instance, Tailor):
+        return instance.pk
+    if isinstance(instance, Image):
+        # The product may already be gone when its images are cascade-deleted
+        return (PreDesigned.objects.filter(pk=instance.predesigned_id)
+                .values_list('tailor_id', flat=True).first())
+    return getattr(instance, 'tailor_id', None)
+
+
+@receiver([post_save, post_delete], sender=Tailor)
+@receiver([post_save, post_delete], sender=PreDesigned)
+@receiver([post_save, post_delete], sender=Image)
+@receiver([post_save, post_delete], sender=Reviews)
+@receiver([post_save, post_delete], sender=Fabric)
+@receiver([post_save, post_delete], sender=Embroidery)
+def catalog_item_changed(sender, instance, **kwargs):
+    invalidate_tailor(catalog_tailor_id(instance))
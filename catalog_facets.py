@@ -0,0 +1,140 @@
+"""
+Facet counts for the pre-designed catalog.
+
+``facet_counts`` answers "how many products would each filter value give"
+for category, gender, color, fabric type, price bucket and availability.
+One grouped query counts the products matching the search text for every
+combination of facet values. Each facet is then summed in Python over the
+combinations that pass the other selected filters. A facet's own selection
+is left out, so choosing "Saree" still shows how many "Punjabi" products
+there are. The number of combinations depends on the distinct values, not
+on the catalog size.
+
+Results are cached per normalized filter set under the catalog version,
+which catalog_cache bumps whenever a product is saved or deleted.
+"""
+import hashlib
+import json
+from collections import Counter
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Q, Value, When
+
+from pre_designed.models import PreDesigned
+from .catalog_cache import cache_timeout, catalog_version
+from .product_search import get_backend, search_terms
+
+FACET_FIELDS = ('category', 'gender', 'color', 'fabric_type')
+# (value, lower bound inclusive, upper bound exclusive)
+PRICE_BUCKETS = (
+    ('0-500', None, 500),
+    ('500-1000', 500, 1000),
+    ('1000-2000', 1000, 2000),
+    ('2000-3000', 2000, 3000),
+    ('3000-5000', 3000, 5000),
+    ('5000+', 5000, None),
+)
+AVAILABILITY = ('in_stock', 'sold_out')
+FACETS = FACET_FIELDS + ('price', 'availability')
+
+
+def parse_filters(params):
+    """Selected facet values from query parameters, deduplicated and sorted."""
+    filters = {}
+    for facet in FACETS:
+        values = {value.strip() for value in params.getlist(facet) if value.strip()}
+        if facet == 'price':
+            values &= {bucket[0] for bucket in PRICE_BUCKETS}
+        elif facet == 'availability':
+            values &= set(AVAILABILITY)
+        if values:
+            filters[facet] = sorted(values)
+    return filters
+
+
+def _price_q(bucket):
+    _, low, high = next(b for b in PRICE_BUCKETS if b[0] == bucket)
+    q = Q()
+    if low is not None:
+        q &= Q(price__gte=Decimal(low))
+    if high is not None:
+        q &= Q(price__lt=Decimal(high))
+    return q
+
+
+def filter_products(queryset, filters):
+    """Apply parsed facet filters: values of one facet are ORed, facets are ANDed."""
+    for facet in FACET_FIELDS:
+        if facet in filters:
+            queryset = queryset.filter(**{f'{facet}__in': filters[facet]})
+    if 'price' in filters:
+        price_q = Q()
+        for bucket in filters['price']:
+            price_q |= _price_q(bucket)
+        queryset = queryset.filter(price_q)
+    if filters.get('availability') == ['in_stock']:
+        queryset = queryset.filter(availability__gt=0)
+    elif filters.get('availability') == ['sold_out']:
+        queryset = queryset.filter(availability=0)
+    return queryset
+
+
+def _price_bucket():
+    return Case(
+        *[When(_price_q(value), then=Value(value)) for value, _, _ in PRICE_BUCKETS],
+        default=Value(None), output_field=CharField(),
+    )
+
+
+def _combinations(terms):
+    products = get_backend().filter(PreDesigned.objects.all(), terms)
+    return list(
+        products.annotate(
+            price_bucket=_price_bucket(),
+            stock=Case(When(availability__gt=0, then=Value('in_stock')), default=Value('sold_out'),
+                       output_field=CharField()),
+        )
+        .values(*FACET_FIELDS, 'price_bucket', 'stock').order_by()
+        .annotate(count=Count('id'))
+    )
+
+
+def _row_value(row, facet):
+    if facet == 'price':
+        return row['price_bucket']
+    if facet == 'availability':
+        return row['stock']
+    return row[facet]
+
+
+def facet_counts(query, filters):
+    """
+    ``{'total': n, 'facets': {facet: [{'value', 'count', 'selected'}, ...]}}``
+    for products matching ``query``, most common values first.
+    """
+    terms = search_terms(query)
+    normalized = json.dumps({'q': terms, 'filters': filters}, sort_keys=True)
+    key = f'catalog:facets:{catalog_version()}:{hashlib.md5(normalized.encode()).hexdigest()}'
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    rows = _combinations(terms)
+
+    def passes(row, skip=None):
+        return all(_row_value(row, facet) in values for facet, values in filters.items() if facet != skip)
+
+    facets = {}
+    for facet in FACETS:
+        counts = Counter()
+        for row in rows:
+            value = _row_value(row, facet)
+            if value not in (None, '') and passes(row, skip=facet):
+                counts[value] += row['count']
+        selected = set(filters.get(facet, ()))
+        facets[facet] = [{'value': value, 'count': count, 'selected': value in selected}
+                         for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+    result = {'total': sum(row['count'] for row in rows if passes(row)), 'facets': facets}
+    cache.set(key, result, cache_timeout())
+    return result
@@ -65,6 +65,8 @@ class TOrders(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='torders')
     tailor = models.ForeignKey(Tailor, on_delete=models.CASCADE, related_name='torders')
     embroidery = models.ForeignKey(Embroidery, on_delete=models.SET_NULL, related_name='torders', null=True, blank=True)
+    # Work days quoted at checkout, covering every selected embroidery (see delivery_schedule)
+    work_days = models.DecimalField(max_digits=8, decimal_places=2, null=True, blank=True)
     
     order_date = models.DateTimeField(auto_now_add=True)
     address = models.TextField()
@@ -105,6 +107,12 @@ class TOrders(models.Model):
         ('canceled', 'Canceled'),
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')  # Order Status
+
+    class Meta:
+        indexes = [
+            # Covers the customer order feed, which sorts on delivery date (see order_feed.py)
+            models.Index(fields=['customer', 'delivery_date', 'id'], name='torders_customer_delivery_idx'),
+        ]
     
     def get_total_price(self):
         """
@@ -17,6 +17,8 @@ class Customer(models.Model):
     phone = models.CharField(max_length=15, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to="customer_profiles/", blank=True, null=True)
+    # Upload whose thumbnails exist, set by image_variants so templates need not probe storage
+    derivatives_for = models.CharField(max_length=255, blank=True, default='')
     
 
     def __str__(self):
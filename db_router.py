@@ -0,0 +1,110 @@
+"""
+Primary/replica database routing.
+
+With a replica configured (``DATABASE_REPLICA_ALIAS``), reads of catalog
+models (tailors, pre-designed products, fabrics, embroidery, reviews) made
+while serving a request go to the replica. Everything else, and every
+write, goes to ``default``. Reads outside a request, such as management
+commands and workers, stay on the primary.
+
+Replicas lag, so ``ReplicaPinMiddleware`` gives read-your-writes: a request
+that writes, or uses an unsafe method, is served entirely from the primary,
+and it sets a short-lived cookie that pins that visitor's next requests to
+the primary for ``REPLICA_PIN_SECONDS``, until the replica has caught up.
+
+Cached catalog pages outlive the request that filled them, so a page
+filled from a replica that has not yet seen a catalog change would stay
+stale under the new catalog version. ``cache_anonymous_page`` calls
+``pin_request_to_primary`` for pages filled within ``REPLICA_PIN_SECONDS``
+of a catalog change.
+
+Locally, ``DORZI_REPLICA_DB`` names a second SQLite file and ``manage.py
+replicate_db`` keeps it in sync.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+CATALOG_APPS = frozenset({'tailor', 'pre_designed', 'fabrics', 'embroidery', 'reviews'})
+PRIMARY = 'default'
+PIN_COOKIE = 'dorzi_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Per request: {'pinned': bool, 'wrote': bool}; None outside requests
+_request_state = ContextVar('replica_routing', default=None)
+
+
+def replica_alias():
+    return getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+
+
+def pin_request_to_primary():
+    """Serve the rest of the current request from the primary; later requests are not pinned."""
+    state = _request_state.get()
+    if state is not None:
+        state['pinned'] = True
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        alias = replica_alias()
+        if alias and state is not None and not state['pinned'] and model._meta.app_label in CATALOG_APPS:
+            return alias
+        # None lets related lookups follow the database their instance came from
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['pinned'] = state['wrote'] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from replication, not from migrate
+        return db == PRIMARY
+
+
+class ReplicaPinMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _start(request):
+        pinned = request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+        return _request_state.set({'pinned': pinned, 'wrote': False})
+
+    @staticmethod
+    def _finish(request, response):
+        state = _request_state.get()
+        if replica_alias() and (state['wrote'] or request.method not in SAFE_METHODS):
+            response.set_cookie(PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                                httponly=True, samesite='Lax')
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self._start(request)
+        try:
+            return self._finish(request, self.get_response(request))
+        finally:
+            _request_state.reset(token)
+
+    async def __acall__(self, request):
+        token = self._start(request)
+        try:
+            return self._finish(request, await self.get_response(request))
+        finally:
+            _request_state.reset(token)
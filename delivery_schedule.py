@@ -0,0 +1,215 @@
+"""
+Delivery date quotes that account for each tailor's workload.
+
+TailorWorkload keeps, per tailor, the number of open (pending or
+processing) orders and the business days of work they still need. Signals
+add an order's work when it is placed and take it out when it is shipped,
+delivered, canceled or deleted, so a quote reads one row instead of the
+tailor's order history. ``BusinessCalendar`` counts business days past the
+weekend and Holiday rows with date arithmetic and a binary search over the
+holidays, whatever the distance.
+
+A custom order needs DELIVERY_CUSTOM_ORDER_DAYS plus the ``estimated_time``
+of its embroidery designs, stored on the order as ``work_days`` when it is
+placed (older orders fall back to their single ``embroidery``); a
+pre-designed order needs DELIVERY_DRESS_ORDER_DAYS per
+piece. A tailor works through DELIVERY_DAILY_CAPACITY days of work per
+business day. A new order is ready once the backlog ahead of it and its
+own work are done, and never sooner than the minimum lead time for its kind.
+
+Queryset ``update()`` calls bypass the signals; code changing statuses in
+bulk calls ``apply_status_change`` itself, and ``rebuild_workloads`` (the
+``rebuild_workloads`` command) recomputes everything from the orders.
+"""
+import math
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from custom_order.models import TOrders
+from dress_order.models import Order
+from .models import Holiday, TailorWorkload
+
+OPEN_STATUSES = ('pending', 'processing')
+HOLIDAYS_KEY = 'schedule:holidays'
+HOLIDAYS_TIMEOUT = 3600
+DAY = Decimal('0.01')
+
+
+class BusinessCalendar:
+    """Business-day arithmetic over a weekend and a set of holidays."""
+
+    def __init__(self, holidays=(), weekend=(4,)):
+        self.weekend = frozenset(weekend)
+        self.week_length = 7 - len(self.weekend)
+        # Holidays falling on a weekend day do not change any count
+        self.holidays = sorted(day for day in set(holidays) if day.weekday() not in self.weekend)
+
+    def _holidays_between(self, start, end):
+        """Holidays after ``start``, up to and including ``end``."""
+        return bisect_right(self.holidays, end) - bisect_right(self.holidays, start)
+
+    def _add_weekdays(self, day, count):
+        if count <= 0:
+            return day
+        # Any seven consecutive days hold exactly week_length working weekdays
+        weeks, rest = divmod(count - 1, self.week_length)
+        day += timedelta(weeks=weeks)
+        rest += 1
+        while rest:
+            day += timedelta(days=1)
+            if day.weekday() not in self.weekend:
+                rest -= 1
+        return day
+
+    def add_business_days(self, start, count):
+        """The ``count``-th business day after ``start``."""
+        end = self._add_weekdays(start, count)
+        skipped = self._holidays_between(start, end)
+        while skipped:
+            start, end = end, self._add_weekdays(end, skipped)
+            skipped = self._holidays_between(start, end)
+        return end
+
+
+def get_calendar():
+    holidays = cache.get(HOLIDAYS_KEY)
+    if holidays is None:
+        holidays = list(Holiday.objects.filter(day__gte=timezone.localdate()).values_list('day', flat=True))
+        cache.set(HOLIDAYS_KEY, holidays, HOLIDAYS_TIMEOUT)
+    return BusinessCalendar(holidays, weekend=getattr(settings, 'DELIVERY_WEEKEND_DAYS', (4,)))
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def holidays_changed(sender, **kwargs):
+    cache.delete(HOLIDAYS_KEY)
+
+
+def duration_days(duration):
+    """An ``estimated_time`` as (fractional) work days."""
+    if not duration:
+        return Decimal('0.00')
+    return (Decimal(duration.total_seconds()) / 86400).quantize(DAY)
+
+
+def _setting_days(name, default):
+    return Decimal(str(getattr(settings, name, default)))
+
+
+def custom_order_work(embroideries=()):
+    return _setting_days('DELIVERY_CUSTOM_ORDER_DAYS', 3) + sum(
+        (duration_days(embroidery.estimated_time) for embroidery in embroideries), Decimal('0.00'))
+
+
+def dress_order_work(quantity):
+    return _setting_days('DELIVERY_DRESS_ORDER_DAYS', 1) * max(quantity, 1)
+
+
+def order_work(order):
+    if isinstance(order, TOrders):
+        if order.work_days is not None:
+            return order.work_days
+        return custom_order_work([order.embroidery] if order.embroidery_id else [])
+    return dress_order_work(order.quantity)
+
+
+def earliest_delivery(tailor, work, min_lead, start=None):
+    """
+    Earliest delivery date for a new order needing ``work`` days from
+    ``tailor``, counting from ``start`` (today by default).
+    """
+    start = start or timezone.localdate()
+    backlog = (TailorWorkload.objects.filter(tailor=tailor)
+               .values_list('backlog_days', flat=True).first() or Decimal('0.00'))
+    capacity = _setting_days('DELIVERY_DAILY_CAPACITY', 2)
+    days = max(min_lead, math.ceil((backlog + work) / capacity))
+    return get_calendar().add_business_days(start, days)
+
+
+def custom_order_delivery(tailor, embroideries=(), start=None):
+    return earliest_delivery(tailor, custom_order_work(embroideries),
+                             getattr(settings, 'DELIVERY_CUSTOM_MIN_LEAD', 21), start)
+
+
+def dress_order_delivery(tailor, quantity=1, start=None):
+    return earliest_delivery(tailor, dress_order_work(quantity),
+                             getattr(settings, 'DELIVERY_DRESS_MIN_LEAD', 8), start)
+
+
+def _apply(tailor_id, orders, work, create=True):
+    if not orders and not work:
+        return
+    with transaction.atomic():
+        if create:
+            TailorWorkload.objects.get_or_create(tailor_id=tailor_id)
+        TailorWorkload.objects.filter(tailor_id=tailor_id).update(
+            open_orders=F('open_orders') + orders, backlog_days=F('backlog_days') + work)
+
+
+def apply_status_change(order, old_status):
+    """Move an order's work into or out of its tailor's backlog after a status change."""
+    was_open, is_open = old_status in OPEN_STATUSES, order.status in OPEN_STATUSES
+    if was_open != is_open:
+        sign = 1 if is_open else -1
+        _apply(order.tailor_id, sign, sign * order_work(order))
+
+
+@receiver(post_init, sender=TOrders)
+@receiver(post_init, sender=Order)
+def remember_status(sender, instance, **kwargs):
+    instance._schedule_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=TOrders)
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    if created:
+        if instance.status in OPEN_STATUSES:
+            _apply(instance.tailor_id, 1, order_work(instance))
+    elif instance._schedule_status is not None:
+        apply_status_change(instance, instance._schedule_status)
+    instance._schedule_status = instance.status
+
+
+@receiver(post_delete, sender=TOrders)
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    if instance.status in OPEN_STATUSES:
+        # Never recreate a row here: the tailor may be the one being deleted
+        _apply(instance.tailor_id, -1, -order_work(instance), create=False)
+
+
+def rebuild_workloads():
+    """Recompute every TailorWorkload row from the open orders. Returns the row count."""
+    rows = defaultdict(lambda: {'orders': 0, 'work': Decimal('0.00')})
+    custom_days = _setting_days('DELIVERY_CUSTOM_ORDER_DAYS', 3)
+    for total in (TOrders.objects.filter(status__in=OPEN_STATUSES).values('tailor_id').order_by()
+                  .annotate(orders=Count('id'),
+                            quoted_orders=Count('id', filter=Q(work_days__isnull=False)),
+                            quoted_work=Sum('work_days'),
+                            embroidery_time=Sum('embroidery__estimated_time', filter=Q(work_days__isnull=True)))):
+        row = rows[total['tailor_id']]
+        row['orders'] += total['orders']
+        row['work'] += (total['quoted_work'] or Decimal('0.00')) + duration_days(total['embroidery_time'])
+        row['work'] += custom_days * (total['orders'] - total['quoted_orders'])
+    for total in (Order.objects.filter(status__in=OPEN_STATUSES).values('tailor_id').order_by()
+                  .annotate(orders=Count('id'), pieces=Sum('quantity'))):
+        row = rows[total['tailor_id']]
+        row['orders'] += total['orders']
+        row['work'] += dress_order_work(1) * total['pieces']
+
+    with transaction.atomic():
+        TailorWorkload.objects.all().delete()
+        TailorWorkload.objects.bulk_create(
+            [TailorWorkload(tailor_id=tailor_id, open_orders=row['orders'], backlog_days=row['work'])
+             for tailor_id, row in rows.items()], batch_size=1000)
+    return len(rows)
@@ -56,6 +56,13 @@ class Order(models.Model):
     ]
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')  # Order Status
 
+    class Meta:
+        indexes = [
+            # Covers the customer order feed, which sorts on delivery date (see order_feed.py)
+            models.Index(fields=['customer', 'delivery_date', 'id'], name='order_customer_delivery_idx'),
+            models.Index(fields=['tailor', 'status'], name='order_tailor_status_idx'),
+        ]
+
     def get_total_price(self):
         """Calculate total order price."""
         return self.quantity * self.price
@@ -0,0 +1,169 @@
+"""
+Daily earnings rollups for the tailor dashboard.
+
+Every custom order (TOrders) and pre-designed order (Order) counts towards
+the TailorDailyEarnings row of its tailor and order date: one order when it
+is placed, plus a delivered or canceled count once it reaches that status,
+with delivered orders adding their value to ``revenue``. Signals keep the
+rows and ``Tailor.total_earning`` in step as orders are saved or deleted,
+so dashboard figures and charts read a handful of rollup rows instead of
+the order history.
+
+Queryset ``update()`` calls bypass the signals; code changing statuses in
+bulk calls ``apply_status_change`` itself, and ``rebuild_rollups`` (the
+``rebuild_earnings`` command) recomputes everything from the orders.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, NullIf, TruncDate
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from custom_order.models import TOrders
+from dress_order.models import Order
+from tailor.models import Tailor
+from .models import TailorDailyEarnings
+
+ZERO = Decimal('0.00')
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def order_amount(order):
+    if isinstance(order, TOrders):
+        return order.get_total_price() or ZERO
+    return order.quantity * order.price
+
+
+def _status_deltas(order, status):
+    if status == 'delivered':
+        return {'delivered_count': 1, 'revenue': order_amount(order)}
+    if status == 'canceled':
+        return {'canceled_count': 1}
+    return {}
+
+
+def _apply(order, deltas, create=True):
+    deltas = {field: value for field, value in deltas.items() if value}
+    if not deltas:
+        return
+    day = timezone.localdate(order.order_date)
+    with transaction.atomic():
+        if create:
+            TailorDailyEarnings.objects.get_or_create(tailor_id=order.tailor_id, day=day)
+        TailorDailyEarnings.objects.filter(tailor_id=order.tailor_id, day=day).update(
+            **{field: F(field) + value for field, value in deltas.items()})
+        if deltas.get('revenue'):
+            Tailor.objects.filter(pk=order.tailor_id).update(total_earning=F('total_earning') + deltas['revenue'])
+
+
+def _merge(*parts):
+    merged = defaultdict(int)
+    for sign, deltas in parts:
+        for field, value in deltas.items():
+            merged[field] += sign * value
+    return merged
+
+
+def apply_status_change(order, old_status):
+    """Move an order's contribution from ``old_status`` to its current status."""
+    if old_status != order.status:
+        _apply(order, _merge((-1, _status_deltas(order, old_status)), (1, _status_deltas(order, order.status))))
+
+
+@receiver(post_init, sender=TOrders)
+@receiver(post_init, sender=Order)
+def remember_status(sender, instance, **kwargs):
+    # Read from __dict__ so a deferred status is not fetched just for this
+    instance._rollup_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=TOrders)
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    if created:
+        _apply(instance, _merge((1, {'order_count': 1}), (1, _status_deltas(instance, instance.status))))
+    elif instance._rollup_status is not None:
+        apply_status_change(instance, instance._rollup_status)
+    instance._rollup_status = instance.status
+
+
+@receiver(post_delete, sender=TOrders)
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    # Never recreate a row here: when a tailor is deleted its rollups may already be gone
+    _apply(instance, _merge((-1, {'order_count': 1}), (-1, _status_deltas(instance, instance.status))),
+           create=False)
+
+
+def _daily_totals(queryset, amount):
+    return (queryset.annotate(day=TruncDate('order_date')).values('tailor_id', 'day').order_by()
+            .annotate(order_count=Count('id'),
+                      delivered_count=Count('id', filter=Q(status='delivered')),
+                      canceled_count=Count('id', filter=Q(status='canceled')),
+                      revenue=Coalesce(Sum(amount, filter=Q(status='delivered')), Value(ZERO), output_field=MONEY)))
+
+
+def rebuild_rollups():
+    """Recompute every rollup row and Tailor.total_earning from the orders. Returns the row count."""
+    # Same rule as TOrders.get_total_price: the set price, else tailor price plus embroidery
+    custom_amount = Coalesce(NullIf('price', Value(0)),
+                             F('tailor__price') + Coalesce('embroidery__price', Value(ZERO)),
+                             output_field=MONEY)
+    dress_amount = ExpressionWrapper(F('quantity') * F('price'), output_field=MONEY)
+
+    rows = {}
+    for totals in (_daily_totals(TOrders.objects.all(), custom_amount),
+                   _daily_totals(Order.objects.all(), dress_amount)):
+        for total in totals:
+            key = (total['tailor_id'], total['day'])
+            row = rows.setdefault(key, TailorDailyEarnings(tailor_id=key[0], day=key[1], revenue=ZERO))
+            row.order_count += total['order_count']
+            row.delivered_count += total['delivered_count']
+            row.canceled_count += total['canceled_count']
+            row.revenue += total['revenue']
+
+    with transaction.atomic():
+        TailorDailyEarnings.objects.all().delete()
+        TailorDailyEarnings.objects.bulk_create(rows.values(), batch_size=1000)
+        revenue = (TailorDailyEarnings.objects.filter(tailor=OuterRef('pk')).values('tailor')
+                   .annotate(total=Sum('revenue')).values('total'))
+        Tailor.objects.update(total_earning=Coalesce(Subquery(revenue, output_field=MONEY), Value(ZERO)))
+    return len(rows)
+
+
+def earnings_series(tailor, days=30):
+    """One entry per day for the last ``days`` days, oldest first, zero-filled."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = {row.day: row for row in TailorDailyEarnings.objects.filter(tailor=tailor, day__gte=start)}
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        series.append({
+            'day': day.isoformat(),
+            'orders': row.order_count if row else 0,
+            'delivered': row.delivered_count if row else 0,
+            'canceled': row.canceled_count if row else 0,
+            'revenue': str(row.revenue if row else ZERO),
+        })
+    return series
+
+
+def earnings_summary(tailor):
+    """Totals for the dashboard widgets, from the rollup rows alone."""
+    month_start = timezone.localdate().replace(day=1)
+    totals = TailorDailyEarnings.objects.filter(tailor=tailor).aggregate(
+        total_earning=Coalesce(Sum('revenue'), Value(ZERO), output_field=MONEY),
+        monthly_earnings=Coalesce(Sum('revenue', filter=Q(day__gte=month_start)), Value(ZERO), output_field=MONEY),
+        orders=Coalesce(Sum('order_count'), Value(0)),
+        delivered=Coalesce(Sum('delivered_count'), Value(0)),
+        canceled=Coalesce(Sum('canceled_count'), Value(0)),
+    )
+    totals['open_orders'] = totals['orders'] - totals['delivered'] - totals['canceled']
+    return totals
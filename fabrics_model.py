@@ -40,10 +40,19 @@ class Fabric(models.Model):
     price_per_meter = models.DecimalField(max_digits=10, decimal_places=2, default=0.0)
 
     image = models.ImageField(upload_to="fabric_images/", blank=True, null=True)
+    # Upload whose thumbnails exist, set by image_variants so templates need not probe storage
+    derivatives_for = models.CharField(max_length=255, blank=True, default='')
 
     is_available = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['tailor', 'is_available'], name='fabric_tailor_available_idx'),
+            # Catalog API sync order
+            models.Index(fields=['updated_at', 'id'], name='fabric_updated_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.color} ({self.fabric_type})"
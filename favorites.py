@@ -0,0 +1,78 @@
+"""
+Idempotent favorite tailors.
+
+``set_favorite`` is one ``INSERT ... SELECT`` from the tailor's row. It
+inserts nothing when the tailor does not exist, and it skips a row that is
+already present: the ``favorite_tailor_unique`` constraint turns a
+concurrent duplicate into a no-op. ``unset_favorite`` is one ``DELETE``.
+Neither reads the existing favorite first, so repeating a request, or
+sending two at once from a double click, leaves the same single row.
+
+``sync_favorites`` replaces a customer's whole set in one request, for
+clients that collect changes offline and send their final state.
+"""
+from django.db import connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from favorite_tailor.models import FavoriteTailor
+from tailor.models import Tailor
+
+MAX_SYNC_FAVORITES = 1000
+
+
+class UnknownTailor(Exception):
+    pass
+
+
+def _insert_favorite_sql():
+    qn = connection.ops.quote_name
+    opts = FavoriteTailor._meta
+    columns = [opts.get_field(name).column for name in ('user', 'tailor', 'added_on')]
+    return (f"{connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)} {qn(opts.db_table)} "
+            f"({', '.join(qn(column) for column in columns)}) "
+            f"SELECT %s, {qn(Tailor._meta.pk.column)}, %s FROM {qn(Tailor._meta.db_table)} "
+            f"WHERE {qn(Tailor._meta.pk.column)} = %s "
+            f"{connection.ops.on_conflict_suffix_sql([], OnConflict.IGNORE, None, None)}")
+
+
+def set_favorite(customer_id, tailor_id):
+    """Add the favorite if it is missing; raises UnknownTailor if there is no such tailor."""
+    added_on = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(_insert_favorite_sql(), [customer_id, added_on, tailor_id])
+        inserted = cursor.rowcount
+    # Nothing inserted: either already a favorite, or the tailor is gone
+    if not inserted and not Tailor.objects.filter(pk=tailor_id).exists():
+        raise UnknownTailor(tailor_id)
+
+
+def unset_favorite(customer_id, tailor_id):
+    """Remove the favorite; returns whether a row was deleted."""
+    deleted, _ = FavoriteTailor.objects.filter(user_id=customer_id, tailor_id=tailor_id).delete()
+    return bool(deleted)
+
+
+def flip_favorite(customer_id, tailor_id):
+    """Remove the favorite if present, otherwise add it. Returns the new state."""
+    deleted, _ = FavoriteTailor.objects.filter(user_id=customer_id, tailor_id=tailor_id).delete()
+    if deleted:
+        return False
+    set_favorite(customer_id, tailor_id)
+    return True
+
+
+def sync_favorites(customer_id, tailor_ids):
+    """
+    Make the customer's favorites exactly ``tailor_ids``, dropping ids of
+    tailors that no longer exist. Returns ``(favorite ids, added, removed)``.
+    """
+    wanted = set(Tailor.objects.filter(id__in=set(tailor_ids)).values_list('id', flat=True))
+    favorites = FavoriteTailor.objects.filter(user_id=customer_id)
+    with transaction.atomic():
+        current = set(favorites.values_list('tailor_id', flat=True))
+        removed, _ = favorites.exclude(tailor_id__in=wanted).delete()
+        FavoriteTailor.objects.bulk_create(
+            [FavoriteTailor(user_id=customer_id, tailor_id=tailor_id) for tailor_id in wanted - current],
+            ignore_conflicts=True)
+    return sorted(wanted), len(wanted - current), removed
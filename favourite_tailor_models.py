@@ -7,5 +7,10 @@ class FavoriteTailor(models.Model):
     tailor = models.ForeignKey(Tailor, on_delete=models.CASCADE, related_name='favorited_by')
     added_on = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'tailor'], name='favorite_tailor_unique'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} favorited {self.tailor.business_name}"
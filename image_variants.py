@@ -0,0 +1,202 @@
+"""
+Fixed-width thumbnails and WebP variants of uploaded images.
+
+Every image in IMAGE_FIELDS gets a JPEG and a WebP copy at each width in
+``IMAGE_DERIVATIVE_WIDTHS``, stored next to the media under a name derived
+from the original (``photos/a.jpg`` -> ``derivatives/photos/a_320w.webp``),
+so templates can build ``srcset`` lists without a lookup table. They are
+built by the ``generate_image_derivatives`` command for media that predates
+them.
+
+Uploads queue an ``image_derivatives`` job (see jobs.py) in the saving
+transaction, and ``run_worker`` builds the files outside the request. Only
+a changed file is queued: the name loaded at ``post_init`` is compared
+with the saved one. Once the files exist, the model's ``derivatives_for``
+records the upload they belong to, so rendering a ``srcset`` never touches
+storage.
+
+The job is also where uploads are validated. A file Pillow cannot decode is
+removed, with its row when the image is required (a product photo) or from
+the field otherwise, and the job fails without retrying.
+"""
+import os
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_init, post_save
+from PIL import Image as PILImage, ImageOps
+
+from customer.models import Customer
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image
+from tailor.models import Tailor
+from .catalog_cache import catalog_tailor_id, invalidate_tailor
+from .jobs import PermanentError, enqueue, enqueue_many, task
+
+IMAGE_FIELDS = {
+    Image: 'image',
+    Tailor: 'profile_picture',
+    Fabric: 'image',
+    Embroidery: 'design_image',
+    Customer: 'profile_picture',
+}
+
+# Extension -> Pillow format. WebP is written last for each width.
+FORMATS = {'jpg': 'JPEG', 'webp': 'WEBP'}
+QUALITY = 80
+
+
+class InvalidImage(ValueError):
+    """The stored file is not an image Pillow can decode."""
+
+
+def widths():
+    return sorted(getattr(settings, 'IMAGE_DERIVATIVE_WIDTHS', (160, 320, 640)))
+
+
+def derivative_name(name, width, ext):
+    root, _ = os.path.splitext(name)
+    return f'derivatives/{root}_{width}w.{ext}'
+
+
+def _marker(name):
+    # The last file written, so its presence means the whole set exists
+    return derivative_name(name, widths()[-1], 'webp')
+
+
+def has_derivatives(field_file):
+    """Whether the derivatives of this upload were recorded; no storage access."""
+    return bool(field_file) and getattr(field_file.instance, 'derivatives_for', None) == field_file.name
+
+
+def _files_exist(field_file):
+    return field_file.storage.exists(_marker(field_file.name))
+
+
+def _record(field_file):
+    """Mark the instance's current upload as having derivatives, unless it has been replaced since."""
+    instance = field_file.instance
+    # A queryset update, so no save signals and no re-queued job
+    type(instance)._default_manager.filter(pk=instance.pk, **{field_file.field.name: field_file.name}).update(
+        derivatives_for=field_file.name)
+    instance.derivatives_for = field_file.name
+
+
+def _decode(field_file):
+    """The upload as an upright RGB image. Raises InvalidImage if it cannot be decoded."""
+    # Storage errors are raised as they are, so the job retries them
+    with field_file.open('rb') as source_file:
+        data = source_file.read()
+    try:
+        PILImage.open(BytesIO(data)).verify()
+        # verify() leaves the image unusable, so decode a fresh one
+        source = ImageOps.exif_transpose(PILImage.open(BytesIO(data)))
+        source.load()
+    except (OSError, SyntaxError, ValueError, PILImage.DecompressionBombError) as error:
+        raise InvalidImage(f"{field_file.name} is not a valid image: {error}") from error
+    return source if source.mode == 'RGB' else source.convert('RGB')
+
+
+def generate_derivatives(field_file, force=False):
+    """
+    Write every width and format for ``field_file``. Returns False if they
+    already existed and ``force`` is not set, and raises InvalidImage for a
+    file that is not an image.
+    """
+    if not force and _files_exist(field_file):
+        _record(field_file)
+        return False
+    storage = field_file.storage
+    source = _decode(field_file)
+    for width in widths():
+        resized = source
+        if source.width > width:
+            resized = source.resize((width, max(1, round(source.height * width / source.width))),
+                                    PILImage.Resampling.LANCZOS)
+        for ext, image_format in FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=QUALITY)
+            name = derivative_name(field_file.name, width, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    _record(field_file)
+    return True
+
+
+def srcset(field_file, ext='jpg'):
+    """``srcset`` value for the derivatives of ``field_file``, or '' until they exist."""
+    if not has_derivatives(field_file):
+        return ''
+    storage = field_file.storage
+    return ', '.join(f'{storage.url(derivative_name(field_file.name, width, ext))} {width}w'
+                     for width in widths())
+
+
+def _discard(model, pk, field):
+    """Delete an invalid upload, with its row when the field is required."""
+    # Fully loaded, so the delete and save signals can read every field
+    instance = model.objects.get(pk=pk)
+    getattr(instance, field).delete(save=False)
+    if model._meta.get_field(field).null:
+        instance.save(update_fields=[f.name for f in model._meta.concrete_fields
+                                     if f.name == field or getattr(f, 'auto_now', False)])
+    else:
+        instance.delete()
+
+
+@task('image_derivatives')
+def build_derivatives(model, pk, field):
+    """Job handler. Storage errors are retried; an invalid upload is discarded and fails the job."""
+    model = apps.get_model(model)
+    instance = model.objects.filter(pk=pk).only('pk', field, 'derivatives_for').first()
+    field_file = getattr(instance, field, None)
+    if not field_file or has_derivatives(field_file):
+        return
+    try:
+        generate_derivatives(field_file)
+    except InvalidImage as error:
+        _discard(model, pk, field)
+        raise PermanentError(str(error)) from error
+    if model is not Customer:
+        # Cards cached before now were rendered without a srcset
+        invalidate_tailor(catalog_tailor_id(instance))
+
+
+def queue_derivatives(instances):
+    """Queue derivative jobs for instances saved without signals, e.g. by bulk_create."""
+    enqueue_many('image_derivatives', [
+        {'model': instance._meta.label, 'pk': instance.pk, 'field': IMAGE_FIELDS[type(instance)]}
+        for instance in instances
+    ])
+
+
+def _file_name(value):
+    if value is None:
+        return ''
+    return getattr(value, 'name', value) or ''
+
+
+def _remember_file(sender, instance, **kwargs):
+    # __dict__, so a deferred field is not fetched just for this
+    instance._derivative_source = _file_name(instance.__dict__.get(IMAGE_FIELDS[sender]))
+
+
+def _schedule(sender, instance, created=False, update_fields=None, **kwargs):
+    field = IMAGE_FIELDS[sender]
+    if update_fields is not None and field not in update_fields:
+        return
+    name = _file_name(getattr(instance, field))
+    # Also re-queue when a stale instance saved over derivatives_for; the job then only records them
+    changed = created or name != getattr(instance, '_derivative_source', '')
+    if name and (changed or instance.__dict__.get('derivatives_for', name) != name):
+        enqueue('image_derivatives', model=sender._meta.label, pk=instance.pk, field=field)
+    instance._derivative_source = name
+
+
+for _model in IMAGE_FIELDS:
+    post_init.connect(_remember_file, sender=_model, dispatch_uid=f'image_derivatives_init_{_model.__name__}')
+    post_save.connect(_schedule, sender=_model, dispatch_uid=f'image_derivatives_{_model.__name__}')
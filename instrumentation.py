@@ -0,0 +1,220 @@
+"""
+Per-view request instrumentation.
+
+``RequestMetricsMiddleware`` records, for every request, the number of SQL
+queries, total SQL time, template render time, response size and wall time,
+grouped by the URL name from urls.py. It logs requests slower than
+``PERF_SLOW_REQUEST_MS`` to the ``dorzi.performance`` logger, adds a
+``Server-Timing`` header for local requests (visible in the browser's
+network panel) and keeps a rolling window per view that ``metrics_view``
+serves as JSON with p50/p95 figures.
+
+Template time is collected by ``TimedDjangoTemplates``, a drop-in
+replacement for the DjangoTemplates backend.
+
+The middleware runs natively under both WSGI and ASGI (``dorzi.asgi``).
+"""
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, JsonResponse
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('dorzi.performance')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def is_local_request(request):
+    return request.META.get('REMOTE_ADDR') in _setting('INTERNAL_IPS', ['127.0.0.1', '::1'])
+
+
+class RequestMetrics:
+    """Counters for a single request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.queries += 1
+
+
+class MetricsRegistry:
+    """Rolling per-view samples, shared by all threads of the process."""
+
+    def __init__(self, window):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+        self.counts = defaultdict(int)
+
+    def record(self, view, sample):
+        with self.lock:
+            self.samples[view].append(sample)
+            self.counts[view] += 1
+
+    @staticmethod
+    def _percentile(values, pct):
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self):
+        with self.lock:
+            snapshot = {view: list(samples) for view, samples in self.samples.items()}
+            counts = dict(self.counts)
+        views = {}
+        for view, samples in snapshot.items():
+            durations = [s['duration_ms'] for s in samples]
+            views[view] = {
+                'requests': counts[view],
+                'window': len(samples),
+                'p50_ms': round(self._percentile(durations, 50), 2),
+                'p95_ms': round(self._percentile(durations, 95), 2),
+                'avg_queries': round(sum(s['queries'] for s in samples) / len(samples), 1),
+                'avg_sql_ms': round(sum(s['sql_ms'] for s in samples) / len(samples), 2),
+                'avg_template_ms': round(sum(s['template_ms'] for s in samples) / len(samples), 2),
+                'avg_response_bytes': round(sum(s['response_bytes'] for s in samples) / len(samples)),
+                'last': samples[-1],
+            }
+        return views
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+
+registry = MetricsRegistry(_setting('PERF_WINDOW_SIZE', 200))
+
+
+class RequestMetricsMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Stay async under ASGI so async views are not pushed onto a thread
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _wrap_connections(stack, metrics):
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(metrics))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self._wrap_connections(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._record(request, response, time.perf_counter() - start, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            # Connections are per thread, and the async ORM runs every query of
+            # a request on the same worker thread; wrap them there
+            await sync_to_async(self._wrap_connections)(stack, metrics)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self._record(request, response, time.perf_counter() - start, metrics)
+
+    def _record(self, request, response, duration, metrics):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else '<unresolved>'
+        sample = {
+            'path': request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'queries': metrics.queries,
+            'sql_ms': round(metrics.sql_time * 1000, 2),
+            'template_ms': round(metrics.template_time * 1000, 2),
+            'response_bytes': 0 if response.streaming else len(response.content),
+        }
+        registry.record(view, sample)
+
+        if sample['duration_ms'] > _setting('PERF_SLOW_REQUEST_MS', 500):
+            logger.warning(
+                "Slow request %s %s (%s): %.0fms, %d queries, %.0fms SQL, %.0fms templates, %d bytes",
+                request.method, request.path, view, sample['duration_ms'], sample['queries'],
+                sample['sql_ms'], sample['template_ms'], sample['response_bytes'],
+            )
+
+        if settings.DEBUG or is_local_request(request):
+            response['Server-Timing'] = (
+                f'db;dur={sample["sql_ms"]};desc="{sample["queries"]} queries", '
+                f'tpl;dur={sample["template_ms"]};desc="templates", '
+                f'total;dur={sample["duration_ms"]}'
+            )
+        return response
+
+
+class _TimedTemplate:
+
+    def __init__(self, template):
+        self.template = template
+        self.origin = template.origin
+
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend that reports render time to the current request's metrics."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+def metrics_view(request):
+    """Rolling per-view latency and cost figures. Only answers local requests."""
+    if not is_local_request(request):
+        raise Http404
+    return JsonResponse({
+        'slow_request_ms': _setting('PERF_SLOW_REQUEST_MS', 500),
+        'window': registry.window,
+        'views': registry.summary(),
+    })
@@ -0,0 +1,98 @@
+"""
+Database-backed background jobs.
+
+Functions registered with ``@task('name')`` are queued with ``enqueue`` (or
+``enqueue_many`` for a batch) and run by ``manage.py run_worker``. Jobs are
+plain rows, so queueing inside a view's transaction means they only become
+visible to workers if the request commits.
+
+A worker claims a job with a conditional UPDATE on its status, so several
+workers can poll the same table without running a job twice. Failed jobs are
+retried with exponential backoff up to ``max_attempts``, unless the handler
+raises ``PermanentError``; jobs left ``running`` by a worker that died are
+requeued after ``JOB_LOCK_TIMEOUT``.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger('dorzi.jobs')
+
+_tasks = {}
+
+
+class PermanentError(Exception):
+    """Raised by a handler for failures that retrying cannot fix; the job fails at once."""
+
+
+def task(name):
+    """Register a function as the handler for jobs named ``name``."""
+    def register(func):
+        _tasks[name] = func
+        return func
+    return register
+
+
+def enqueue(name, **payload):
+    return Job.objects.create(task=name, payload=payload)
+
+
+def enqueue_many(name, payloads):
+    return Job.objects.bulk_create([Job(task=name, payload=payload) for payload in payloads])
+
+
+def _lock_timeout():
+    return timedelta(seconds=getattr(settings, 'JOB_LOCK_TIMEOUT', 600))
+
+
+def requeue_stale():
+    """Return jobs held by a worker that stopped without finishing them to the queue."""
+    return Job.objects.filter(status='running', locked_at__lt=timezone.now() - _lock_timeout()).update(
+        status='queued', locked_at=None)
+
+
+def claim_next():
+    """Lock and return the oldest due job, or None if there is none."""
+    while True:
+        job = (Job.objects.filter(status='queued', run_after__lte=timezone.now())
+               .order_by('run_after', 'id').first())
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status='queued').update(
+            status='running', locked_at=timezone.now(), attempts=F('attempts') + 1)
+        if claimed:
+            job.refresh_from_db()
+            return job
+        # Another worker got there first; try the next one
+
+
+def run(job):
+    """Run a claimed job and record the outcome."""
+    try:
+        handler = _tasks[job.task]
+    except KeyError:
+        job.status = 'failed'
+        job.last_error = f"No task registered as {job.task!r}"
+    else:
+        try:
+            handler(**job.payload)
+        except Exception as error:
+            job.last_error = traceback.format_exc()
+            if job.attempts < job.max_attempts and not isinstance(error, PermanentError):
+                job.status = 'queued'
+                job.run_after = timezone.now() + timedelta(seconds=10 * 2 ** job.attempts)
+            else:
+                job.status = 'failed'
+            logger.warning("Job %s failed (attempt %d of %d)", job, job.attempts, job.max_attempts)
+        else:
+            job.status = 'done'
+            job.last_error = ''
+    job.locked_at = None
+    job.save(update_fields=['status', 'last_error', 'run_after', 'locked_at', 'updated_at'])
+    return job
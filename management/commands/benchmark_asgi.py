@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from customer.models import Customer
+from dorzi.seed_data import DEFAULT_VOLUMES, generate
+from embroidery.models import Embroidery
+from pre_designed.models import PreDesigned
+from tailor.models import Tailor
+
+# (case name, url name, method, who is logged in)
+CASES = [
+    ('tailor_api', 'tailor_api', 'get', None),
+    ('tailor_api:portfolio', 'tailor_api', 'get', None),
+    ('get_dress_details', 'get_dress_details', 'get', 'tailor'),
+    ('get_embroidery_details', 'get_embroidery_details', 'get', 'tailor'),
+    ('toggle_favorite', 'toggle_favorite', 'post', 'customer'),
+]
+
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class Command(BaseCommand):
+    help = ("Seed a throwaway test database and fire concurrent requests at the async JSON endpoints through "
+            "the WSGI handler (a pool of sync worker threads) and the ASGI handler (one event loop), comparing "
+            "requests per second and tail latency. Both run in-process, without a network server.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=64,
+                            help="Requests in flight: worker threads for WSGI, open tasks for ASGI.")
+        parser.add_argument('--requests', type=int, default=1000, help="Requests per case and handler.")
+        parser.add_argument('--tailors', type=int, default=50)
+        parser.add_argument('--customers', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        volumes = dict(DEFAULT_VOLUMES, tailors=options['tailors'], customers=options['customers'])
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            generate(volumes, seed=options['seed'])
+            targets = self.targets()
+            results = []
+            for name, url_name, method, login in CASES:
+                url, user = targets[name], targets[login] if login else None
+                wsgi = self.run_wsgi(url, method, user, options['concurrency'], options['requests'])
+                asgi = asyncio.run(self.run_asgi(url, method, user, options['concurrency'], options['requests']))
+                results.append((name, wsgi, asgi))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"concurrency {options['concurrency']}, {options['requests']} requests per case")
+        self.stdout.write(f"{'case':24} {'handler':8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+                          f"{'p99 ms':>8} {'errors':>7}")
+        for name, wsgi, asgi in results:
+            for handler, result in (('wsgi', wsgi), ('asgi', asgi)):
+                self.stdout.write(f"{name:24} {handler:8} {result['rps']:>8.0f} {result['p50_ms']:>8.1f} "
+                                  f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}")
+            change = (asgi['rps'] - wsgi['rps']) / wsgi['rps'] * 100 if wsgi['rps'] else 0
+            self.stdout.write(f"{'':24} {'':8} {change:+7.0f}% req/s, "
+                              f"{asgi['p99_ms'] - wsgi['p99_ms']:+.1f} ms p99 under ASGI")
+
+    def targets(self):
+        product = PreDesigned.objects.select_related('tailor__user').order_by('id').first()
+        tailor = product.tailor
+        embroidery = Embroidery.objects.filter(tailor=tailor).order_by('id').first()
+        customer = Customer.objects.select_related('user').order_by('id').first()
+        favorite = Tailor.objects.exclude(id=tailor.id).order_by('id').first() or tailor
+        return {
+            'tailor': tailor.user,
+            'customer': customer.user,
+            'tailor_api': reverse('tailor_api', args=[tailor.id]),
+            'tailor_api:portfolio': reverse('tailor_api', args=[tailor.id]) + '?section=portfolio',
+            'get_dress_details': reverse('get_dress_details', args=[product.id]),
+            'get_embroidery_details': reverse('get_embroidery_details', args=[embroidery.id]),
+            'toggle_favorite': reverse('toggle_favorite', args=[favorite.id]),
+        }
+
+    @staticmethod
+    def summarize(latencies, errors, elapsed):
+        latencies.sort()
+        return {
+            'rps': len(latencies) / elapsed if elapsed else 0,
+            'p50_ms': _percentile(latencies, 0.50) * 1000,
+            'p95_ms': _percentile(latencies, 0.95) * 1000,
+            'p99_ms': _percentile(latencies, 0.99) * 1000,
+            'errors': errors,
+        }
+
+    def run_wsgi(self, url, method, user, concurrency, total):
+        template = Client()
+        if user:
+            template.force_login(user)
+        lock = threading.Lock()
+        remaining = [total]
+        latencies, errors = [], [0]
+
+        def worker():
+            client = Client()
+            client.cookies = template.cookies
+            send = getattr(client, method)
+            mine, failed = [], 0
+            try:
+                while True:
+                    with lock:
+                        if not remaining[0]:
+                            break
+                        remaining[0] -= 1
+                    start = time.perf_counter()
+                    try:
+                        failed += send(url).status_code >= 400
+                    except Exception:
+                        failed += 1
+                    mine.append(time.perf_counter() - start)
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(mine)
+                    errors[0] += failed
+
+        workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return self.summarize(latencies, errors[0], time.perf_counter() - started)
+
+    async def run_asgi(self, url, method, user, concurrency, total):
+        client = AsyncClient()
+        if user:
+            await client.aforce_login(user)
+        send = getattr(client, method)
+        slots = asyncio.Semaphore(concurrency)
+        latencies, errors = [], 0
+
+        async def one():
+            nonlocal errors
+            async with slots:
+                start = time.perf_counter()
+                try:
+                    # As ASGIHandler does: each request gets its own thread for sync code and ORM calls
+                    async with ThreadSensitiveContext():
+                        errors += (await send(url)).status_code >= 400
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return self.summarize(latencies, errors, time.perf_counter() - started)
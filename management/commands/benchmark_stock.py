@@ -0,0 +1,117 @@
+import statistics
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from dorzi.models import StockReservation
+from dorzi.stock import OutOfStock, reserve
+from pre_designed.models import PreDesigned
+from tailor.models import Tailor
+
+
+class Command(BaseCommand):
+    help = ("Hammer one product with concurrent reservations in a throwaway test database and check that "
+            "it never oversells and that throughput holds steady while it sells out.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--stock', type=int, default=2000)
+        parser.add_argument('--quantity', type=int, default=1, help="Units per reservation.")
+        parser.add_argument('--slices', type=int, default=10,
+                            help="Equal shares of the sales to compare throughput across.")
+        parser.add_argument('--max-cv', type=float, default=0.5,
+                            help="Warn when the throughput of the slices varies more than this (stdev / mean).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            product = self.create_product(options['stock'])
+            result = self.hammer(product, options['threads'], options['quantity'])
+            product.refresh_from_db()
+            reserved_units = sum(StockReservation.objects.filter(product=product).values_list('quantity', flat=True))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        stock, elapsed = options['stock'], result['elapsed']
+        self.stdout.write(f"threads {options['threads']}, stock {stock}, {options['quantity']} per reservation")
+        self.stdout.write(f"reserved {reserved_units} units in {len(result['times'])} reservations, "
+                          f"{result['rejected']} rejected as out of stock, {result['retries']} lock retries")
+        self.stdout.write(f"left {product.availability}, {elapsed:.2f}s, "
+                          f"{len(result['times']) / elapsed if elapsed else 0:.0f} reservations/s")
+
+        rates = self.slice_rates(result['times'], options['slices'])
+        if rates:
+            cv = statistics.pstdev(rates) / statistics.mean(rates)
+            self.stdout.write(f"throughput per slice: {', '.join(f'{rate:.0f}' for rate in rates)}/s (cv {cv:.2f})")
+            if cv > options['max_cv']:
+                self.stdout.write(self.style.WARNING(f"Throughput varied more than cv {options['max_cv']}."))
+
+        if product.availability < 0 or reserved_units + product.availability != stock:
+            raise CommandError(f"Oversold: {reserved_units} reserved and {product.availability} left of {stock}.")
+        self.stdout.write(self.style.SUCCESS("No oversell."))
+
+    def create_product(self, stock):
+        user = User.objects.create_user(username='stock-benchmark@example.com')
+        tailor = Tailor.objects.create(user=user, business_name='Benchmark', business_location='Dhaka',
+                                       NID='BENCH-1', price=Decimal('500.00'))
+        return PreDesigned.objects.create(tailor=tailor, title='Hot product', price=Decimal('900.00'),
+                                          availability=stock)
+
+    def hammer(self, product, threads, quantity):
+        lock = threading.Lock()
+        result = {'times': [], 'rejected': 0, 'retries': 0}
+        start_line = threading.Barrier(threads)
+
+        def buyer():
+            times, retries, rejected = [], 0, 0
+            try:
+                start_line.wait()
+                while True:
+                    try:
+                        reserve(product, quantity)
+                    except OutOfStock:
+                        rejected += 1
+                        break
+                    except OperationalError:
+                        # SQLite reports a locked table instead of waiting for it
+                        retries += 1
+                        time.sleep(0.001)
+                        continue
+                    times.append(time.perf_counter())
+            finally:
+                connection.close()
+                with lock:
+                    result['times'].extend(times)
+                    result['rejected'] += rejected
+                    result['retries'] += retries
+
+        workers = [threading.Thread(target=buyer) for _ in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        result['elapsed'] = time.perf_counter() - started
+        result['times'] = sorted(moment - started for moment in result['times'])
+        return result
+
+    @staticmethod
+    def slice_rates(times, slices):
+        """Reservations per second over each equal share of the completed reservations."""
+        size = len(times) // slices
+        if size < 2:
+            return []
+        rates = []
+        previous = 0.0
+        for index in range(slices):
+            end = times[(index + 1) * size - 1]
+            rates.append(size / (end - previous) if end > previous else 0.0)
+            previous = end
+        return rates
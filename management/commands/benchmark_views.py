@@ -0,0 +1,151 @@
+import json
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from customer.models import Customer
+from dorzi.seed_data import DEFAULT_VOLUMES, SEED_PASSWORD, generate
+from tailor.models import Tailor
+
+# (case name, url name, url kwargs, query string, log in as a customer)
+CASES = [
+    ('home', 'home', {}, '', False),
+    ('about', 'about', {}, '', False),
+    ('terms', 'terms', {}, '', False),
+    ('privacy', 'privacy', {}, '', False),
+    ('findTailor', 'findTailor', {}, '', False),
+    ('findTailor:search', 'findTailor', {}, 'search=Shop', False),
+    ('findTailor:top_rated', 'findTailor', {}, 'sort=rating&min_rating=3', False),
+    ('findTailor:price_filter', 'findTailor', {}, 'sort=low-to-high&location=Dhaka', False),
+    ('pre_designed', 'pre_designed', {}, '', False),
+    ('tailor_api', 'tailor_api', {'tailor_id': 'TAILOR'}, '', False),
+    ('tailor_api:portfolio', 'tailor_api', {'tailor_id': 'TAILOR'}, 'section=portfolio', False),
+    ('tailor_api:reviews', 'tailor_api', {'tailor_id': 'TAILOR'}, 'section=reviews', False),
+    ('customer', 'customer', {}, '', True),
+    ('customer_orders', 'customer_orders', {}, '', True),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ("Seed a throwaway test database and measure latency and query counts of every public view "
+            "through the Django test client. Results are written as JSON for comparison across commits.")
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=default, dest=name)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=10, help="Measured requests per view.")
+        parser.add_argument('--output', default='bench_output.json')
+        parser.add_argument('--baseline', help="Earlier results file to print deltas against.")
+
+    def handle(self, *args, **options):
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            start = time.perf_counter()
+            created = generate(volumes, seed=options['seed'])
+            seed_seconds = time.perf_counter() - start
+            results = self.run_cases(options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'commit': git_commit(),
+            'timestamp': datetime.now(dt_timezone.utc).isoformat(),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'seed': options['seed'],
+            'volumes': volumes,
+            'rows': created,
+            'seed_seconds': round(seed_seconds, 2),
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        Path(options['output']).write_text(json.dumps(report, indent=2))
+
+        baseline = None
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())['results']
+        self.print_table(results, baseline)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+    def run_cases(self, repeat):
+        tailor = Tailor.objects.order_by('id').first()
+        # The customer with the longest order history is the worst case for the profile
+        customer = (Customer.objects.annotate(order_count=Count('torders'))
+                    .order_by('-order_count', 'id').select_related('user').first())
+
+        anonymous = Client()
+        logged_in = Client()
+        if customer is not None:
+            logged_in.login(username=customer.user.username, password=SEED_PASSWORD)
+
+        results = {}
+        for name, url_name, kwargs, query, needs_login in CASES:
+            if 'TAILOR' in kwargs.values():
+                if tailor is None:
+                    continue
+                kwargs = {key: tailor.id if value == 'TAILOR' else value for key, value in kwargs.items()}
+            if needs_login and customer is None:
+                continue
+            url = reverse(url_name, kwargs=kwargs) + (f'?{query}' if query else '')
+            client = logged_in if needs_login else anonymous
+            results[name] = self.measure(client, url, repeat)
+        return results
+
+    @staticmethod
+    def measure(client, url, repeat):
+        client.get(url)  # warm-up: template loading, connection setup
+        timings = []
+        queries = 0
+        status = None
+        size = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            queries = len(captured)
+            status = response.status_code
+            size = len(response.content)
+        timings.sort()
+        return {
+            'url': url,
+            'status': status,
+            'queries': queries,
+            'response_bytes': size,
+            'min_ms': round(timings[0], 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'max_ms': round(timings[-1], 2),
+        }
+
+    def print_table(self, results, baseline):
+        self.stdout.write(f"{'view':28} {'status':>6} {'queries':>8} {'median ms':>10} {'p95 ms':>8} {'bytes':>10}")
+        for name, result in results.items():
+            line = (f"{name:28} {result['status']:>6} {result['queries']:>8} "
+                    f"{result['median_ms']:>10} {result['p95_ms']:>8} {result['response_bytes']:>10}")
+            previous = (baseline or {}).get(name)
+            if previous and previous['median_ms']:
+                change = (result['median_ms'] - previous['median_ms']) / previous['median_ms'] * 100
+                line += f"  {change:+.0f}% median, {result['queries'] - previous['queries']:+d} queries"
+            self.stdout.write(line)
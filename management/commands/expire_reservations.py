@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dorzi.stock import expire_reservations
+
+
+class Command(BaseCommand):
+    help = "Put the units of held stock reservations past their deadline back on sale. Run it from cron."
+
+    def handle(self, *args, **options):
+        expired = expire_reservations()
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} reservations."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from dorzi.query_plans import check_plans
+
+
+class Command(BaseCommand):
+    help = ("EXPLAIN the hot view queries against the current database and fail if any of them does not "
+            "read through an index. Seed a large dataset first with generate_test_data.")
+
+    def handle(self, *args, **options):
+        missing = []
+        for name, expected_index, plan, indexed, expected in check_plans():
+            if indexed is None:
+                status = self.style.WARNING('UNKNOWN')
+            elif indexed:
+                status = self.style.SUCCESS('INDEX')
+            else:
+                status = self.style.ERROR('NO INDEX')
+                missing.append(name)
+            note = '' if expected else f' (expected {expected_index})'
+            self.stdout.write(f"{status}  {name}{note}")
+            if options['verbosity'] > 1 or not indexed:
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        if missing:
+            raise CommandError(f"{len(missing)} hot queries do not use an index: {', '.join(missing)}")
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.stdout.write(self.style.WARNING(f"Plans from {connection.vendor} are not checked automatically."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from dorzi.image_variants import IMAGE_FIELDS, InvalidImage, generate_derivatives
+
+
+class Command(BaseCommand):
+    help = ("Generate thumbnails and WebP variants for uploaded images that do not have them yet, "
+            "e.g. media uploaded before the derivative pipeline existed.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', choices=[model.__name__ for model in IMAGE_FIELDS],
+                            help="Only process these models. Can be repeated.")
+        parser.add_argument('--force', action='store_true', help="Regenerate existing derivatives.")
+
+    def handle(self, *args, **options):
+        for model, field in IMAGE_FIELDS.items():
+            if options['model'] and model.__name__ not in options['model']:
+                continue
+            images = model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''}).only('pk', field)
+            generated = skipped = failed = 0
+            for instance in images.iterator(chunk_size=500):
+                try:
+                    if generate_derivatives(getattr(instance, field), force=options['force']):
+                        generated += 1
+                    else:
+                        skipped += 1
+                except (OSError, InvalidImage) as error:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} {instance.pk}: {error}")
+            self.stdout.write(f"{model.__name__}.{field}: {generated} generated, {skipped} up to date, "
+                              f"{failed} failed")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from dorzi.seed_data import DEFAULT_VOLUMES, SEED_PASSWORD, generate
+
+
+class Command(BaseCommand):
+    help = ("Fill the configured database with a deterministic synthetic dataset (tailors, products, images, "
+            "fabrics, embroidery, customers, reviews and orders in every status) using bulk inserts.")
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_VOLUMES.items():
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, default=default, dest=name)
+        parser.add_argument('--seed', type=int, default=0,
+                            help="Same seed and volumes always produce the same rows.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Rows per INSERT statement.")
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Tailors or customers generated per transaction.")
+
+    def handle(self, *args, **options):
+        volumes = {name: options[name] for name in DEFAULT_VOLUMES}
+        start = time.perf_counter()
+
+        def progress(message):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{time.perf_counter() - start:8.1f}s  {message}")
+
+        created = generate(volumes, seed=options['seed'], batch_size=options['batch_size'],
+                           chunk_size=options['chunk_size'], progress=progress)
+        elapsed = time.perf_counter() - start
+
+        for model, count in created.items():
+            self.stdout.write(f"{model:15} {count:>10}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {sum(created.values())} rows in {elapsed:.1f}s. "
+            f"Every generated user's password is '{SEED_PASSWORD}'."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dorzi.earnings import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily per-tailor earnings rollups and Tailor.total_earning from all orders."
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} daily earnings rows."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from dorzi.product_search import get_backend
+
+
+class Command(BaseCommand):
+    help = ("Reindex every pre-designed product for full-text search. Needed after bulk_create or "
+            "update() calls, which skip the indexing signals.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        count = backend.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} products with {type(backend).__name__}."))
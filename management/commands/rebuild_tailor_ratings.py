@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute every tailor's rating_sum, review_count and average_rating from Reviews."
+
+    def handle(self, *args, **options):
+        updated = rebuild_rating_aggregates()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {updated} tailors."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dorzi.delivery_schedule import rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = "Recompute every tailor's open order count and backlog used for delivery date quotes."
+
+    def handle(self, *args, **options):
+        rows = rebuild_workloads()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt workloads for {rows} tailors."))
@@ -0,0 +1,45 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dorzi.db_router import PRIMARY, replica_alias
+
+
+class Command(BaseCommand):
+    help = ("Copy the primary SQLite database into the replica file, once or every --interval seconds. "
+            "A stand-in for real replication when testing read routing locally.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help="Seconds between copies; 0 copies once and exits.")
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if not alias:
+            raise CommandError("No replica configured; set DORZI_REPLICA_DB.")
+        primary, replica = settings.DATABASES[PRIMARY], settings.DATABASES[alias]
+        for config in (primary, replica):
+            if config['ENGINE'] != 'django.db.backends.sqlite3':
+                raise CommandError("replicate_db only copies between SQLite databases.")
+
+        while True:
+            start = time.perf_counter()
+            pages = self.copy(str(primary['NAME']), str(replica['NAME']))
+            self.stdout.write(f"Copied {pages} pages to {replica['NAME']} in "
+                              f"{(time.perf_counter() - start) * 1000:.0f}ms")
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    @staticmethod
+    def copy(source_path, target_path):
+        # The backup API copies a consistent snapshot, even while the primary takes writes
+        source, target = sqlite3.connect(source_path), sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+            return target.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            target.close()
+            source.close()
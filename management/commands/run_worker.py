@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from dorzi.jobs import claim_next, requeue_stale, run
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (image processing and other upload post-processing)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit once the queue is empty.")
+        parser.add_argument('--sleep', type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--max-jobs', type=int, default=None, help="Exit after running this many jobs.")
+
+    def handle(self, *args, **options):
+        processed = 0
+        try:
+            while options['max_jobs'] is None or processed < options['max_jobs']:
+                close_old_connections()
+                requeue_stale()
+                job = claim_next()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                start = time.perf_counter()
+                run(job)
+                processed += 1
+                if options['verbosity'] > 1 or job.status != 'done':
+                    self.stdout.write(f"{job} in {(time.perf_counter() - start) * 1000:.0f}ms")
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} jobs."))
@@ -0,0 +1,134 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work, run by `manage.py run_worker` (see jobs.py)."""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # Workers poll for the oldest due job in a status
+        indexes = [
+            models.Index(fields=['status', 'run_after', 'id'], name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.id} ({self.status})"
+
+
+class TailorDailyEarnings(models.Model):
+    """
+    Per-tailor, per-day totals over custom and pre-designed orders, bucketed
+    by order date. Maintained by earnings.py as orders are placed, delivered
+    or canceled; rebuild with `manage.py rebuild_earnings`.
+    """
+    tailor = models.ForeignKey('tailor.Tailor', on_delete=models.CASCADE, related_name='daily_earnings')
+    day = models.DateField()
+    order_count = models.IntegerField(default=0)
+    delivered_count = models.IntegerField(default=0)
+    canceled_count = models.IntegerField(default=0)
+    # Value of the delivered orders
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tailor', 'day'], name='tailor_daily_earnings_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.tailor_id} on {self.day}: {self.revenue}"
+
+
+class Holiday(models.Model):
+    """A day no tailor works, skipped when quoting delivery dates (see delivery_schedule.py)."""
+    day = models.DateField(unique=True)
+    name = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day} {self.name}".strip()
+
+
+class TailorWorkload(models.Model):
+    """
+    Open (pending or processing) orders of a tailor and the work they still
+    need, in business days. Maintained by delivery_schedule.py as orders are
+    placed and change status; rebuild with `manage.py rebuild_workloads`.
+    """
+    tailor = models.OneToOneField('tailor.Tailor', on_delete=models.CASCADE, related_name='workload')
+    open_orders = models.IntegerField(default=0)
+    backlog_days = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.tailor_id}: {self.open_orders} open, {self.backlog_days} days"
+
+
+class StockReservation(models.Model):
+    """
+    Units of a pre-designed product taken out of its availability for one
+    checkout (see stock.py). Held reservations lapse at ``expires_at`` unless
+    an order commits them; releasing one puts the units back.
+    """
+
+    STATUS_CHOICES = [
+        ('held', 'Held'),
+        ('committed', 'Committed'),
+        ('released', 'Released'),
+        ('expired', 'Expired'),
+    ]
+
+    product = models.ForeignKey('pre_designed.PreDesigned', on_delete=models.CASCADE, related_name='reservations')
+    order = models.OneToOneField('dress_order.Order', on_delete=models.SET_NULL, blank=True, null=True,
+                                 related_name='reservation')
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='held')
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # The expiry sweep reads held reservations past their deadline
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='reservation_status_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} ({self.status})"
+
+
+class CatalogDeletion(models.Model):
+    """
+    A tailor, product, fabric or embroidery design that was deleted, kept so
+    clients syncing the catalog API learn about it (see catalog_api.py).
+    ``kind`` is the API resource name, e.g. ``products``.
+    """
+    kind = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Clients read the feed in (deleted_at, id) order
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='catalog_deletion_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} deleted {self.deleted_at}"
@@ -0,0 +1,174 @@
+"""
+Merged custom + pre-designed order history for the customer profile.
+
+Both order tables are projected to ``(kind, id, sort_date)`` and combined
+with a SQL ``UNION ALL`` that the database sorts and limits. Only the rows
+on the requested page are then loaded in full, so a profile view costs the
+same for a customer with five orders or five thousand.
+"""
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.db.models import CharField, Count, DateField, Q, Value
+from django.db.models.functions import Coalesce
+from custom_order.models import TOrders
+from dress_order.models import Order
+
+FEED_PAGE_SIZE = 20
+
+CUSTOM = 'custom'
+DRESS = 'dress'
+
+
+def _encode_cursor(row):
+    raw = json.dumps([row['sort_date'].isoformat(), row['kind'], row['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Return ``(sort_date, kind, id)`` for a cursor, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_date, kind, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(sort_date), str(kind), int(pk)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def _before(kind, cursor):
+    """
+    Rows of ``kind`` that sort after the cursor row. The feed is ordered by
+    ``(sort_date, kind, id)`` descending and ``kind`` is constant per branch.
+    """
+    sort_date, cursor_kind, pk = cursor
+    if kind == cursor_kind:
+        return Q(sort_date__lt=sort_date) | Q(sort_date=sort_date, id__lt=pk)
+    if kind < cursor_kind:
+        return Q(sort_date__lte=sort_date)
+    return Q(sort_date__lt=sort_date)
+
+
+def _projection(queryset, kind, cursor):
+    rows = queryset.annotate(
+        kind=Value(kind, output_field=CharField()),
+        # Orders without a delivery date go last, as they always have
+        sort_date=Coalesce('delivery_date', Value(date.min), output_field=DateField()),
+    )
+    if cursor is not None:
+        rows = rows.filter(_before(kind, cursor))
+    return rows.order_by().values('kind', 'id', 'sort_date')
+
+
+def custom_rows(customer_id, cursor=None):
+    """The custom-order branch of the feed, as ``(kind, id, sort_date)`` rows."""
+    return _projection(TOrders.objects.filter(customer_id=customer_id), CUSTOM, cursor)
+
+
+def dress_rows(user_id, cursor=None):
+    """The pre-designed branch of the feed; dress orders belong to the customer's user."""
+    return _projection(Order.objects.filter(customer_id=user_id), DRESS, cursor)
+
+
+def custom_order_entry(order):
+    return {
+        'id': order.id,
+        'order_id': f"TORD-{order.id:03d}",
+        'garment': order.detailed_description or "Custom Garment",
+        'category': order.category or "Custom",
+        'tailor': order.tailor,
+        'delivery_date': order.delivery_date,
+        'status': order.status,
+        'order_type': "Custom Order",
+        'amount': order.get_total_price(),
+        'progress': None,
+        'timeline': {},
+        'order_date': order.order_date,
+        # Custom order specific fields
+        'fabric': order.fabrics or '',
+        'color': order.color or '',
+        'chest': order.chest,
+        'waist': order.waist,
+        'hip': order.hip,
+        'shoulder': order.shoulder,
+        'sleeve': order.sleeve,
+        'length': order.length,
+        'inseam': order.inseam,
+        'neck': order.neck,
+        'special_notes': order.special_requests or '',
+        'measurements_confirmed': order.measurements_confirmed,
+        'fabric_selected': order.fabric_selected,
+        'cutting_started': order.cutting_started,
+        'stitching_started': order.stitching_started,
+        'deliver': order.deliver,
+    }
+
+
+def dress_order_entry(order):
+    return {
+        'id': order.id,
+        'order_id': f"DORD-{order.id:03d}",
+        'garment': order.product.title if order.product else "Pre-designed Garment",
+        'category': order.category or "Pre-designed",
+        'tailor': order.tailor,
+        'delivery_date': order.delivery_date,
+        'status': "Completed" if order.deliver is not None else "Pending",
+        'order_type': "Pre-designed",
+        'amount': order.get_total_price(),
+        'progress': None,
+        'timeline': {},
+        'order_date': order.order_date,
+        'size': order.size,
+        # Pre-designed order specific fields
+        'fabric': order.product.fabric_type if order.product else '',
+        'color': order.product.color if order.product else '',
+        'quantity': order.quantity,
+        'special_instructions': order.special_instructions or '',
+        'order_confirmed': order.order_confirmed,
+        'production': order.production,
+        'quality_check': order.quality_check,
+        'deliver': order.deliver,
+    }
+
+
+def order_feed_page(customer, cursor=None, page_size=FEED_PAGE_SIZE):
+    """
+    Return ``(orders, next_cursor)`` for one page of a customer's order
+    history, newest delivery date first. ``next_cursor`` is None on the last page.
+    """
+    cursor = _decode_cursor(cursor)
+    custom = custom_rows(customer.pk, cursor)
+    dress = dress_rows(customer.user_id, cursor)
+    rows = list(custom.union(dress, all=True).order_by('-sort_date', '-kind', '-id')[:page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1])
+
+    custom_orders = (TOrders.objects.select_related('tailor__user', 'embroidery')
+                     .in_bulk([row['id'] for row in rows if row['kind'] == CUSTOM]))
+    dress_orders = (Order.objects.select_related('tailor__user', 'product')
+                    .in_bulk([row['id'] for row in rows if row['kind'] == DRESS]))
+    orders = [
+        custom_order_entry(custom_orders[row['id']]) if row['kind'] == CUSTOM
+        else dress_order_entry(dress_orders[row['id']])
+        for row in rows
+    ]
+    return orders, next_cursor
+
+
+def order_counts(customer):
+    """Total, completed and pending order counts, aggregated in the database."""
+    aggregates = {
+        'total': Count('id'),
+        'completed': Count('id', filter=Q(status='delivered')),
+    }
+    custom = TOrders.objects.filter(customer=customer).aggregate(**aggregates)
+    dress = Order.objects.filter(customer=customer.user_id).aggregate(**aggregates)
+    total = custom['total'] + dress['total']
+    completed = custom['completed'] + dress['completed']
+    return {'total': total, 'completed': completed, 'pending': total - completed}
@@ -0,0 +1,157 @@
+"""
+Batch status and timeline changes to a tailor's orders.
+
+``apply_order_updates`` takes many ``{order_type, order_id, status,
+timeline_field, date}`` changes at once. It checks that every order belongs
+to the tailor with one UNION query over both order tables. It then writes
+the changes with one UPDATE per (table, value) group, inside a single
+transaction. The current statuses of the orders changing status are read
+in that transaction with ``select_for_update``, so two batches racing on
+the same order cannot both apply the same status change.
+
+Queryset updates skip model signals, so the earnings rollups, workload
+backlog and stock reservations that follow order statuses are adjusted
+here, for the orders whose status actually changed.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.utils import timezone
+
+from custom_order.models import TOrders
+from dress_order.models import Order
+from . import delivery_schedule, earnings, stock
+
+MAX_UPDATES = 500
+
+ORDER_MODELS = {'custom': TOrders, 'dress': Order}
+
+# Timeline columns in the order a tailor fills them in
+TIMELINE_FIELDS = {
+    'custom': ('measurements_confirmed', 'fabric_selected', 'cutting_started', 'stitching_started', 'deliver'),
+    'dress': ('order_confirmed', 'production', 'quality_check', 'deliver'),
+}
+STATUSES = {kind: {value for value, _ in model.STATUS_CHOICES} for kind, model in ORDER_MODELS.items()}
+
+
+class OrderUpdateError(Exception):
+    """Raised with a list of ``{index, error}`` problems; nothing is written."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid order updates")
+        self.errors = errors
+
+
+def _parse(index, raw):
+    if not isinstance(raw, dict):
+        raise ValueError("expected an object")
+    kind = raw.get('order_type')
+    if kind not in ORDER_MODELS:
+        raise ValueError(f"unknown order_type: {kind}")
+    try:
+        order_id = int(raw.get('order_id'))
+    except (TypeError, ValueError):
+        raise ValueError("order_id must be a number")
+    status, field = raw.get('status'), raw.get('timeline_field')
+    if status is None and field is None:
+        raise ValueError("give a status, a timeline_field or both")
+    if status is not None and status not in STATUSES[kind]:
+        raise ValueError(f"unknown status: {status}")
+    if field is not None and field not in TIMELINE_FIELDS[kind]:
+        raise ValueError(f"unknown timeline_field for {kind} orders: {field}")
+    day = None
+    if field is not None:
+        day = date.fromisoformat(raw['date']) if raw.get('date') else timezone.localdate()
+    return {'index': index, 'kind': kind, 'id': order_id, 'status': status, 'field': field, 'date': day}
+
+
+def parse_updates(raw_updates):
+    """Validate the request payload; raises OrderUpdateError listing every bad entry."""
+    if not isinstance(raw_updates, list) or not raw_updates:
+        raise OrderUpdateError([{'index': None, 'error': "updates must be a non-empty list"}])
+    if len(raw_updates) > MAX_UPDATES:
+        raise OrderUpdateError([{'index': None, 'error': f"at most {MAX_UPDATES} updates per request"}])
+    updates, errors = [], []
+    for index, raw in enumerate(raw_updates):
+        try:
+            updates.append(_parse(index, raw))
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append({'index': index, 'error': str(e)})
+    if errors:
+        raise OrderUpdateError(errors)
+    return updates
+
+
+def _owned_orders(tailor, updates):
+    """``{(kind, id)}`` of the requested orders that belong to ``tailor``, in one query."""
+    branches = []
+    for kind, model in ORDER_MODELS.items():
+        ids = {update['id'] for update in updates if update['kind'] == kind}
+        if ids:
+            branches.append(model.objects.filter(tailor=tailor, id__in=ids)
+                            .annotate(kind=Value(kind, output_field=CharField()))
+                            .order_by().values('kind', 'id'))
+    rows = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+    return {(row['kind'], row['id']) for row in rows}
+
+
+def _lock_statuses(kind, ids):
+    """Current statuses of ``ids``, locked until the transaction ends."""
+    return dict(ORDER_MODELS[kind].objects.select_for_update().filter(id__in=ids).values_list('id', 'status'))
+
+
+def _follow_status_changes(kind, changes):
+    """Run the bookkeeping the skipped save signals would have done."""
+    model = ORDER_MODELS[kind]
+    related = ('tailor', 'embroidery') if kind == 'custom' else ('tailor',)
+    orders = model.objects.select_related(*related).in_bulk(list(changes))
+    for order_id, old_status in changes.items():
+        order = orders[order_id]
+        earnings.apply_status_change(order, old_status)
+        delivery_schedule.apply_status_change(order, old_status)
+    if kind == 'dress':
+        stock.release_orders([order_id for order_id, order in orders.items() if order.status == 'canceled'])
+
+
+def apply_order_updates(tailor, updates):
+    """
+    Apply parsed updates to ``tailor``'s orders. Later entries for the same
+    order win. Returns ``{(kind, id): {'status': ..., field: date, ...}}``.
+    """
+    # Collapse to the final values per order, then group orders by the value they get
+    final = defaultdict(dict)
+    for update in updates:
+        key = (update['kind'], update['id'])
+        if update['status'] is not None:
+            final[key]['status'] = update['status']
+        if update['field'] is not None:
+            final[key][update['field']] = update['date']
+    groups = defaultdict(list)
+    for (kind, order_id), values in final.items():
+        for name, value in values.items():
+            groups[(kind, name, value)].append(order_id)
+
+    with transaction.atomic():
+        owned = _owned_orders(tailor, updates)
+        missing = [{'index': update['index'], 'error': f"order {update['id']} not found"}
+                   for update in updates if (update['kind'], update['id']) not in owned]
+        if missing:
+            raise OrderUpdateError(missing)
+
+        # Old statuses are read under row locks: a concurrent batch changing the
+        # same orders waits here, so each change's deltas are applied once
+        status_changes = defaultdict(dict)
+        for kind in ORDER_MODELS:
+            ids = [order_id for (key_kind, order_id), values in final.items()
+                   if key_kind == kind and 'status' in values]
+            for order_id, old_status in (_lock_statuses(kind, ids) if ids else {}).items():
+                if old_status != final[(kind, order_id)]['status']:
+                    status_changes[kind][order_id] = old_status
+
+        for (kind, name, value), ids in groups.items():
+            ORDER_MODELS[kind].objects.filter(id__in=ids).update(**{name: value})
+        for kind, changes in status_changes.items():
+            _follow_status_changes(kind, changes)
+    return dict(final)
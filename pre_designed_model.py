@@ -32,6 +32,13 @@ class PreDesigned(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['category', 'gender', 'price'], name='predesigned_cat_gender_idx'),
+            # Catalog API sync order
+            models.Index(fields=['updated_at', 'id'], name='predesigned_updated_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.tailor.business_name}"
 
@@ -39,6 +46,8 @@ class PreDesigned(models.Model):
 class Image(models.Model):
     predesigned = models.ForeignKey(PreDesigned, on_delete=models.CASCADE, related_name="images")
     image = models.ImageField(upload_to='photos/')
+    # Upload whose thumbnails exist, set by image_variants so templates need not probe storage
+    derivatives_for = models.CharField(max_length=255, blank=True, default='')
 
     def __str__(self):
         return f"Image for {self.predesigned.title}"
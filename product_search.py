@@ -0,0 +1,213 @@
+"""
+Full-text search over the pre-designed catalog.
+
+``get_backend()`` returns the backend named by ``PRODUCT_SEARCH_BACKEND``.
+``SQLiteFTS5Backend`` keeps an FTS5 table keyed by product id over the
+searchable PreDesigned columns and ranks matches with bm25, weighting the
+title most. ``BasicSearchBackend`` works on any database with ``icontains``
+filters and is meant for backends without a full-text index.
+
+The FTS5 table is created after ``migrate``. Signals keep the index in
+step with product saves and deletes. Rows
+written with bulk_create or update() are indexed by
+``manage.py rebuild_search_index``.
+"""
+import operator
+import re
+from functools import reduce
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from pre_designed.models import PreDesigned
+
+SEARCH_FIELDS = ('title', 'description', 'fabric_type', 'thread_type', 'color', 'category')
+SEARCH_PAGE_SIZE = 24
+MAX_TERMS = 8
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    """Words of a visitor's query, lowercased; punctuation and operators are dropped."""
+    return [term.lower() for term in _TERM.findall(query or '')][:MAX_TERMS]
+
+
+class SearchBackend:
+    """Interface for product search backends."""
+
+    def index(self, products):
+        raise NotImplementedError
+
+    def remove(self, product_ids):
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=2000):
+        """Reindex every product and return how many were indexed."""
+        raise NotImplementedError
+
+    def filter(self, queryset, terms):
+        """``queryset`` narrowed to products matching every one of ``terms``."""
+        raise NotImplementedError
+
+    def search(self, terms, offset, limit, queryset=None):
+        """
+        Ids of the best matches for ``terms`` (every term must match), best
+        first, optionally limited to the products in ``queryset``.
+        """
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    table = 'predesigned_fts'
+    # bm25 column weights, in SEARCH_FIELDS order
+    weights = (10.0, 2.0, 3.0, 1.0, 3.0, 4.0)
+
+    def create_table(self, using=DEFAULT_DB_ALIAS):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"{', '.join(SEARCH_FIELDS)}, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def _rows(self, products):
+        return [(product.pk, *[getattr(product, field) or '' for field in SEARCH_FIELDS]) for product in products]
+
+    def index(self, products):
+        rows = self._rows(products)
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            placeholders = ', '.join(['%s'] * (len(SEARCH_FIELDS) + 1))
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, {', '.join(SEARCH_FIELDS)}) VALUES ({placeholders})", rows)
+
+    def remove(self, product_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk in product_ids])
+
+    def rebuild(self, batch_size=2000):
+        self.create_table()
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+        count = 0
+        batch = []
+        for product in PreDesigned.objects.only('pk', *SEARCH_FIELDS).iterator(chunk_size=batch_size):
+            batch.append(product)
+            if len(batch) == batch_size:
+                self.index(batch)
+                count += len(batch)
+                batch = []
+        self.index(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return count + len(batch)
+
+    def _match(self, terms):
+        # Each term quoted so it is matched literally; the last one as a prefix for search-as-you-type
+        return ' '.join(f'"{term}"' for term in terms) + '*'
+
+    def filter(self, queryset, terms):
+        if not terms:
+            return queryset
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [self._match(terms)]))
+
+    def search(self, terms, offset, limit, queryset=None):
+        if not terms:
+            return []
+        where, params = '', [self._match(terms)]
+        if queryset is not None:
+            subquery, subquery_params = queryset.order_by().values('id').query.sql_with_params()
+            where = f" AND rowid IN ({subquery})"
+            params.extend(subquery_params)
+        weights = ', '.join(str(weight) for weight in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s{where} "
+                f"ORDER BY bm25({self.table}, {weights}), rowid LIMIT %s OFFSET %s",
+                params + [limit, offset],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class BasicSearchBackend(SearchBackend):
+    """Substring matching through the ORM; needs no index, ranks title matches first."""
+
+    def index(self, products):
+        pass
+
+    def remove(self, product_ids):
+        pass
+
+    def rebuild(self, batch_size=2000):
+        return 0
+
+    def filter(self, queryset, terms):
+        for term in terms:
+            queryset = queryset.filter(reduce(operator.or_, (Q(**{f'{field}__icontains': term})
+                                                             for field in SEARCH_FIELDS)))
+        return queryset
+
+    def search(self, terms, offset, limit, queryset=None):
+        if not terms:
+            return []
+        products = self.filter(PreDesigned.objects.all() if queryset is None else queryset, terms)
+        title_hits = sum(
+            (Case(When(title__icontains=term, then=Value(1)), default=Value(0), output_field=IntegerField())
+             for term in terms),
+            Value(0),
+        )
+        return list(products.annotate(title_hits=title_hits).order_by('-title_hits', '-id')
+                    .values_list('id', flat=True)[offset:offset + limit])
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        default = ('dorzi.product_search.SQLiteFTS5Backend' if connection.vendor == 'sqlite'
+                   else 'dorzi.product_search.BasicSearchBackend')
+        _backend = import_string(getattr(settings, 'PRODUCT_SEARCH_BACKEND', None) or default)()
+    return _backend
+
+
+def search_products(query, page=1, page_size=SEARCH_PAGE_SIZE, queryset=None):
+    """
+    Return ``(products, has_next)`` for one page of ranked results, with
+    tailors and images loaded. ``queryset`` restricts the products searched.
+    """
+    page = max(page, 1)
+    ids = get_backend().search(search_terms(query), (page - 1) * page_size, page_size + 1, queryset=queryset)
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+    found = (PreDesigned.objects.select_related('tailor__user').prefetch_related('images').in_bulk(ids))
+    # in_bulk loses the ranking; ids may also point at rows deleted since indexing
+    return [found[pk] for pk in ids if pk in found], has_next
+
+
+@receiver(post_save, sender=PreDesigned)
+def index_product(sender, instance, **kwargs):
+    get_backend().index([instance])
+
+
+@receiver(post_delete, sender=PreDesigned)
+def unindex_product(sender, instance, **kwargs):
+    get_backend().remove([instance.pk])
+
+
+@receiver(post_migrate)
+def create_search_table(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if sender.name != 'dorzi':
+        return
+    backend = get_backend()
+    if hasattr(backend, 'create_table'):
+        backend.create_table(using)
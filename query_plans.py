@@ -0,0 +1,114 @@
+"""
+EXPLAIN checks for the hot query patterns behind the views.
+
+``check_plans`` runs EXPLAIN for each entry of HOT_QUERIES against the
+current database and reports whether the plan reads through an index. Run
+it on a large seeded database (``manage.py generate_test_data``) with
+``manage.py explain_hot_queries``; on small tables a planner may reasonably
+prefer a full scan.
+
+Plans name the index they read. SQLite builds a ``UniqueConstraint`` into
+the table as ``sqlite_autoindex_<table>_N``, so ``index_names`` maps the
+name declared in Meta to every name the plan may show for it.
+"""
+import re
+
+from django.db import connection
+
+from customer.models import Customer
+from dorzi.order_feed import FEED_PAGE_SIZE, custom_rows, dress_rows
+from dress_order.models import Order
+from fabrics.models import Fabric
+from favorite_tailor.models import FavoriteTailor
+from pre_designed.models import PreDesigned
+from reviews.models import Reviews
+from tailor.models import Tailor
+
+# (name, index the Meta declares for it, queryset factory taking the sample values)
+HOT_QUERIES = [
+    # Each branch of the order feed's UNION, as order_feed_page sorts and limits it
+    ('custom orders in a customer feed', 'torders_customer_delivery_idx',
+     lambda s: custom_rows(s['customer']).order_by('-sort_date', '-id')[:FEED_PAGE_SIZE + 1]),
+    ('dress orders in a customer feed', 'order_customer_delivery_idx',
+     lambda s: dress_rows(s['customer_user']).order_by('-sort_date', '-id')[:FEED_PAGE_SIZE + 1]),
+    ('tailor orders by status', 'order_tailor_status_idx',
+     lambda s: Order.objects.filter(tailor_id=s['tailor'], status='pending')),
+    ('tailor reviews, newest first', 'reviews_tailor_time_idx',
+     lambda s: Reviews.objects.filter(tailor_id=s['tailor']).order_by('-timestamp')[:20]),
+    ('product reviews, newest first', 'reviews_product_time_idx',
+     lambda s: Reviews.objects.filter(product_id=s['product']).order_by('-timestamp')[:10]),
+    ('available fabrics of a tailor', 'fabric_tailor_available_idx',
+     lambda s: Fabric.objects.filter(tailor_id=s['tailor'], is_available=True)),
+    ('products by category and gender, cheapest first', 'predesigned_cat_gender_idx',
+     lambda s: PreDesigned.objects.filter(category=s['category'], gender=s['gender']).order_by('price')[:24]),
+    ('favorite lookup', 'favorite_tailor_unique',
+     lambda s: FavoriteTailor.objects.filter(user_id=s['customer'], tailor_id=s['tailor'])),
+]
+
+INDEX_MARKERS = {
+    'sqlite': ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY'),
+    'postgresql': ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan'),
+}
+FULL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN \S+\s*$', re.MULTILINE),
+    'postgresql': re.compile(r'\bSeq Scan\b'),
+}
+
+
+def sample_values():
+    """Real ids and values to plug into the queries, so plans reflect actual data."""
+    customer = Customer.objects.order_by('id').values('id', 'user_id').first() or {'id': 0, 'user_id': 0}
+    product = (PreDesigned.objects.exclude(category__isnull=True).exclude(gender__isnull=True)
+               .order_by('id').values('category', 'gender').first() or {'category': '', 'gender': ''})
+    return {
+        'customer': customer['id'],
+        'customer_user': customer['user_id'],
+        'tailor': Tailor.objects.order_by('id').values_list('id', flat=True).first() or 0,
+        'product': (Reviews.objects.exclude(product=None).order_by('id')
+                    .values_list('product_id', flat=True).first() or 0),
+        'category': product['category'],
+        'gender': product['gender'],
+    }
+
+
+def uses_index(plan, vendor=None):
+    """True or False for backends we can read plans of, None otherwise."""
+    vendor = vendor or connection.vendor
+    if vendor not in INDEX_MARKERS:
+        return None
+    return any(marker in plan for marker in INDEX_MARKERS[vendor]) and not FULL_SCAN[vendor].search(plan)
+
+
+def index_names(model, expected_index):
+    """Names ``expected_index`` on ``model`` can appear under in a plan."""
+    names = {expected_index}
+    if connection.vendor != 'sqlite':
+        return names
+    constraint = next((c for c in model._meta.constraints if c.name == expected_index), None)
+    if constraint is None or not getattr(constraint, 'fields', None):
+        return names
+    columns = [model._meta.get_field(field).column for field in constraint.fields]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA index_list({table})')
+        autoindexes = [row[1] for row in cursor.fetchall() if row[1].startswith('sqlite_autoindex_')]
+        for index in autoindexes:
+            cursor.execute(f'PRAGMA index_info({connection.ops.quote_name(index)})')
+            if [row[2] for row in cursor.fetchall()] == columns:
+                names.add(index)
+    return names
+
+
+def check_plans():
+    """
+    Yield ``(name, expected_index, plan, uses_index, uses_expected)`` for
+    every hot query; ``uses_expected`` is whether the plan names the index
+    the Meta declares for it.
+    """
+    samples = sample_values()
+    for name, expected_index, build in HOT_QUERIES:
+        queryset = build(samples)
+        plan = queryset.explain()
+        expected = any(re.search(rf'\b{re.escape(index)}\b', plan)
+                       for index in index_names(queryset.model, expected_index))
+        yield name, expected_index, plan, uses_index(plan), expected
@@ -0,0 +1,69 @@
+"""
+Newest-first review feeds for a product or a tailor.
+
+Pages are cut with a keyset cursor on ``(timestamp, id)``, so every page
+is an index range read on ``reviews_product_time_idx`` or
+``reviews_tailor_time_idx``. With OFFSET paging, the database walks every
+skipped row, and rows shift when reviews arrive while someone is paging.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Count, Q
+
+REVIEW_PAGE_SIZE = 10
+RATINGS = range(1, 6)
+
+
+def _encode_cursor(review):
+    raw = json.dumps([review.timestamp.isoformat(), review.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Return ``(timestamp, id)`` for a cursor, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def review_page(queryset, cursor=None, page_size=REVIEW_PAGE_SIZE):
+    """
+    Return ``(reviews, next_cursor)`` for one page of ``queryset``, newest
+    first. ``next_cursor`` is None on the last page.
+    """
+    cursor = _decode_cursor(cursor)
+    reviews = queryset.select_related('customer__user').order_by('-timestamp', '-id')
+    if cursor is not None:
+        timestamp, pk = cursor
+        reviews = reviews.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+    reviews = list(reviews[:page_size + 1])
+
+    next_cursor = None
+    if len(reviews) > page_size:
+        reviews = reviews[:page_size]
+        next_cursor = _encode_cursor(reviews[-1])
+    return reviews, next_cursor
+
+
+def rating_histogram(queryset):
+    """Review count per star rating, 1 to 5, from one grouped query."""
+    counts = dict(queryset.order_by().values_list('rating').annotate(count=Count('id')))
+    return {rating: counts.get(rating, 0) for rating in RATINGS}
+
+
+def review_entry(review):
+    return {
+        'id': review.id,
+        'user': review.customer.user.username if review.customer.user else '',
+        'rating': review.rating,
+        'comment': review.comment or '',
+        'timestamp': review.timestamp.strftime('%Y-%m-%d %H:%M'),
+    }
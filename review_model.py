@@ -1,4 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest, Now
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from tailor.models import Tailor
 from pre_designed.models import PreDesigned
 from customer.models import Customer
@@ -30,11 +34,26 @@ class Reviews(models.Model):
 
     class Meta:
         unique_together = ('customer', 'product')  
+        indexes = [
+            models.Index(fields=['tailor', 'timestamp'], name='reviews_tailor_time_idx'),
+            models.Index(fields=['product', 'timestamp'], name='reviews_product_time_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if self.rating < 1 or self.rating > 5:
             raise ValueError("Rating must be between 1 and 5.")
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = Reviews.objects.filter(pk=self.pk).values('tailor_id', 'rating').first()
+            super().save(*args, **kwargs)
+            if previous is None:
+                apply_rating_change(self.tailor_id, self.rating, 1)
+            elif previous['tailor_id'] != self.tailor_id:
+                apply_rating_change(previous['tailor_id'], -previous['rating'], -1)
+                apply_rating_change(self.tailor_id, self.rating, 1)
+            elif previous['rating'] != self.rating:
+                apply_rating_change(self.tailor_id, self.rating - previous['rating'], 0)
 
     def __str__(self):
         if self.product:
@@ -42,3 +61,55 @@ class Reviews(models.Model):
         return f"Review by {self.customer.username} on {self.tailor.user.username} - {self.rating}/5"
     def get_rating_display(self):
         return f"{self.rating} out of 5 stars"
+
+
+def apply_rating_change(tailor_id, rating_delta, count_delta):
+    """
+    Adjust a tailor's stored rating totals in a single UPDATE.
+
+    All three columns are computed from the row's current values inside the
+    database, so concurrent reviews for the same tailor cannot lose updates.
+    Totals stop at zero: reviews written with bulk_create and not yet rebuilt
+    were never counted, and deleting one must not break the columns' CHECK.
+    """
+    new_sum = Greatest(F('rating_sum') + rating_delta, Value(0))
+    new_count = Greatest(F('review_count') + count_delta, Value(0))
+    Tailor.objects.filter(pk=tailor_id).update(
+        updated_at=Now(),
+        rating_sum=new_sum,
+        review_count=new_count,
+        average_rating=Case(
+            When(review_count__lte=-count_delta, then=Value(0.0)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        ),
+    )
+
+
+def rebuild_rating_aggregates():
+    """
+    Recompute every tailor's rating columns from Reviews with two set-based
+    UPDATEs. Needed after bulk_create/update, which skip Reviews.save.
+    Returns the number of tailors updated.
+    """
+    per_tailor = Reviews.objects.filter(tailor=OuterRef('pk')).order_by().values('tailor')
+    rating_sum = per_tailor.annotate(total=Sum('rating')).values('total')
+    review_count = per_tailor.annotate(total=Count('id')).values('total')
+
+    with transaction.atomic():
+        updated = Tailor.objects.update(
+            updated_at=Now(),
+            rating_sum=Coalesce(Subquery(rating_sum, output_field=IntegerField()), Value(0)),
+            review_count=Coalesce(Subquery(review_count, output_field=IntegerField()), Value(0)),
+            average_rating=Value(0.0),
+        )
+        Tailor.objects.filter(review_count__gt=0).update(
+            average_rating=Cast(F('rating_sum'), FloatField()) / F('review_count'),
+        )
+    return updated
+
+
+@receiver(post_delete, sender=Reviews)
+def remove_review_rating(sender, instance, **kwargs):
+    # Also runs for queryset and cascade deletes, which bypass Model.delete
+    apply_rating_change(instance.tailor_id, -instance.rating, -1)
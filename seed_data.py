@@ -0,0 +1,260 @@
+"""
+Deterministic synthetic catalog and order data.
+
+``generate`` fills the database with tailors, pre-designed products and
+their images, fabrics, embroidery designs, customers, reviews, custom
+orders and pre-designed orders. Rows are inserted with bulk_create in
+chunks, each chunk in its own transaction, so a million-row dataset builds
+in minutes. Model instances are dropped after every chunk; only a small id
+tuple per tailor and per product is kept for the customer rows to pick
+from, so memory grows with the catalog but not with customers, reviews or
+orders.
+
+Every tailor and customer draws from its own RNG derived from the seed and
+its index, so the same volumes and seed always produce the same rows,
+whatever the chunk or batch size.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from custom_order.models import TOrders
+from customer.models import Customer
+from dorzi.delivery_schedule import rebuild_workloads
+from dorzi.earnings import rebuild_rollups
+from dorzi.order_updates import TIMELINE_FIELDS
+from dorzi.product_search import get_backend
+from dress_order.models import Order
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image, PreDesigned
+from reviews.models import Reviews, rebuild_rating_aggregates
+from tailor.models import Tailor
+
+DEFAULT_VOLUMES = {
+    'tailors': 200,
+    'products_per_tailor': 5,
+    'images_per_product': 2,
+    'fabrics_per_tailor': 3,
+    'embroidery_per_tailor': 3,
+    'customers': 100,
+    'reviews_per_customer': 5,
+    'custom_orders_per_customer': 5,
+    'orders_per_customer': 5,
+}
+
+SEED_PASSWORD = 'benchmark'
+
+# Fixed so generated dates do not depend on when the data was built
+BASE_DATE = date(2025, 1, 1)
+
+LOCATIONS = ['Dhaka', 'Chittagong', 'Sylhet', 'Khulna', 'Rajshahi', 'Barisal', 'Rangpur', 'Mymensingh',
+             'Narayanganj', 'Gazipur', 'Comilla', 'Bogura']
+COLORS = ['Red', 'Blue', 'Black', 'White', 'Green', 'Maroon', 'Navy', 'Cream', 'Golden', 'Pink']
+THREADS = ['cotton', 'silk', 'polyester', 'zari']
+GARMENTS = ['Punjabi', 'Shirt', 'Pant', 'Kameez', 'Blouse', 'Lehenga', 'Sherwani']
+COMMENTS = ['Great fitting', 'Delivered on time', 'Good stitching', 'Could be better', 'Excellent work']
+
+# Timeline columns in the order a tailor fills them in
+CUSTOM_TIMELINE = TIMELINE_FIELDS['custom']
+DRESS_TIMELINE = TIMELINE_FIELDS['dress']
+
+
+def _choices(model, field):
+    return [value for value, _ in model._meta.get_field(field).choices]
+
+
+def _rng(seed, kind, index):
+    return random.Random(f'{seed}:{kind}:{index}')
+
+
+def _timeline(fields, status, start, rng):
+    """Stage dates consistent with ``status``: delivered orders have every stage, pending none."""
+    done = {
+        'pending': 0,
+        'canceled': 1,
+        'processing': 2,
+        'shipped': len(fields) - 1,
+        'delivered': len(fields),
+    }[status]
+    values = {}
+    day = start
+    for field in fields[:done]:
+        day += timedelta(days=rng.randint(1, 4))
+        values[field] = day
+    return values
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield range(start, min(start + size, total))
+
+
+def generate(volumes=None, seed=0, batch_size=1000, chunk_size=1000, progress=None):
+    """
+    Insert one synthetic dataset and return the number of rows created per model.
+
+    ``volumes`` overrides entries of DEFAULT_VOLUMES. Usernames and NIDs are
+    prefixed with the seed, so datasets with different seeds can coexist.
+    ``progress`` is called with a short message after every chunk.
+    """
+    volumes = {**DEFAULT_VOLUMES, **(volumes or {})}
+    password = make_password(SEED_PASSWORD)
+
+    tailor_categories = _choices(Tailor, 'category')
+    expertise_levels = _choices(Tailor, 'expertise')
+    product_categories = _choices(PreDesigned, 'category')
+    genders = _choices(PreDesigned, 'gender')
+    fabric_types = _choices(Fabric, 'fabric_type')
+    patterns = _choices(Fabric, 'pattern')
+    complexities = _choices(Embroidery, 'complexity_level')
+    custom_categories = _choices(TOrders, 'category')
+    statuses = _choices(Order, 'status')
+    sizes = _choices(Order, 'size')
+
+    created = dict.fromkeys(['tailors', 'products', 'images', 'fabrics', 'embroidery', 'customers',
+                             'reviews', 'custom_orders', 'orders'], 0)
+    # Compact references kept for the whole run, one per tailor and per product,
+    # for reviews and orders to pick from
+    tailor_refs = []   # (id, price)
+    product_refs = []  # (id, tailor_id, price, category)
+
+    for indexes in _chunks(volumes['tailors'], chunk_size):
+        with transaction.atomic():
+            rngs = [_rng(seed, 'tailor', i) for i in indexes]
+            users = User.objects.bulk_create([
+                User(username=f'tailor{seed}_{i}@example.com', email=f'tailor{seed}_{i}@example.com',
+                     first_name='Tailor', last_name=f'{seed}-{i}', password=password)
+                for i in indexes
+            ], batch_size=batch_size)
+            tailors = Tailor.objects.bulk_create([
+                Tailor(user=user, business_name=f'Shop {seed}-{i}',
+                       business_location=rng.choice(LOCATIONS),
+                       NID=f'S{seed}N{i}',
+                       category=rng.choice(tailor_categories),
+                       expertise=rng.choice(expertise_levels),
+                       services_offered=rng.choice(GARMENTS),
+                       price=Decimal(rng.randrange(300, 5000, 50)))
+                for i, user, rng in zip(indexes, users, rngs)
+            ], batch_size=batch_size)
+
+            products = PreDesigned.objects.bulk_create([
+                PreDesigned(tailor=tailor, title=f'{rng.choice(COLORS)} {rng.choice(GARMENTS)} {i}-{j}',
+                            description='Synthetic pre-designed listing',
+                            availability=rng.randint(0, 20),
+                            price=Decimal(rng.randrange(500, 20000, 100)),
+                            category=rng.choice(product_categories),
+                            fabric_type=rng.choice(fabric_types),
+                            thread_type=rng.choice(THREADS),
+                            color=rng.choice(COLORS),
+                            gender=rng.choice(genders),
+                            estimated_time=timedelta(days=rng.randint(3, 21)))
+                for i, tailor, rng in zip(indexes, tailors, rngs)
+                for j in range(volumes['products_per_tailor'])
+            ], batch_size=batch_size)
+            images = Image.objects.bulk_create([
+                Image(predesigned=product, image=f'photos/seed{seed}_{product.id}_{k}.jpg')
+                for product in products
+                for k in range(volumes['images_per_product'])
+            ], batch_size=batch_size)
+            fabrics = Fabric.objects.bulk_create([
+                Fabric(tailor=tailor, name=f'{rng.choice(COLORS)} {rng.choice(fabric_types).title()} {i}-{j}',
+                       fabric_type=rng.choice(fabric_types), pattern=rng.choice(patterns),
+                       color=rng.choice(COLORS),
+                       width=Decimal(rng.choice([36, 44, 58, 60])),
+                       length_available=Decimal(rng.randint(0, 100)),
+                       price_per_meter=Decimal(rng.randrange(100, 2000, 10)),
+                       is_available=rng.random() > 0.1)
+                for i, tailor, rng in zip(indexes, tailors, rngs)
+                for j in range(volumes['fabrics_per_tailor'])
+            ], batch_size=batch_size)
+            embroideries = Embroidery.objects.bulk_create([
+                Embroidery(tailor=tailor, title=f'Design {i}-{j}',
+                           thread_type=rng.choice(THREADS), color=rng.choice(COLORS),
+                           complexity_level=rng.choice(complexities),
+                           price=Decimal(rng.randrange(100, 3000, 50)),
+                           estimated_time=timedelta(hours=rng.randint(2, 48)))
+                for i, tailor, rng in zip(indexes, tailors, rngs)
+                for j in range(volumes['embroidery_per_tailor'])
+            ], batch_size=batch_size)
+
+        tailor_refs.extend((tailor.id, tailor.price) for tailor in tailors)
+        product_refs.extend((p.id, p.tailor_id, p.price, p.category) for p in products)
+        created['tailors'] += len(tailors)
+        created['products'] += len(products)
+        created['images'] += len(images)
+        created['fabrics'] += len(fabrics)
+        created['embroidery'] += len(embroideries)
+        if progress:
+            progress(f"{created['tailors']}/{volumes['tailors']} tailors")
+
+    order_index = 0
+    for indexes in _chunks(volumes['customers'], chunk_size):
+        with transaction.atomic():
+            rngs = [_rng(seed, 'customer', i) for i in indexes]
+            users = User.objects.bulk_create([
+                User(username=f'customer{seed}_{i}@example.com', email=f'customer{seed}_{i}@example.com',
+                     first_name='Customer', last_name=f'{seed}-{i}', password=password)
+                for i in indexes
+            ], batch_size=batch_size)
+            customers = Customer.objects.bulk_create([
+                Customer(user=user, phone=f'017{i:08d}'[-11:], address=rng.choice(LOCATIONS))
+                for i, user, rng in zip(indexes, users, rngs)
+            ], batch_size=batch_size)
+
+            reviews = []
+            custom_orders = []
+            orders = []
+            for customer, rng in zip(customers, rngs):
+                # (customer, product) is unique, so sample without replacement
+                for product_id, tailor_id, _, _ in rng.sample(
+                        product_refs, min(volumes['reviews_per_customer'], len(product_refs))):
+                    reviews.append(Reviews(customer=customer, tailor_id=tailor_id, product_id=product_id,
+                                           rating=rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 5])[0],
+                                           comment=rng.choice(COMMENTS)))
+
+                for _ in range(volumes['custom_orders_per_customer'] if tailor_refs else 0):
+                    tailor_id, tailor_price = rng.choice(tailor_refs)
+                    # Cycle through the states so every one is represented even in small datasets
+                    status = statuses[order_index % len(statuses)]
+                    order_index += 1
+                    start = BASE_DATE + timedelta(days=rng.randint(0, 365))
+                    custom_orders.append(TOrders(
+                        customer=customer, tailor_id=tailor_id, category=rng.choice(custom_categories),
+                        address=customer.address, contact_number=customer.phone,
+                        gender=rng.choice(genders), garment_type=rng.choice(GARMENTS),
+                        fabrics=rng.choice(fabric_types), color=rng.choice(COLORS),
+                        status=status, price=tailor_price,
+                        delivery_date=None if rng.random() < 0.1 else start + timedelta(days=21),
+                        **_timeline(CUSTOM_TIMELINE, status, start, rng)))
+
+                for _ in range(volumes['orders_per_customer'] if product_refs else 0):
+                    product_id, tailor_id, price, category = rng.choice(product_refs)
+                    status = statuses[order_index % len(statuses)]
+                    order_index += 1
+                    start = BASE_DATE + timedelta(days=rng.randint(0, 365))
+                    orders.append(Order(
+                        customer_id=customer.user_id, tailor_id=tailor_id, product_id=product_id,
+                        quantity=rng.randint(1, 4), price=price, category=category,
+                        address=customer.address, number=customer.phone, size=rng.choice(sizes),
+                        status=status, delivery_date=start + timedelta(days=10),
+                        **_timeline(DRESS_TIMELINE, status, start, rng)))
+
+            created['reviews'] += len(Reviews.objects.bulk_create(reviews, batch_size=batch_size))
+            created['custom_orders'] += len(TOrders.objects.bulk_create(custom_orders, batch_size=batch_size))
+            created['orders'] += len(Order.objects.bulk_create(orders, batch_size=batch_size))
+        created['customers'] += len(customers)
+        if progress:
+            progress(f"{created['customers']}/{volumes['customers']} customers")
+
+    # bulk_create skips Reviews.save, so rebuild the denormalized ratings once
+    rebuild_rating_aggregates()
+    # ...and it skips the search index, workload and earnings signals too
+    get_backend().rebuild()
+    rebuild_workloads()
+    rebuild_rollups()
+    return created
@@ -19,6 +19,7 @@ TEMPLATES_DIR=os.path.join(BASE_DIR, 'templates')
 STATICS_DIR=os.path.join(BASE_DIR,'statics')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+IMAGE_DERIVATIVE_WIDTHS = (160, 320, 640)  # thumbnail widths generated for uploads (see image_variants.py)
 
 
 # Quick-start development settings - unsuitable for production
@@ -59,6 +60,7 @@ INSTALLED_APPS = [
     'allauth.socialaccount.providers.google',
     'crispy_forms',
     'rest_framework',
+    'dorzi',  # project-level management commands
 ]
 
 SITE_ID = 1
@@ -92,6 +94,8 @@ SOCIALACCOUNT_LOGIN_ON_GET = True
 
 
 MIDDLEWARE = [
+    'dorzi.instrumentation.RequestMetricsMiddleware',
+    'dorzi.db_router.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -106,7 +110,8 @@ ROOT_URLCONF = 'dorzi.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus render timing for RequestMetricsMiddleware
+        'BACKEND': 'dorzi.instrumentation.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -115,12 +120,14 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'dorzi.catalog_cache.csrf_placeholder',
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'dorzi.wsgi.application'
+ASGI_APPLICATION = 'dorzi.asgi.application'
 
 
 # Database
@@ -133,6 +140,47 @@ DATABASES = {
     }
 }
 
+# Read replica for catalog reads (see db_router.py). Set DORZI_REPLICA_DB to a
+# second SQLite file and run `manage.py replicate_db` to keep it in sync.
+# Without it the alias still exists, as a mirror of default that nothing is
+# routed to, so the routing tests can turn it on.
+DATABASE_REPLICA_ALIAS = 'replica' if os.environ.get('DORZI_REPLICA_DB') else None
+DATABASE_ROUTERS = ['dorzi.db_router.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = 5  # how long reads stay on the primary after a write
+
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': os.environ.get('DORZI_REPLICA_DB', DATABASES['default']['NAME']),
+    'TEST': {'MIRROR': 'default'},
+}
+
+
+# Cache
+# Local memory by default. Set DORZI_CACHE_BACKEND=file or redis (with
+# DORZI_CACHE_LOCATION) to share cached catalog pages between processes.
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'dorzi'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+_cache_backend, _cache_location = CACHE_BACKENDS[os.environ.get('DORZI_CACHE_BACKEND', 'locmem')]
+
+CACHES = {
+    'default': {
+        'BACKEND': _cache_backend,
+        'LOCATION': os.environ.get('DORZI_CACHE_LOCATION', _cache_location),
+        # MAX_ENTRIES applies to the local memory and file backends; Redis evicts on its own
+        'OPTIONS': {} if _cache_backend.endswith('RedisCache') else {'MAX_ENTRIES': 10000},
+    }
+}
+
+CATALOG_CACHE_TIMEOUT = 600  # seconds; signals invalidate catalog entries sooner on any change
+
+# Full-text search over pre-designed products. Unset picks SQLiteFTS5Backend on
+# SQLite and BasicSearchBackend (icontains) elsewhere.
+PRODUCT_SEARCH_BACKEND = os.environ.get('DORZI_PRODUCT_SEARCH_BACKEND')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -180,3 +228,34 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True  # Session expires when browser closes
+
+# Request instrumentation (see instrumentation.py)
+INTERNAL_IPS = ['127.0.0.1', '::1']  # clients allowed to read /perf/metrics/
+PERF_SLOW_REQUEST_MS = 500  # log requests slower than this
+PERF_WINDOW_SIZE = 200  # samples kept per view for p50/p95
+
+# Background jobs (see jobs.py, run with `manage.py run_worker`)
+JOB_LOCK_TIMEOUT = 600  # seconds before a job held by a silent worker is requeued
+
+# Delivery date quotes (see delivery_schedule.py). Work is counted in business days.
+DELIVERY_WEEKEND_DAYS = (4,)  # Friday; Monday is 0
+DELIVERY_DAILY_CAPACITY = 2  # business days of work a tailor gets through per business day
+DELIVERY_CUSTOM_ORDER_DAYS = 3  # per custom order, plus its embroidery's estimated_time
+DELIVERY_DRESS_ORDER_DAYS = 1  # per pre-designed piece ordered
+DELIVERY_CUSTOM_MIN_LEAD = 21  # business days, however idle the tailor is
+DELIVERY_DRESS_MIN_LEAD = 8
+
+# Stock reservations (see stock.py); expire held ones with `manage.py expire_reservations`
+STOCK_RESERVATION_TTL = 900  # seconds a checkout may hold units before they go back on sale
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'dorzi.performance': {'handlers': ['console'], 'level': 'WARNING'},
+        'dorzi.jobs': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
@@ -0,0 +1,120 @@
+"""
+Stock reservations for pre-designed products.
+
+``reserve`` takes units out of ``PreDesigned.availability`` with a single
+conditional UPDATE (``availability = availability - n WHERE availability
+>= n``), so concurrent checkouts never read, compare and write the count in
+Python. They cannot oversell, and they wait on each other only for the
+length of that statement. Each reservation is recorded as a
+StockReservation row:
+
+- ``held`` until ``commit`` ties it to an order;
+- ``released`` when the order is canceled or the checkout gives up;
+- ``expired`` when ``expire_reservations`` (``manage.py
+  expire_reservations``) finds it still held past its deadline.
+
+The last two put the units back. Every status move is itself a conditional
+UPDATE, so a reservation's units are returned at most once.
+
+Availability only feeds the catalog pages through the in-stock facet, so
+the catalog version is bumped when a product sells out or units come back,
+not on every sale. The catalog API serializes the count itself, so every
+change to it also moves ``updated_at``, which its validators and sync
+cursor follow.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Now
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from dress_order.models import Order
+from pre_designed.models import PreDesigned
+from .catalog_cache import bump_catalog_version
+from .models import StockReservation
+
+
+class OutOfStock(Exception):
+    pass
+
+
+def reservation_ttl():
+    return timedelta(seconds=getattr(settings, 'STOCK_RESERVATION_TTL', 900))
+
+
+def reserve(product, quantity, ttl=None):
+    """Hold ``quantity`` units of ``product``; raises OutOfStock if fewer are available."""
+    if quantity <= 0:
+        raise ValueError("quantity must be positive")
+    products = PreDesigned.objects.filter(pk=product.pk)
+    with transaction.atomic():
+        taken = products.filter(availability__gt=quantity).update(
+            availability=F('availability') - quantity, updated_at=Now())
+        # Only a sale that empties the product needs the second statement
+        sold_out = not taken and bool(products.filter(availability=quantity).update(
+            availability=F('availability') - quantity, updated_at=Now()))
+        if not taken and not sold_out:
+            raise OutOfStock(f"Only {products.values_list('availability', flat=True).first() or 0} "
+                             f"left of {product.title}.")
+        reservation = StockReservation.objects.create(
+            product=product, quantity=quantity, expires_at=timezone.now() + (ttl or reservation_ttl()))
+    if sold_out:
+        bump_catalog_version()
+    return reservation
+
+
+def commit(reservation, order):
+    """Tie a held reservation to the order it was taken for."""
+    committed = (StockReservation.objects.filter(pk=reservation.pk, status='held')
+                 .update(status='committed', order=order))
+    if not committed:
+        raise OutOfStock("The reservation has lapsed; the units are back on sale.")
+    reservation.status, reservation.order = 'committed', order
+
+
+def _return_units(reservation, to_status, from_statuses):
+    with transaction.atomic():
+        moved = (StockReservation.objects.filter(pk=reservation.pk, status__in=from_statuses)
+                 .update(status=to_status))
+        if moved:
+            PreDesigned.objects.filter(pk=reservation.product_id).update(
+                availability=F('availability') + reservation.quantity, updated_at=Now())
+    return bool(moved)
+
+
+def release(reservation):
+    """Put a held or committed reservation's units back on sale. Returns False if already done."""
+    released = _return_units(reservation, 'released', ('held', 'committed'))
+    if released:
+        bump_catalog_version()
+    return released
+
+
+def expire_reservations(now=None):
+    """Return the units of every held reservation past its deadline. Returns how many expired."""
+    now = now or timezone.now()
+    stale = (StockReservation.objects.filter(status='held', expires_at__lt=now)
+             .only('id', 'product_id', 'quantity'))
+    expired = sum(_return_units(reservation, 'expired', ('held',)) for reservation in stale.iterator())
+    if expired:
+        bump_catalog_version()
+    return expired
+
+
+def release_orders(order_ids):
+    """Release the committed reservations of canceled orders. Returns how many were released."""
+    reservations = StockReservation.objects.filter(order_id__in=order_ids, status='committed')
+    released = sum(_return_units(reservation, 'released', ('committed',)) for reservation in reservations)
+    if released:
+        bump_catalog_version()
+    return released
+
+
+@receiver(post_save, sender=Order)
+def order_canceled(sender, instance, created, **kwargs):
+    if instance.status == 'canceled' and not created:
+        release_orders([instance.pk])
@@ -83,8 +83,15 @@ class Tailor(models.Model):
     purchased_products = models.JSONField(default=list)
 
     profile_picture = models.ImageField(upload_to="tailor_profiles/", blank=True, null=True)
+    # Upload whose thumbnails exist, set by image_variants so templates need not probe storage
+    derivatives_for = models.CharField(max_length=255, blank=True, default='')
+    # Maintained by Reviews.save / review deletion; rebuild with `manage.py rebuild_tailor_ratings`
+    rating_sum = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
     average_rating = models.FloatField(default=0.0)
     is_available = models.BooleanField(default=True)
+    # Also bumped by apply_rating_change, whose UPDATE skips auto_now
+    updated_at = models.DateTimeField(auto_now=True)
     
     Chest = models.CharField(max_length=10, blank=True, null=True)
     waist = models.CharField(max_length=10, blank=True, null=True)
@@ -98,6 +105,16 @@ class Tailor(models.Model):
     
     total_earning = models.DecimalField(max_digits=12, decimal_places=2, default=0.0)
 
+    class Meta:
+        # Keyset pagination on findTailor walks these (sort column, id) pairs
+        indexes = [
+            models.Index(fields=['price', 'id'], name='tailor_price_id_idx'),
+            models.Index(fields=['average_rating', 'id'], name='tailor_rating_id_idx'),
+            models.Index(fields=['category', 'price'], name='tailor_category_price_idx'),
+            models.Index(fields=['business_location'], name='tailor_location_idx'),
+            # Catalog API sync order
+            models.Index(fields=['updated_at', 'id'], name='tailor_updated_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.business_name} ({self.user.username})"
@@ -0,0 +1,169 @@
+"""
+Server-side search for the findTailor page.
+
+Filtering, sorting and paging all happen in the database. Pages use keyset
+(cursor) pagination on ``(sort column, id)`` so every page costs the same,
+however many tailors are registered.
+"""
+import base64
+import binascii
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+from tailor.models import Tailor
+
+PAGE_SIZE = 24
+
+# Sidebar specialization groups -> Tailor.category values
+CATEGORY_GROUPS = {
+    'punjabi': [
+        'Short_Punjabi', 'Long_Punjabi', 'Designer_Punjabi',
+        'Embroidered_Punjabi', 'Kurta_Punjabi', 'Traditional_Punjabi',
+    ],
+    'shirt': [
+        'Formal_Shirt', 'Casual_Shirt', 'Half_Sleeve_Shirt', 'Denim_Shirt',
+        'T_Shirt', 'Sleeveless_Shirt', 'Printed_Shirt',
+    ],
+    'pant': [
+        'Kurta', 'Formal_Pant', 'Jeans', 'Cargo_Pant', 'Chinos', 'Trouser',
+        'Shorts', 'Leggings',
+    ],
+    'women_dress': [
+        'Salwar_Kameez', 'Lehenga', 'Blouse', 'Saree_Fall_Pleat', 'Gown',
+        'Maxi_Dress', 'Anarkali', 'Skirt', 'Palazzo', 'Tops', 'Kameez',
+        'Saree_Blouse', 'Waistcoat', 'Jacket', 'Coat', 'Sherwani', 'Kids_Dress',
+    ],
+}
+
+# ?sort= value -> (column, descending)
+SORT_OPTIONS = {
+    'low-to-high': ('price', False),
+    'high-to-low': ('price', True),
+    'rating': ('average_rating', True),
+}
+DEFAULT_SORT = ('id', False)
+
+# How to turn a cursor value back into the column's Python type
+_CURSOR_TYPES = {
+    'price': Decimal,
+    'average_rating': float,
+    'id': int,
+}
+
+
+def _to_decimal(value):
+    try:
+        return Decimal(value) if value not in (None, '') else None
+    except InvalidOperation:
+        return None
+
+
+def _to_float(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def encode_cursor(value, pk):
+    raw = json.dumps([str(value), pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, field):
+    """Return ``(value, pk)`` for a cursor, or None if it is missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return _CURSOR_TYPES[field](value), int(pk)
+    except (binascii.Error, ValueError, TypeError, InvalidOperation, UnicodeDecodeError):
+        return None
+
+
+def _after(field, descending, value, pk):
+    """Rows strictly after ``(value, pk)`` in the page ordering."""
+    op = 'lt' if descending else 'gt'
+    if field == 'id':
+        return Q(**{f'id__{op}': pk})
+    return Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+
+
+def filter_tailors(params, exclude_user=None):
+    """Apply the findTailor search/filter parameters to the tailor queryset."""
+    queryset = Tailor.objects.select_related('user')
+    if exclude_user is not None:
+        queryset = queryset.exclude(user=exclude_user)
+
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(business_name__icontains=search)
+            | Q(user__first_name__icontains=search)
+            | Q(user__last_name__icontains=search)
+        )
+
+    categories = []
+    for group in params.getlist('category'):
+        categories.extend(CATEGORY_GROUPS.get(group, []))
+    if categories:
+        queryset = queryset.filter(category__in=categories)
+
+    locations = [location for location in params.getlist('location') if location]
+    if locations:
+        queryset = queryset.filter(business_location__in=locations)
+
+    min_price = _to_decimal(params.get('min_price'))
+    if min_price is not None:
+        queryset = queryset.filter(price__gte=min_price)
+    max_price = _to_decimal(params.get('max_price'))
+    if max_price is not None:
+        queryset = queryset.filter(price__lte=max_price)
+
+    min_rating = _to_float(params.get('min_rating'))
+    if min_rating is not None:
+        queryset = queryset.filter(average_rating__gte=min_rating)
+
+    return queryset
+
+
+def search_tailors(params, exclude_user=None, page_size=PAGE_SIZE):
+    """
+    Return ``(tailors, next_cursor)`` for one page of findTailor results.
+
+    ``params`` is a QueryDict (normally ``request.GET``). ``next_cursor`` is
+    None on the last page.
+    """
+    queryset = filter_tailors(params, exclude_user=exclude_user)
+    field, descending = SORT_OPTIONS.get(params.get('sort'), DEFAULT_SORT)
+
+    cursor = decode_cursor(params.get('cursor'), field)
+    if cursor is not None:
+        queryset = queryset.filter(_after(field, descending, *cursor))
+
+    prefix = '-' if descending else ''
+    ordering = [prefix + 'id'] if field == 'id' else [prefix + field, prefix + 'id']
+
+    # Fetch one extra row to know whether another page exists
+    tailors = list(queryset.order_by(*ordering)[:page_size + 1])
+    next_cursor = None
+    if len(tailors) > page_size:
+        tailors = tailors[:page_size]
+        last = tailors[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.id)
+    return tailors, next_cursor
+
+
+def carried_filters(params):
+    """``(name, value)`` pairs of the active filters, for a new search to keep. It starts on page one."""
+    return [(name, value) for name, values in params.lists() if name not in ('search', 'cursor')
+            for value in values]
+
+
+def page_query(params, cursor):
+    """Query string for the page starting at ``cursor``, keeping the current filters."""
+    query = params.copy()
+    query['cursor'] = cursor
+    return query.urlencode()
@@ -0,0 +1,55 @@
+from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from dorzi.catalog_cache import (
+    CSRF_PLACEHOLDER, PLACEHOLDER_USER, SIGNED_IN_VARIANT, cache_timeout, fill_user_placeholders,
+)
+
+register = template.Library()
+
+
+class AnonymousCacheNode(template.Node):
+
+    def __init__(self, nodelist, fragment_name, vary_on):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        user = context.get('user')
+        request = context.get('request')
+        if user is None or (user.is_authenticated and request is None):
+            return self.nodelist.render(context)
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        if user.is_authenticated:
+            # One copy for all signed-in visitors, personalized after the cache
+            key = make_template_fragment_key(self.fragment_name, vary_on + [SIGNED_IN_VARIANT])
+            value = cache.get(key)
+            if value is None:
+                with context.push(user=PLACEHOLDER_USER, csrf_token=CSRF_PLACEHOLDER):
+                    value = self.nodelist.render(context)
+                cache.set(key, value, cache_timeout())
+            return fill_user_placeholders(value, request)
+        key = make_template_fragment_key(self.fragment_name, vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = self.nodelist.render(context)
+            cache.set(key, value, cache_timeout())
+        return value
+
+
+@register.tag('anonymous_cache')
+def do_anonymous_cache(parser, token):
+    """
+    Like {% cache %} with the catalog timeout. Anonymous visitors share one copy;
+    signed-in visitors share another with their own details filled in:
+
+        {% anonymous_cache home_tailor_card tailor.id %} ... {% endanonymous_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name.")
+    nodelist = parser.parse(('endanonymous_cache',))
+    parser.delete_first_token()
+    return AnonymousCacheNode(nodelist, bits[1], [parser.compile_filter(bit) for bit in bits[2:]])
@@ -0,0 +1,17 @@
+from django import template
+
+from dorzi import image_variants
+
+register = template.Library()
+
+
+@register.filter
+def srcset(field_file, ext='jpg'):
+    """
+    Derivative ``srcset`` for an uploaded image, empty until they are generated:
+
+        <source type="image/webp" srcset="{{ tailor.profile_picture|srcset:'webp' }}" sizes="300px">
+    """
+    if not field_file:
+        return ''
+    return image_variants.srcset(field_file, ext)
@@ -0,0 +1,22 @@
+"""
+Model fixtures shared by the tests. Every user gets the password ``pass``.
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from customer.models import Customer
+from tailor.models import Tailor
+
+
+def create_tailor(username='tailor@example.com', NID='NID1', first_name='', last_name='', **fields):
+    """A tailor and their login; ``fields`` override the Tailor defaults."""
+    user = User.objects.create_user(username=username, password='pass', first_name=first_name, last_name=last_name)
+    fields = {'business_name': 'Shop', 'business_location': 'Dhaka', 'price': Decimal('500.00'), **fields}
+    return Tailor.objects.create(user=user, NID=NID, **fields)
+
+
+def create_customer(username='customer@example.com', **fields):
+    """A customer and their login."""
+    user = User.objects.create_user(username=username, password='pass')
+    return Customer.objects.create(user=user, **fields)
@@ -0,0 +1,48 @@
+"""
+Tests for the async JSON views, driven through the ASGI handler.
+
+Run with: python manage.py test testing.testingasyncviews
+"""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from favorite_tailor.models import FavoriteTailor
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+
+class AsyncViewsTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.tailor_user = self.tailor.user
+        self.customer_user = create_customer().user
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+
+    async def test_toggle_favorite(self):
+        await self.async_client.aforce_login(self.customer_user)
+        url = reverse('toggle_favorite', args=[self.tailor.id])
+        self.assertEqual((await self.async_client.post(url)).json()['status'], 'added')
+        self.assertEqual(await FavoriteTailor.objects.acount(), 1)
+        self.assertEqual((await self.async_client.post(url)).json()['status'], 'removed')
+        self.assertEqual(await FavoriteTailor.objects.acount(), 0)
+
+    async def test_dress_details_only_for_the_owner(self):
+        url = reverse('get_dress_details', args=[self.product.id])
+        await self.async_client.aforce_login(self.customer_user)
+        self.assertFalse((await self.async_client.get(url)).json()['success'])
+        await self.async_client.aforce_login(self.tailor_user)
+        response = (await self.async_client.get(url)).json()
+        self.assertTrue(response['success'])
+        self.assertEqual(response['product']['title'], 'Dress')
+
+    async def test_tailor_api_json_and_fragment_revalidation(self):
+        url = reverse('tailor_api', args=[self.tailor.id])
+        self.assertEqual((await self.async_client.get(url)).json()['business_name'], 'Shop')
+        fragment = await self.async_client.get(url, {'section': 'portfolio'})
+        self.assertContains(fragment, 'Dress')
+        cached = await self.async_client.get(url, {'section': 'portfolio'},
+                                             headers={'If-None-Match': fragment['ETag']})
+        self.assertEqual(cached.status_code, 304)
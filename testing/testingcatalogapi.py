@@ -0,0 +1,108 @@
+"""
+Tests for the read-only catalog REST API.
+
+Run with: python manage.py test testing.testingcatalogapi
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dorzi.stock import reserve
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image, PreDesigned
+from testing.fixtures import create_tailor
+
+
+class CatalogApiTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor(first_name='Rahim', last_name='Uddin')
+        for index in range(5):
+            product = PreDesigned.objects.create(tailor=self.tailor, title=f'Dress {index}',
+                                                 price=Decimal('900.00'))
+            Image.objects.create(predesigned=product, image=f'photos/dress_{index}.jpg')
+        Fabric.objects.create(tailor=self.tailor, name='Silk', fabric_type='silk')
+        Embroidery.objects.create(tailor=self.tailor, title='Zari')
+
+    def test_cursor_pages_walk_the_whole_list(self):
+        url, titles = reverse('catalog-product-list') + '?page_size=2', []
+        while url:
+            data = self.client.get(url).json()
+            titles.extend(product['title'] for product in data['results'])
+            url = data['next']
+        self.assertEqual(sorted(titles), [f'Dress {index}' for index in range(5)])
+
+    def test_sparse_fields_and_query_count(self):
+        with self.assertNumQueries(3):
+            # conditional-GET aggregate, the page, the prefetched images
+            data = self.client.get(reverse('catalog-product-list'), {'fields': 'id,title,images'}).json()
+        self.assertEqual(set(data['results'][0]), {'id', 'title', 'images'})
+        self.assertTrue(data['results'][0]['images'][0].endswith('.jpg'))
+        tailor = self.client.get(reverse('catalog-tailor-detail', args=[self.tailor.id])).json()
+        self.assertEqual(tailor['name'], 'Rahim Uddin')
+        self.assertNotIn('NID', tailor)
+
+    def test_conditional_get(self):
+        url = reverse('catalog-product-list')
+        first = self.client.get(url)
+        self.assertIn('Last-Modified', first)
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        product = PreDesigned.objects.first()
+        product.price = Decimal('950.00')
+        product.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 200)
+
+        detail = reverse('catalog-product-detail', args=[product.id])
+        etag = self.client.get(detail)['ETag']
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_incremental_sync_and_filters(self):
+        newest = self.client.get(reverse('catalog-fabric-list')).json()['results'][-1]['updated_at']
+        self.assertEqual(self.client.get(reverse('catalog-fabric-list'), {'updated_since': newest}).json()['results'], [])
+        self.assertEqual(self.client.get(reverse('catalog-fabric-list'), {'updated_since': 'yesterday'}).status_code,
+                         400)
+        self.assertEqual(len(self.client.get(reverse('catalog-embroidery-list'),
+                                             {'tailor': self.tailor.id}).json()['results']), 1)
+        self.assertEqual(self.client.get(reverse('catalog-embroidery-list'), {'tailor': 'x'}).status_code, 400)
+
+    def test_stock_and_image_changes_end_conditional_gets(self):
+        product = PreDesigned.objects.order_by('id').first()
+        product.availability = 3
+        product.save()
+        detail, listing = reverse('catalog-product-detail', args=[product.id]), reverse('catalog-product-list')
+        etags = [self.client.get(url)['ETag'] for url in (detail, listing)]
+
+        reserve(product, 1)
+        for url, etag in zip((detail, listing), etags):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(detail).json()['availability'], 2)
+
+        etag = self.client.get(detail)['ETag']
+        Image.objects.create(predesigned=product, image='photos/extra.jpg')
+        self.assertEqual(len(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).json()['images']), 2)
+
+    def test_tailor_name_changes_end_conditional_gets(self):
+        detail = reverse('catalog-tailor-detail', args=[self.tailor.id])
+        etag = self.client.get(detail)['ETag']
+        user = User.objects.get(pk=self.tailor.user_id)
+        user.last_login = timezone.now()
+        user.save(update_fields=['last_login'])
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        user.last_name = 'Mia'
+        user.save()
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=etag).json()['name'], 'Rahim Mia')
+
+    def test_deleted_rows_reach_syncing_clients(self):
+        product = PreDesigned.objects.order_by('id').first()
+        product.delete()
+        data = self.client.get(reverse('catalog-deletion-list'), {'kind': 'products'}).json()
+        self.assertEqual([(row['kind'], row['object_id']) for row in data['results']], [('products', product.id)])
+        since = data['results'][-1]['deleted_at']
+        self.assertEqual(self.client.get(reverse('catalog-deletion-list'), {'updated_since': since}).json()['results'],
+                         [])
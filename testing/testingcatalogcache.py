@@ -0,0 +1,130 @@
+"""
+Tests for the anonymous catalog page and tailor card caches, and for the
+per-visitor favorites overlay that keeps catalog HTML shareable.
+
+Run with: python manage.py test testing.testingcatalogcache
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from customer.models import Customer
+from dorzi.catalog_cache import CSRF_PLACEHOLDER, SIGNED_IN_VARIANT, cache_anonymous_page
+from fabrics.models import Fabric
+from favorite_tailor.models import FavoriteTailor
+from testing.fixtures import create_customer, create_tailor
+
+
+class CatalogCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.tailor = create_tailor(first_name='Rahim', last_name='Mia', business_name='Rahim Tailors')
+
+    def get(self, url_name, client=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = (client or self.client).get(reverse(url_name))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_anonymous_page_is_served_without_queries(self):
+        for url_name in ('home', 'findTailor', 'pre_designed'):
+            _, first = self.get(url_name)
+            _, second = self.get(url_name)
+            self.assertGreater(first, 0)
+            self.assertEqual(second, 0)
+
+    def test_catalog_change_invalidates_page(self):
+        self.get('home')
+        self.tailor.price = Decimal('750.00')
+        self.tailor.save()
+        response, queries = self.get('home')
+        self.assertGreater(queries, 0)
+        self.assertContains(response, 'Starts from ৳750.00')
+
+    def test_related_item_change_invalidates_page(self):
+        self.get('findTailor')
+        Fabric.objects.create(tailor=self.tailor, name='Silk', color='Red')
+        _, queries = self.get('findTailor')
+        self.assertGreater(queries, 0)
+
+    def test_cached_page_carries_each_visitors_csrf_token(self):
+        first, _ = self.get('home')
+        other_client = self.client_class()
+        second, queries = self.get('home', client=other_client)
+        self.assertEqual(queries, 0)
+        self.assertNotContains(second, 'csrf-token-placeholder')
+        self.assertNotEqual(first.cookies['csrftoken'].value, second.cookies['csrftoken'].value)
+
+    def test_uncached_responses_get_the_real_csrf_token(self):
+        @cache_anonymous_page
+        def missing(request):
+            return HttpResponse(f'<input value="{CSRF_PLACEHOLDER}">', status=404)
+
+        request = RequestFactory().get('/missing/')
+        request.user = AnonymousUser()
+        response = missing(request)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotContains(response, CSRF_PLACEHOLDER, status_code=404)
+
+    def test_signed_in_visitors_bypass_the_page_cache(self):
+        User.objects.create_user(username='customer@example.com', password='pass')
+        self.client.login(username='customer@example.com', password='pass')
+        self.get('home')
+        _, queries = self.get('home')
+        self.assertGreater(queries, 0)
+
+
+class FavoriteOverlayTest(TestCase):
+
+    def setUp(self):
+        self.customer = create_customer()
+        self.tailors = []
+        for i in range(3):
+            self.tailors.append(create_tailor(f'tailor{i}@example.com', NID=f'NID{i}', business_name=f'Shop {i}'))
+        FavoriteTailor.objects.create(user=self.customer, tailor=self.tailors[1])
+        self.client.login(username='customer@example.com', password='pass')
+
+    def test_favorite_ids_come_from_a_single_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('favorite_tailor_ids'))
+        self.assertEqual(response.json(), {'tailor_ids': [self.tailors[1].id]})
+        self.assertIn('private', response['Cache-Control'])
+        # Session and user lookups, then the favorites themselves
+        self.assertEqual(len([q for q in queries.captured_queries if 'favorite' in q['sql'].lower()]), 1)
+
+    def test_catalog_html_does_not_depend_on_favorites(self):
+        before = self.client.get(reverse('findTailor')).content
+        FavoriteTailor.objects.create(user=self.customer, tailor=self.tailors[2])
+        after = self.client.get(reverse('findTailor')).content
+        self.assertEqual(before.count('♡'.encode()), after.count('♡'.encode()))
+
+    def test_signed_in_cards_are_shared_and_personalized(self):
+        key = make_template_fragment_key('find_tailor_card', [self.tailor.id, SIGNED_IN_VARIANT])
+        visitors = []
+        for name, address in (('Karim Uddin', 'Road 7, Chittagong'), ('Salma Akter', 'Lane 2, Sylhet')):
+            first_name, last_name = name.split()
+            user = User.objects.create_user(username=f'{first_name}@example.com', password='pass',
+                                            first_name=first_name, last_name=last_name)
+            Customer.objects.create(user=user, address=address)
+            client = self.client_class()
+            client.login(username=f'{first_name}@example.com', password='pass')
+            visitors.append((client, name, address))
+
+        client, name, address = visitors[0]
+        self.assertContains(client.get(reverse('findTailor')), address)
+        shared = cache.get(key)
+        self.assertIn('placeholder-5f2d8c', shared)
+        client, name, address = visitors[1]
+        response = client.get(reverse('findTailor'))
+        self.assertEqual(cache.get(key), shared)
+        self.assertContains(response, name)
+        self.assertContains(response, address)
+        self.assertNotContains(response, 'placeholder-5f2d8c')
@@ -0,0 +1,84 @@
+"""
+Scaling checks for the tailor card pages (home and findTailor).
+
+Seeds the catalog at two sizes and renders each page through the Django
+test client. The number of queries per page must not grow with the
+catalog, and each page must render the cards it is meant to: every tailor
+on home, and pages of at most PAGE_SIZE on findTailor that together cover
+every tailor. Wall-clock timings live in ``manage.py benchmark_views``.
+
+Run with: python manage.py test testing.testingcatalogscaling
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dorzi.tailor_search import PAGE_SIZE
+from embroidery.models import Embroidery
+from fabrics.models import Fabric
+from pre_designed.models import Image, PreDesigned
+from reviews.models import Reviews
+from testing.fixtures import create_customer, create_tailor
+
+ITEMS_PER_TAILOR = 5
+SMALL, LARGE = 10, 40
+
+
+def seed_catalog(tailor_count, offset=0):
+    """Create ``tailor_count`` tailors, each with ITEMS_PER_TAILOR of every catalog item."""
+    reviewer = create_customer(username=f'reviewer{offset}')
+    for i in range(offset, offset + tailor_count):
+        tailor = create_tailor(f'tailor{i}', NID=f'NID{i}', first_name='Tailor', last_name=str(i),
+                               business_name=f'Shop {i}', category='Formal_Shirt')
+        for j in range(ITEMS_PER_TAILOR):
+            product = PreDesigned.objects.create(tailor=tailor, title=f'Dress {i}-{j}', price=Decimal('1200.00'))
+            Image.objects.create(predesigned=product, image=f'photos/dress_{i}_{j}.jpg')
+            Reviews.objects.create(customer=reviewer, tailor=tailor, product=product, rating=4, comment='Good')
+            Fabric.objects.create(tailor=tailor, name=f'Cotton {j}', color='White')
+            Embroidery.objects.create(tailor=tailor, title=f'Design {j}', price=Decimal('300.00'))
+
+
+def render(client, url):
+    """The response, its query count and the number of tailor cards it shows."""
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    return response, len(queries), response.content.count(b'class="tailor-card"')
+
+
+# Counts rendering queries, so anonymous page and card caching is switched off
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class CatalogScalingTest(TestCase):
+
+    def test_home_queries_stay_flat(self):
+        url = reverse('home')
+        seed_catalog(SMALL)
+        _, small_queries, small_cards = render(self.client, url)
+        seed_catalog(LARGE - SMALL, offset=SMALL)
+        response, large_queries, large_cards = render(self.client, url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((small_cards, large_cards), (SMALL, LARGE))
+        self.assertEqual(small_queries, large_queries)
+
+    def test_find_tailor_pages_stay_flat(self):
+        url = reverse('findTailor')
+        seed_catalog(SMALL)
+        _, small_queries, small_cards = render(self.client, url)
+        self.assertEqual(small_cards, SMALL)
+
+        seed_catalog(LARGE - SMALL, offset=SMALL)
+        page_cards, page_queries, query = [], set(), ''
+        while True:
+            response, queries, cards = render(self.client, f'{url}?{query}' if query else url)
+            page_cards.append(cards)
+            page_queries.add(queries)
+            query = response.context['next_page_query']
+            if not query:
+                break
+
+        # LARGE tailors no longer fit one page: full pages, then the rest
+        self.assertEqual(page_cards, [PAGE_SIZE] * (LARGE // PAGE_SIZE) + [LARGE % PAGE_SIZE])
+        self.assertEqual(page_queries, {small_queries})
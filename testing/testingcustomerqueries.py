@@ -0,0 +1,56 @@
+"""
+Query-count regression test for the customer profile page.
+
+The number of queries behind /profile/ must not depend on how many custom
+and pre-designed orders the customer has placed.
+
+Run with: python manage.py test testing.testingcustomerqueries
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from custom_order.models import TOrders
+from dress_order.models import Order
+from embroidery.models import Embroidery
+from favorite_tailor.models import FavoriteTailor
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+
+class CustomerDashboardQueryTest(TestCase):
+
+    def setUp(self):
+        self.customer = create_customer()
+        self.user = self.customer.user
+        self.tailors = []
+        for i in range(3):
+            tailor = create_tailor(f'tailor{i}', NID=f'NID{i}', business_name=f'Shop {i}')
+            FavoriteTailor.objects.create(user=self.customer, tailor=tailor)
+            self.tailors.append(tailor)
+        self.client.login(username='customer@example.com', password='pass')
+
+    def place_orders(self, count):
+        for i in range(count):
+            tailor = self.tailors[i % len(self.tailors)]
+            embroidery = Embroidery.objects.create(tailor=tailor, title=f'Design {i}', price=Decimal('200.00'))
+            TOrders.objects.create(customer=self.customer, tailor=tailor, embroidery=embroidery, address='Dhaka')
+            product = PreDesigned.objects.create(tailor=tailor, title=f'Dress {i}', price=Decimal('900.00'))
+            Order.objects.create(customer=self.user, tailor=tailor, product=product, quantity=1,
+                                 price=product.price, address='Dhaka', number='01700000000')
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('customer'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_is_independent_of_order_history(self):
+        self.place_orders(2)
+        few = self.count_queries()
+        self.place_orders(20)
+        many = self.count_queries()
+        self.assertEqual(few, many)
@@ -0,0 +1,92 @@
+"""
+Tests for primary/replica read routing and read-your-writes pinning.
+
+Run with: python manage.py test testing.testingdbrouter
+"""
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dorzi.catalog_cache import RECENT_BUMP_KEY
+from dorzi.db_router import PIN_COOKIE, PrimaryReplicaRouter, ReplicaPinMiddleware
+from dress_order.models import Order
+from tailor.models import Tailor
+from testing.fixtures import create_tailor
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaRoutingTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def serve(self, request, write=False):
+        seen = {}
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Order)
+            seen['tailor'] = self.router.db_for_read(Tailor)
+            seen['order'] = self.router.db_for_read(Order)
+            return HttpResponse()
+
+        response = ReplicaPinMiddleware(view)(request)
+        return seen, response
+
+    def test_catalog_reads_use_the_replica(self):
+        seen, response = self.serve(self.factory.get('/'))
+        self.assertEqual(seen, {'tailor': 'replica', 'order': None})
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_reads_outside_requests_stay_on_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(Tailor))
+
+    def test_writes_pin_the_rest_of_the_request_and_the_next_ones(self):
+        seen, response = self.serve(self.factory.get('/'), write=True)
+        self.assertEqual(seen['tailor'], None)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        self.factory.cookies[PIN_COOKIE] = '1'
+        seen, _ = self.serve(self.factory.get('/'))
+        self.assertEqual(seen['tailor'], None)
+
+    def test_unsafe_methods_read_from_the_primary(self):
+        seen, response = self.serve(self.factory.post('/'))
+        self.assertEqual(seen['tailor'], None)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_no_replica_configured(self):
+        seen, response = self.serve(self.factory.get('/'))
+        self.assertEqual(seen['tailor'], None)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaCatalogPageTest(TransactionTestCase):
+    # The replica alias mirrors default in tests; committed rows are visible on both
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.tailor = create_tailor()
+
+    def replica_queries(self, url_name):
+        with CaptureQueriesContext(connections['replica']) as queries:
+            self.assertEqual(self.client.get(reverse(url_name)).status_code, 200)
+        return len(queries)
+
+    def test_pages_filled_right_after_a_change_read_the_primary(self):
+        # Long after the last change, a page miss reads the catalog from the replica
+        cache.delete(RECENT_BUMP_KEY)
+        self.assertGreater(self.replica_queries('findTailor'), 0)
+
+        # The save bumps the catalog version, so the next page is a miss filled from the primary
+        self.tailor.business_name = 'New Shop'
+        self.tailor.save()
+        self.assertEqual(self.replica_queries('findTailor'), 0)
+        self.assertIn(b'New Shop', self.client.get(reverse('findTailor')).content)
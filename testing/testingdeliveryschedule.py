@@ -0,0 +1,109 @@
+"""
+Tests for workload-aware delivery date quotes.
+
+Run with: python manage.py test testing.testingdeliveryschedule
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from custom_order.models import TOrders
+from dorzi.delivery_schedule import BusinessCalendar, custom_order_delivery, rebuild_workloads
+from dorzi.models import Holiday, TailorWorkload
+from dress_order.models import Order
+from embroidery.models import Embroidery
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+# Holidays only count from today on, so quotes start from next Monday
+MONDAY = date.today() + timedelta(days=7 - date.today().weekday())
+
+
+class BusinessCalendarTest(TestCase):
+
+    def naive_add(self, calendar, start, count, holidays):
+        day = start
+        while count:
+            day += timedelta(days=1)
+            if day.weekday() not in calendar.weekend and day not in holidays:
+                count -= 1
+        return day
+
+    def test_matches_day_by_day_counting(self):
+        holidays = {MONDAY + timedelta(days=offset) for offset in (1, 2, 9, 20, 21, 22, 45, 46)}
+        calendar = BusinessCalendar(holidays, weekend=(4,))
+        for start_offset in range(7):
+            start = MONDAY + timedelta(days=start_offset)
+            for count in range(1, 40):
+                with self.subTest(start=start, count=count):
+                    self.assertEqual(calendar.add_business_days(start, count),
+                                     self.naive_add(calendar, start, count, holidays))
+
+
+@override_settings(DELIVERY_WEEKEND_DAYS=(4,), DELIVERY_DAILY_CAPACITY=1, DELIVERY_CUSTOM_ORDER_DAYS=3,
+                   DELIVERY_DRESS_ORDER_DAYS=1, DELIVERY_CUSTOM_MIN_LEAD=5, DELIVERY_DRESS_MIN_LEAD=2)
+class TailorWorkloadTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.customer = create_customer()
+        self.customer_user = self.customer.user
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+        self.embroidery = Embroidery.objects.create(tailor=self.tailor, title='Zari',
+                                                    estimated_time=timedelta(days=2))
+
+    def workload(self):
+        row = TailorWorkload.objects.get(tailor=self.tailor)
+        return row.open_orders, row.backlog_days
+
+    def test_open_orders_build_the_backlog(self):
+        TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka',
+                               embroidery=self.embroidery)
+        order = Order.objects.create(customer=self.customer_user, tailor=self.tailor, product=self.product,
+                                     quantity=3, price=self.product.price, address='Dhaka', number='01700000000')
+        self.assertEqual(self.workload(), (2, Decimal('8.00')))
+
+        order.status = 'shipped'
+        order.save()
+        self.assertEqual(self.workload(), (1, Decimal('5.00')))
+        order.status = 'processing'
+        order.save()
+        order.delete()
+        self.assertEqual(self.workload(), (1, Decimal('5.00')))
+
+        incremental = self.workload()
+        rebuild_workloads()
+        self.assertEqual(self.workload(), incremental)
+
+    def test_checkout_counts_every_selected_embroidery(self):
+        second = Embroidery.objects.create(tailor=self.tailor, title='Kantha', estimated_time=timedelta(days=1))
+        self.client.login(username='customer@example.com', password='pass')
+        self.client.post(reverse('create_custom_orders', args=[self.tailor.id]), {
+            'address': 'Dhaka', 'phone': '01700000000', 'embroidery_total_price': '0',
+            'selected_embroidery_ids': f'{self.embroidery.id},{second.id}'})
+        order = TOrders.objects.get()
+        # 3 base days plus 2 and 1 for the two designs
+        self.assertEqual(order.work_days, Decimal('6.00'))
+        self.assertEqual(self.workload(), (1, Decimal('6.00')))
+        rebuild_workloads()
+        self.assertEqual(self.workload(), (1, Decimal('6.00')))
+
+    def test_quotes_follow_the_backlog_and_holidays(self):
+        # An idle tailor quotes the minimum lead time
+        self.assertEqual(custom_order_delivery(self.tailor, start=MONDAY), MONDAY + timedelta(days=6))
+        for _ in range(3):
+            TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka')
+        # 9 days of backlog plus 3 for the new order
+        self.assertEqual(custom_order_delivery(self.tailor, start=MONDAY), MONDAY + timedelta(days=14))
+        Holiday.objects.create(day=MONDAY + timedelta(days=8), name='Holiday')
+        self.assertEqual(custom_order_delivery(self.tailor, start=MONDAY), MONDAY + timedelta(days=15))
+
+    def test_quote_endpoint(self):
+        data = self.client.get(reverse('delivery_quote', args=[self.tailor.id]),
+                               {'type': 'dress', 'quantity': 2}).json()
+        self.assertEqual(data['open_orders'], 0)
+        self.assertGreater(date.fromisoformat(data['delivery_date']), date.today())
+        response = self.client.get(reverse('delivery_quote', args=[self.tailor.id]), {'type': 'gift'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,100 @@
+"""
+Tests for the daily per-tailor earnings rollups.
+
+Run with: python manage.py test testing.testingearnings
+"""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from custom_order.models import TOrders
+from dorzi.earnings import earnings_summary, rebuild_rollups
+from dorzi.models import TailorDailyEarnings
+from dorzi.seed_data import generate
+from dress_order.models import Order
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+
+class EarningsRollupTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.customer = create_customer()
+        self.customer_user = self.customer.user
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+
+    def dress_order(self, quantity=1):
+        return Order.objects.create(customer=self.customer_user, tailor=self.tailor, product=self.product,
+                                    quantity=quantity, price=self.product.price, address='Dhaka',
+                                    number='01700000000')
+
+    def rollup_rows(self):
+        return list(TailorDailyEarnings.objects.order_by('tailor', 'day')
+                    .values('tailor_id', 'day', 'order_count', 'delivered_count', 'canceled_count', 'revenue'))
+
+    def test_status_changes_update_the_rollup(self):
+        order = self.dress_order(quantity=2)
+        custom = TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka')
+        self.dress_order()
+
+        order.status = 'delivered'
+        order.save()
+        custom.status = 'canceled'
+        custom.save()
+
+        summary = earnings_summary(self.tailor)
+        self.assertEqual(summary['orders'], 3)
+        self.assertEqual(summary['delivered'], 1)
+        self.assertEqual(summary['canceled'], 1)
+        self.assertEqual(summary['open_orders'], 1)
+        self.assertEqual(summary['total_earning'], Decimal('1800.00'))
+        self.tailor.refresh_from_db()
+        self.assertEqual(self.tailor.total_earning, Decimal('1800.00'))
+
+        # Moving back out of delivered takes the revenue back out
+        order.status = 'shipped'
+        order.save()
+        self.assertEqual(earnings_summary(self.tailor)['total_earning'], Decimal('0.00'))
+
+    def test_deleting_an_order_removes_it(self):
+        order = self.dress_order()
+        order.status = 'delivered'
+        order.save()
+        order.delete()
+        summary = earnings_summary(self.tailor)
+        self.assertEqual((summary['orders'], summary['delivered'], summary['total_earning']), (0, 0, Decimal('0.00')))
+
+    def test_rebuild_matches_incremental_maintenance(self):
+        for status in ('delivered', 'canceled', 'pending', 'delivered'):
+            order = self.dress_order()
+            order.status = status
+            order.save()
+        custom = TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka')
+        custom.status = 'delivered'
+        custom.save()
+
+        incremental = self.rollup_rows()
+        rebuild_rollups()
+        self.assertEqual(self.rollup_rows(), incremental)
+        self.tailor.refresh_from_db()
+        self.assertEqual(self.tailor.total_earning, Decimal('2300.00'))
+
+    def test_generated_data_has_rollups(self):
+        # seed_data bulk-creates its orders, so no signal maintains these rows
+        generate({'tailors': 3, 'customers': 4, 'reviews_per_customer': 0}, seed=6)
+        generated = self.rollup_rows()
+        self.assertTrue(generated)
+        rebuild_rollups()
+        self.assertEqual(self.rollup_rows(), generated)
+
+    def test_earnings_endpoint(self):
+        order = self.dress_order()
+        order.status = 'delivered'
+        order.save()
+        self.client.login(username='tailor@example.com', password='pass')
+        data = self.client.get(reverse('tailor_earnings'), {'days': 7}).json()
+        self.assertEqual(data['total_earning'], '900.00')
+        self.assertEqual(len(data['daily']), 7)
+        self.assertEqual(data['daily'][-1]['delivered'], 1)
@@ -0,0 +1,63 @@
+"""
+Tests for the pre-designed catalog facet counts.
+
+Run with: python manage.py test testing.testingfacets
+"""
+from decimal import Decimal
+
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+
+from dorzi.catalog_facets import facet_counts, filter_products, parse_filters
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_tailor
+
+
+class FacetCountTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.product('Saree', 'female', 'Red', '1500.00', availability=2)
+        self.product('Saree', 'female', 'Blue', '6000.00')
+        self.product('Punjabi', 'male', 'Red', '800.00', availability=1)
+
+    def product(self, category, gender, color, price, availability=0):
+        return PreDesigned.objects.create(tailor=self.tailor, title=f'{color} {category}', category=category,
+                                          gender=gender, color=color, price=Decimal(price),
+                                          availability=availability)
+
+    def counts(self, facet, query_string=''):
+        result = facet_counts('', parse_filters(QueryDict(query_string)))
+        return {entry['value']: entry['count'] for entry in result['facets'][facet]}
+
+    def test_unfiltered_counts(self):
+        self.assertEqual(self.counts('category'), {'Saree': 2, 'Punjabi': 1})
+        self.assertEqual(self.counts('price'), {'500-1000': 1, '1000-2000': 1, '5000+': 1})
+        self.assertEqual(self.counts('availability'), {'in_stock': 2, 'sold_out': 1})
+
+    def test_a_facet_ignores_its_own_selection(self):
+        self.assertEqual(self.counts('category', 'category=Saree'), {'Saree': 2, 'Punjabi': 1})
+        self.assertEqual(self.counts('color', 'category=Saree'), {'Red': 1, 'Blue': 1})
+        result = facet_counts('', parse_filters(QueryDict('category=Saree&color=Red')))
+        self.assertEqual(result['total'], 1)
+        self.assertEqual(filter_products(PreDesigned.objects.all(),
+                                         parse_filters(QueryDict('category=Saree&color=Red'))).count(), 1)
+
+    def test_counts_follow_catalog_changes(self):
+        self.assertEqual(self.counts('availability'), {'in_stock': 2, 'sold_out': 1})
+        product = PreDesigned.objects.get(color='Blue')
+        product.availability = 5
+        product.save()
+        self.assertEqual(self.counts('availability'), {'in_stock': 3})
+        self.product('Punjabi', 'male', 'White', '900.00')
+        self.assertEqual(self.counts('category'), {'Saree': 2, 'Punjabi': 2})
+
+    def test_unknown_values_are_ignored(self):
+        self.assertEqual(parse_filters(QueryDict('price=1-2&price=5000%2B&availability=maybe&gender=')),
+                         {'price': ['5000+']})
+
+    def test_facets_endpoint_runs_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('pre_designed_facets'), {'gender': 'female'})
+        self.assertEqual(response.json()['total'], 2)
@@ -0,0 +1,70 @@
+"""
+Tests for idempotent favorites and the bulk sync endpoint.
+
+Run with: python manage.py test testing.testingfavorites
+"""
+import json
+from django.test import TestCase
+from django.urls import reverse
+
+from favorite_tailor.models import FavoriteTailor
+from testing.fixtures import create_customer, create_tailor
+
+
+class FavoritesTest(TestCase):
+
+    def setUp(self):
+        self.tailors = []
+        for index in range(3):
+            self.tailors.append(create_tailor(f'tailor{index}@example.com', NID=f'NID{index}',
+                                              business_name=f'Shop {index}'))
+        self.customer = create_customer()
+        self.client.login(username='customer@example.com', password='pass')
+
+    def favorite_ids(self):
+        return sorted(FavoriteTailor.objects.filter(user=self.customer).values_list('tailor_id', flat=True))
+
+    def test_set_and_unset_are_idempotent(self):
+        url = reverse('favorite', args=[self.tailors[0].id])
+        for _ in range(2):
+            self.assertEqual(self.client.put(url).json()['status'], 'added')
+        self.assertEqual(self.favorite_ids(), [self.tailors[0].id])
+        for _ in range(2):
+            self.assertEqual(self.client.delete(url).json()['status'], 'removed')
+        self.assertEqual(self.favorite_ids(), [])
+
+    def test_missing_tailor_is_not_found(self):
+        response = self.client.put(reverse('favorite', args=[999999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.favorite_ids(), [])
+
+    def test_non_customers_cannot_unset(self):
+        self.client.login(username='tailor0@example.com', password='pass')
+        response = self.client.delete(reverse('favorite', args=[self.tailors[1].id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_anonymous_callers_get_json_401(self):
+        self.client.logout()
+        for method, url in (('put', reverse('favorite', args=[self.tailors[0].id])),
+                            ('post', reverse('toggle_favorite', args=[self.tailors[0].id])),
+                            ('get', reverse('favorite_tailor_ids'))):
+            with self.subTest(url):
+                response = getattr(self.client, method)(url)
+                self.assertEqual(response.status_code, 401)
+                self.assertIn('error', response.json())
+        self.assertEqual(FavoriteTailor.objects.count(), 0)
+
+    def test_sync_replaces_the_whole_set(self):
+        url = reverse('favorite_tailors_sync')
+        first, second, third = (tailor.id for tailor in self.tailors)
+        self.client.put(url, json.dumps({'tailor_ids': [first, second]}), content_type='application/json')
+        response = self.client.put(url, json.dumps({'tailor_ids': [second, third, 999999]}),
+                                   content_type='application/json').json()
+        # Unknown tailors are dropped rather than failing the sync
+        self.assertEqual(response, {'tailor_ids': [second, third], 'added': 1, 'removed': 1})
+        self.assertEqual(self.favorite_ids(), [second, third])
+
+    def test_sync_rejects_malformed_ids(self):
+        response = self.client.put(reverse('favorite_tailors_sync'), json.dumps({'tailor_ids': ['a']}),
+                                   content_type='application/json')
+        self.assertEqual(response.status_code, 400)
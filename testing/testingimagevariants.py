@@ -0,0 +1,85 @@
+"""
+Tests for the thumbnail and WebP derivative pipeline.
+
+Run with: python manage.py test testing.testingimagevariants
+"""
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image as PILImage
+
+from dorzi.image_variants import derivative_name, generate_derivatives, srcset
+from dorzi.models import Job
+from pre_designed.models import Image, PreDesigned
+from testing.fixtures import create_tailor
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def upload(name='dress.png', size=(1200, 900)):
+    buffer = BytesIO()
+    PILImage.new('RGBA', size, (200, 30, 30, 255)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_DERIVATIVE_WIDTHS=(160, 320))
+class ImageDerivativeTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        tailor = create_tailor()
+        product = PreDesigned.objects.create(tailor=tailor, title='Dress', price=Decimal('900.00'))
+        self.image = Image.objects.create(predesigned=product, image=upload())
+
+    def test_generates_each_width_and_format(self):
+        self.assertEqual(srcset(self.image.image), '')
+        self.assertTrue(generate_derivatives(self.image.image))
+
+        storage = self.image.image.storage
+        for width in (160, 320):
+            for ext in ('jpg', 'webp'):
+                name = derivative_name(self.image.image.name, width, ext)
+                self.assertTrue(storage.exists(name), name)
+                with storage.open(name) as derivative:
+                    self.assertEqual(PILImage.open(derivative).width, width)
+
+        self.assertEqual(srcset(self.image.image, 'webp').count('w,'), 1)
+        self.assertIn('_320w.webp 320w', srcset(self.image.image, 'webp'))
+
+    def test_existing_derivatives_are_kept_unless_forced(self):
+        generate_derivatives(self.image.image)
+        self.assertFalse(generate_derivatives(self.image.image))
+        self.assertTrue(generate_derivatives(self.image.image, force=True))
+
+    def test_small_images_are_not_upscaled(self):
+        small = Image.objects.create(predesigned=self.image.predesigned, image=upload('small.png', (100, 80)))
+        generate_derivatives(small.image)
+        with small.image.storage.open(derivative_name(small.image.name, 320, 'jpg')) as derivative:
+            self.assertEqual(PILImage.open(derivative).size, (100, 80))
+
+    def test_only_a_changed_upload_is_queued(self):
+        jobs = Job.objects.filter(task='image_derivatives')
+        generate_derivatives(self.image.image)
+        queued = jobs.count()
+        image = Image.objects.get(pk=self.image.pk)
+        image.save()
+        self.assertEqual(jobs.count(), queued)
+        image.image = upload('other.png')
+        image.save()
+        self.assertEqual(jobs.count(), queued + 1)
+
+    def test_srcset_does_not_touch_storage(self):
+        generate_derivatives(self.image.image)
+        image = Image.objects.get(pk=self.image.pk)
+        with mock.patch.object(type(image.image.storage), 'exists', side_effect=AssertionError):
+            self.assertIn('160w', srcset(image.image))
+
@@ -0,0 +1,86 @@
+"""
+Tests for the request metrics middleware, template timing and /perf/metrics/.
+
+Run with: python manage.py test testing.testinginstrumentation
+"""
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dorzi.instrumentation import RequestMetrics, TimedDjangoTemplates, _current, registry
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_tailor
+
+
+class RequestMetricsTest(TestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.addCleanup(registry.reset)
+        self.tailor = create_tailor()
+        PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+        # An async view that queries and renders a template
+        self.url = reverse('tailor_api', args=[self.tailor.id])
+        self.params = {'section': 'portfolio'}
+
+    def last_sample(self):
+        return registry.summary()['tailor_api']['last']
+
+    def test_sync_request_counts_queries_and_template_time(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, self.params)
+        sample = self.last_sample()
+        self.assertEqual(sample['status'], 200)
+        self.assertEqual(sample['queries'], len(queries))
+        self.assertGreater(sample['template_ms'], 0)
+        self.assertEqual(sample['response_bytes'], len(response.content))
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+
+    def test_async_request_counts_the_same_work(self):
+        self.client.get(self.url, self.params)
+        sync_sample = self.last_sample()
+        response = async_to_sync(self.async_client.get)(self.url, self.params)
+        async_sample = self.last_sample()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(registry.summary()['tailor_api']['requests'], 2)
+        self.assertEqual(async_sample['queries'], sync_sample['queries'])
+        self.assertGreater(async_sample['queries'], 0)
+        self.assertGreater(async_sample['template_ms'], 0)
+
+
+class TimedTemplatesTest(TestCase):
+
+    def test_render_time_goes_to_the_current_request(self):
+        engine = engines['django']
+        self.assertIsInstance(engine, TimedDjangoTemplates)
+        template = engine.from_string('Hello {{ name }}')
+        # Outside a request it renders without recording anything
+        self.assertEqual(template.render({'name': 'Rahim'}), 'Hello Rahim')
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            self.assertEqual(template.render({'name': 'Karim'}), 'Hello Karim')
+        finally:
+            _current.reset(token)
+        self.assertGreater(metrics.template_time, 0)
+
+
+class MetricsViewTest(TestCase):
+
+    def test_only_internal_ips_can_read_metrics(self):
+        url = reverse('perf_metrics')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('views', response.json())
+
+        response = self.client.get(url, REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('Server-Timing', response)
+        with override_settings(INTERNAL_IPS=[]):
+            self.assertEqual(self.client.get(url).status_code, 404)
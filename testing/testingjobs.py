@@ -0,0 +1,131 @@
+"""
+Tests for the database-backed job queue and the upload views that use it.
+
+Run with: python manage.py test testing.testingjobs
+"""
+import shutil
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dorzi.jobs import PermanentError, claim_next, enqueue, run, task
+from dorzi.models import Job
+from embroidery.models import Embroidery
+from pre_designed.models import Image, PreDesigned
+from testing.fixtures import create_tailor
+
+MEDIA_ROOT = tempfile.mkdtemp()
+calls = []
+
+
+@task('test_record')
+def record(value):
+    calls.append(value)
+
+
+@task('test_fail')
+def fail():
+    raise RuntimeError("boom")
+
+
+@task('test_give_up')
+def give_up():
+    raise PermanentError("unfixable")
+
+
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_runs_queued_jobs_in_order(self):
+        enqueue('test_record', value=1)
+        enqueue('test_record', value=2)
+        while (job := claim_next()) is not None:
+            self.assertEqual(run(job).status, 'done')
+        self.assertEqual(calls, [1, 2])
+        self.assertIsNone(claim_next())
+
+    def test_claimed_job_is_not_handed_out_twice(self):
+        enqueue('test_record', value=1)
+        job = claim_next()
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNone(claim_next())
+
+    def test_permanent_errors_are_not_retried(self):
+        enqueue('test_give_up')
+        job = run(claim_next())
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+        self.assertIn('unfixable', job.last_error)
+
+    def test_failures_are_retried_then_marked_failed(self):
+        job = enqueue('test_fail')
+        job = run(claim_next())
+        self.assertEqual(job.status, 'queued')
+        self.assertIn('boom', job.last_error)
+        self.assertGreater(job.run_after, job.created_at)
+
+        Job.objects.filter(pk=job.pk).update(attempts=job.max_attempts - 1, run_after=job.created_at)
+        job = run(claim_next())
+        self.assertEqual(job.status, 'failed')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AddDressTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        create_tailor()
+        self.client.login(username='tailor@example.com', password='pass')
+
+    def add_dress(self, image_count):
+        data = {
+            'title': f'Dress with {image_count} images',
+            'price': '1500',
+            'availability': '3',
+            'estimated_time': '48',
+            'images': [SimpleUploadedFile(f'photo{i}.jpg', b'not really a jpeg', content_type='image/jpeg')
+                       for i in range(image_count)],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('addDress'), data)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_images(self):
+        one = self.add_dress(1)
+        many = self.add_dress(6)
+        self.assertEqual(one, many)
+        self.assertEqual(Image.objects.count(), 7)
+        self.assertEqual(Job.objects.filter(task='image_derivatives', status='queued').count(), 7)
+
+    def test_invalid_upload_fails_in_the_worker_not_the_request(self):
+        self.add_dress(1)
+        self.assertEqual(PreDesigned.objects.count(), 1)
+        name = Image.objects.get().image.name
+        job = run(claim_next())
+        # Not retried, and the product keeps no broken photo
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+        self.assertIn('is not a valid image', job.last_error)
+        self.assertFalse(Image.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(PreDesigned.objects.count(), 1)
+
+    def test_invalid_optional_image_is_cleared_but_the_row_kept(self):
+        self.client.post(reverse('addEmbroidery'), {
+            'title': 'Rose', 'price': '300',
+            'design_image': SimpleUploadedFile('rose.jpg', b'not really a jpeg', content_type='image/jpeg'),
+        })
+        job = run(claim_next())
+        self.assertEqual(job.status, 'failed')
+        self.assertFalse(Embroidery.objects.get().design_image)
+        self.assertIsNone(claim_next())
@@ -0,0 +1,77 @@
+"""
+Tests for the merged custom + pre-designed order history and its cursors.
+
+Run with: python manage.py test testing.testingorderfeed
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from custom_order.models import TOrders
+from dorzi.order_feed import order_feed_page
+from dress_order.models import Order
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+EARLY, LATE = date(2026, 3, 1), date(2026, 3, 9)
+KINDS = {'Custom Order': 'custom', 'Pre-designed': 'dress'}
+
+
+class OrderFeedTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.customer = create_customer()
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+
+    def custom(self, day):
+        return TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka', delivery_date=day)
+
+    def dress(self, day):
+        return Order.objects.create(customer=self.customer.user, tailor=self.tailor, product=self.product,
+                                    quantity=1, price=self.product.price, address='Dhaka', number='01700000000',
+                                    delivery_date=day)
+
+    def walk(self, page_size):
+        """``(kind, id)`` of every order, following cursors to the end."""
+        rows, cursor = [], None
+        while True:
+            orders, cursor = order_feed_page(self.customer, cursor=cursor, page_size=page_size)
+            rows.extend((KINDS[order['order_type']], order['id']) for order in orders)
+            if cursor is None:
+                return rows
+
+    def test_pages_walk_both_tables_through_ties_and_missing_dates(self):
+        created = [('custom', self.custom(day).id) for day in (LATE, EARLY, EARLY, None)]
+        created += [('dress', self.dress(day).id) for day in (EARLY, LATE, EARLY, None)]
+        sort_dates = {(kind, pk): day for (kind, pk), day in zip(created, [LATE, EARLY, EARLY, None] * 2)}
+        # Newest delivery first, then dress before custom and the newest id first within a date;
+        # orders without a delivery date go last
+        expected = sorted(created, key=lambda row: (sort_dates[row] or date.min, row[0], row[1]), reverse=True)
+        for page_size in (1, 2, 3, 5, 20):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.walk(page_size), expected)
+        self.assertEqual([sort_dates[row] for row in expected[-2:]], [None, None])
+
+    def test_cursor_landing_on_a_tie(self):
+        dresses = [self.dress(EARLY).id for _ in range(3)]
+        customs = [self.custom(EARLY).id for _ in range(2)]
+        first, cursor = order_feed_page(self.customer, page_size=2)
+        # The page ends between dress orders of the same date
+        self.assertEqual([order['id'] for order in first], dresses[:0:-1])
+        rest, cursor = order_feed_page(self.customer, cursor=cursor, page_size=10)
+        self.assertEqual([(KINDS[order['order_type']], order['id']) for order in rest],
+                         [('dress', dresses[0])] + [('custom', pk) for pk in reversed(customs)])
+        self.assertIsNone(cursor)
+
+    def test_load_more_endpoint(self):
+        self.custom(LATE)
+        self.dress(None)
+        self.client.login(username='customer@example.com', password='pass')
+        data = self.client.get(reverse('customer_orders'), {'cursor': 'not-a-cursor'}).json()
+        # A malformed cursor starts from the first page
+        self.assertIn('TORD-', data['html'])
+        self.assertIn('DORD-', data['html'])
+        self.assertIsNone(data['next_cursor'])
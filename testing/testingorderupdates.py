@@ -0,0 +1,96 @@
+"""
+Tests for batch order status and timeline updates.
+
+Run with: python manage.py test testing.testingorderupdates
+"""
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from custom_order.models import TOrders
+from dorzi.models import TailorWorkload
+from dress_order.models import Order
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_customer, create_tailor
+
+
+class OrderUpdatesTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.other = create_tailor('other@example.com', NID='NID2', business_name='Other')
+        self.customer = create_customer()
+        self.customer_user = self.customer.user
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+        self.client.login(username='tailor@example.com', password='pass')
+
+    def dress_order(self, tailor=None):
+        return Order.objects.create(customer=self.customer_user, tailor=tailor or self.tailor, product=self.product,
+                                    quantity=1, price=self.product.price, address='Dhaka', number='01700000000')
+
+    def post(self, updates):
+        return self.client.post(reverse('tailor_order_updates'), json.dumps({'updates': updates}),
+                                content_type='application/json')
+
+    def test_batch_updates_statuses_and_dates(self):
+        custom = TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka')
+        dresses = [self.dress_order() for _ in range(3)]
+        response = self.post(
+            [{'order_type': 'dress', 'order_id': order.id, 'status': 'delivered'} for order in dresses]
+            + [{'order_type': 'custom', 'order_id': custom.id, 'status': 'processing',
+                'timeline_field': 'cutting_started', 'date': '2026-05-01'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['orders']), 4)
+        self.assertEqual(set(Order.objects.values_list('status', flat=True)), {'delivered'})
+        custom.refresh_from_db()
+        self.assertEqual((custom.status, custom.cutting_started), ('processing', date(2026, 5, 1)))
+        # Delivered dress orders left the backlog; the custom order is still open
+        self.assertEqual(TailorWorkload.objects.get(tailor=self.tailor).open_orders, 1)
+
+    def test_foreign_order_fails_the_whole_batch(self):
+        mine, theirs = self.dress_order(), self.dress_order(tailor=self.other)
+        response = self.post([{'order_type': 'dress', 'order_id': mine.id, 'status': 'shipped'},
+                              {'order_type': 'dress', 'order_id': theirs.id, 'status': 'shipped'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1])
+        self.assertEqual(set(Order.objects.values_list('status', flat=True)), {'pending'})
+
+    def test_invalid_entries_are_reported(self):
+        order = self.dress_order()
+        response = self.post([{'order_type': 'dress', 'order_id': order.id, 'status': 'lost'},
+                              {'order_type': 'dress', 'order_id': order.id, 'timeline_field': 'cutting_started'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [0, 1])
+
+    def test_ownership_is_checked_in_one_query(self):
+        custom = TOrders.objects.create(customer=self.customer, tailor=self.tailor, address='Dhaka')
+        dresses = [self.dress_order() for _ in range(5)]
+        updates = ([{'order_type': 'dress', 'order_id': order.id, 'timeline_field': 'production'} for order in dresses]
+                   + [{'order_type': 'custom', 'order_id': custom.id, 'timeline_field': 'fabric_selected'}])
+        # Session, user, tailor, the ownership UNION, then one UPDATE per table and value
+        # between the SAVEPOINT and RELEASE of the batch's transaction
+        with self.assertNumQueries(8):
+            self.post(updates)
+
+    def test_single_order_endpoints(self):
+        order = self.dress_order()
+        response = self.client.post(reverse('update_order_status'),
+                                    json.dumps({'order_id': order.id, 'order_type': 'dress', 'new_status': 'shipped'}),
+                                    content_type='application/json')
+        self.assertTrue(response.json()['success'])
+        response = self.client.post(reverse('update_timeline_date'),
+                                    json.dumps({'order_id': order.id, 'order_type': 'dress',
+                                                'timeline_field': 'quality_check'}),
+                                    content_type='application/json')
+        self.assertTrue(response.json()['success'])
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'shipped')
+        self.assertEqual(order.quality_check.isoformat(), response.json()['date'])
+
+    def test_single_order_endpoints_reject_non_object_bodies(self):
+        for name in ('update_order_status', 'update_timeline_date'):
+            response = self.client.post(reverse(name), json.dumps([1, 2]), content_type='application/json')
+            self.assertEqual(response.status_code, 400)
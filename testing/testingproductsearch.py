@@ -0,0 +1,69 @@
+"""
+Tests for the pre-designed catalog full-text search.
+
+Run with: python manage.py test testing.testingproductsearch
+"""
+import sqlite3
+import unittest
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from dorzi.product_search import search_products, search_terms
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_tailor
+
+
+def fts5_available():
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE t USING fts5(a)')
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite' and fts5_available(), 'SQLite with FTS5 required')
+class ProductSearchTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+
+    def product(self, title, **fields):
+        return PreDesigned.objects.create(tailor=self.tailor, title=title, price=Decimal('900.00'), **fields)
+
+    def test_query_terms_are_sanitized(self):
+        self.assertEqual(search_terms('Silk "saree" OR -NEAR(*)'), ['silk', 'saree', 'or', 'near'])
+
+    def test_title_matches_rank_first_and_saves_are_indexed(self):
+        in_description = self.product('Evening dress', description='Silk lining')
+        in_title = self.product('Silk saree', category='Saree')
+        self.product('Cotton punjabi', fabric_type='Cotton')
+
+        products, has_next = search_products('silk')
+        self.assertEqual(products, [in_title, in_description])
+        self.assertFalse(has_next)
+
+        in_description.description = 'Chiffon lining'
+        in_description.save()
+        self.assertEqual(search_products('silk')[0], [in_title])
+        # The last term matches as a prefix
+        self.assertEqual(search_products('cott')[0][0].title, 'Cotton punjabi')
+
+    def test_deleted_products_leave_the_index(self):
+        product = self.product('Linen kurta', color='White')
+        product.delete()
+        self.assertEqual(search_products('linen')[0], [])
+
+    def test_search_endpoint_pages_results(self):
+        for index in range(3):
+            self.product(f'Wedding sherwani {index}')
+        first = self.client.get(reverse('pre_designed_search'), {'q': 'wedding'})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.json()['results']), 3)
+        self.assertFalse(first.json()['has_next'])
+        self.assertEqual(self.client.get(reverse('pre_designed_search')).status_code, 400)
+
+        page = self.client.get(reverse('pre_designed'), {'q': 'sherwani'})
+        self.assertContains(page, 'Wedding sherwani 0')
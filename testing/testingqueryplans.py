@@ -0,0 +1,74 @@
+"""
+Index checks for the hot query patterns, and the FavoriteTailor uniqueness rule.
+
+Run with: python manage.py test testing.testingqueryplans
+"""
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from customer.models import Customer
+from dorzi.query_plans import check_plans
+from dorzi.seed_data import generate
+from favorite_tailor.models import FavoriteTailor
+from tailor.models import Tailor
+
+
+# Statistics of a production-sized table: rows, then rows per distinct key prefix
+PRODUCTION_ROWS = 1_000_000
+ROWS_PER_KEY = 20
+
+
+def pin_sqlite_statistics(cursor):
+    """
+    Replace what ANALYZE measured on the small test tables with statistics
+    of production-sized ones, so the planner picks the plans it would pick
+    in production instead of scanning a few dozen rows.
+    """
+    cursor.execute('ANALYZE')
+    cursor.execute('DELETE FROM sqlite_stat1')
+    for table in connection.introspection.table_names(cursor):
+        quoted = connection.ops.quote_name(table)
+        cursor.execute('INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, NULL, %s)',
+                       [table, str(PRODUCTION_ROWS)])
+        cursor.execute(f'PRAGMA index_list({quoted})')
+        for _, index, unique, *_ in cursor.fetchall():
+            cursor.execute(f'PRAGMA index_info({connection.ops.quote_name(index)})')
+            width = len(cursor.fetchall())
+            per_prefix = [ROWS_PER_KEY] + [1] * (width - 1) if not unique or width > 1 else [1]
+            cursor.execute('INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (%s, %s, %s)',
+                           [table, index, ' '.join(map(str, [PRODUCTION_ROWS] + per_prefix))])
+    # Reloads the statistics tables into the planner
+    cursor.execute('ANALYZE sqlite_master')
+
+
+class HotQueryPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        generate({'tailors': 60, 'customers': 40}, seed=3)
+
+    def setUp(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest(f"Plans from {connection.vendor} are not parsed")
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                pin_sqlite_statistics(cursor)
+            else:
+                # A few dozen rows make a sequential scan cheapest; rule it out for this test's transaction
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def test_every_hot_query_reads_through_its_index(self):
+        for name, expected_index, plan, indexed, expected in check_plans():
+            with self.subTest(name):
+                self.assertTrue(indexed, plan)
+                self.assertTrue(expected, f"expected {expected_index} in:\n{plan}")
+
+
+class FavoriteTailorUniqueTest(TestCase):
+
+    def test_duplicate_favorite_is_rejected(self):
+        generate({'tailors': 1, 'customers': 1, 'reviews_per_customer': 0}, seed=4)
+        customer, tailor = Customer.objects.get(), Tailor.objects.get()
+        FavoriteTailor.objects.create(user=customer, tailor=tailor)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            FavoriteTailor.objects.create(user=customer, tailor=tailor)
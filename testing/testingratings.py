@@ -0,0 +1,65 @@
+"""
+Tests for the incrementally maintained tailor rating aggregates.
+
+Run with: python manage.py test testing.testingratings
+"""
+from django.test import TestCase
+
+from reviews.models import Reviews, rebuild_rating_aggregates
+from tailor.models import Tailor
+from testing.fixtures import create_customer, create_tailor
+
+
+class RatingAggregatesTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.other = create_tailor('other@example.com', NID='NID2', business_name='Other')
+        self.customers = [create_customer(f'c{index}@example.com') for index in range(3)]
+
+    def review(self, customer, rating, tailor=None):
+        return Reviews.objects.create(customer=customer, tailor=tailor or self.tailor, rating=rating)
+
+    def aggregates(self, tailor=None):
+        return tuple(Tailor.objects.filter(pk=(tailor or self.tailor).pk)
+                     .values_list('rating_sum', 'review_count', 'average_rating').get())
+
+    def test_create_and_edit(self):
+        self.review(self.customers[0], 5)
+        review = self.review(self.customers[1], 2)
+        self.assertEqual(self.aggregates(), (7, 2, 3.5))
+        review.rating = 4
+        review.save()
+        self.assertEqual(self.aggregates(), (9, 2, 4.5))
+
+    def test_moving_a_review_to_another_tailor(self):
+        self.review(self.customers[0], 5)
+        review = self.review(self.customers[1], 3)
+        review.tailor, review.rating = self.other, 4
+        review.save()
+        self.assertEqual(self.aggregates(), (5, 1, 5.0))
+        self.assertEqual(self.aggregates(self.other), (4, 1, 4.0))
+
+    def test_instance_and_queryset_deletes(self):
+        first = self.review(self.customers[0], 5)
+        self.review(self.customers[1], 3)
+        self.review(self.customers[2], 1)
+        first.delete()
+        self.assertEqual(self.aggregates(), (4, 2, 2.0))
+        Reviews.objects.filter(tailor=self.tailor).delete()
+        self.assertEqual(self.aggregates(), (0, 0, 0.0))
+
+    def test_rebuild_matches_the_incremental_totals(self):
+        self.review(self.customers[0], 5)
+        self.review(self.customers[1], 2)
+        self.review(self.customers[2], 4, tailor=self.other)
+        incremental = [self.aggregates(), self.aggregates(self.other)]
+        Tailor.objects.update(rating_sum=0, review_count=0, average_rating=0.0)
+        self.assertEqual(rebuild_rating_aggregates(), 2)
+        self.assertEqual([self.aggregates(), self.aggregates(self.other)], incremental)
+
+    def test_deleting_an_uncounted_review_stops_at_zero(self):
+        # bulk_create skips Reviews.save, so the tailor's totals never included it
+        review = Reviews.objects.bulk_create([Reviews(customer=self.customers[0], tailor=self.tailor, rating=4)])[0]
+        Reviews.objects.filter(pk=review.pk).delete()
+        self.assertEqual(self.aggregates(), (0, 0, 0.0))
@@ -0,0 +1,57 @@
+"""
+Tests for the cursor-paginated review feeds.
+
+Run with: python manage.py test testing.testingreviewfeed
+"""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from dorzi.review_feed import review_page
+from pre_designed.models import PreDesigned
+from reviews.models import Reviews
+from testing.fixtures import create_customer, create_tailor
+
+
+class ReviewFeedTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tailor = create_tailor()
+        cls.product = PreDesigned.objects.create(tailor=cls.tailor, title='Dress', price=Decimal('900.00'))
+        for index in range(13):
+            customer = create_customer(username=f'c{index}@example.com')
+            Reviews.objects.create(customer=customer, tailor=cls.tailor, product=cls.product,
+                                   rating=index % 5 + 1, comment=f'Review {index}')
+        # Same timestamp everywhere, so ordering and cursors rely on the id tie-breaker
+        Reviews.objects.update(timestamp=Reviews.objects.order_by('id').first().timestamp)
+
+    def test_pages_cover_every_review_once(self):
+        seen, cursor = [], None
+        while True:
+            page, cursor = review_page(Reviews.objects.filter(product=self.product), cursor=cursor, page_size=5)
+            seen.extend(review.id for review in page)
+            if cursor is None:
+                break
+        self.assertEqual(seen, list(Reviews.objects.order_by('-id').values_list('id', flat=True)))
+
+    def test_product_feed_endpoint(self):
+        url = reverse('product_reviews', args=[self.product.id])
+        first = self.client.get(url).json()
+        self.assertEqual(len(first['reviews']), 10)
+        self.assertEqual(first['histogram'], {'1': 3, '2': 3, '3': 3, '4': 2, '5': 2})
+        second = self.client.get(url, {'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(second['reviews']), 3)
+        self.assertIsNone(second['next_cursor'])
+        self.assertNotIn('histogram', second)
+
+    def test_a_malformed_cursor_starts_from_the_top(self):
+        data = self.client.get(reverse('tailor_reviews', args=[self.tailor.id]), {'cursor': 'not-a-cursor'}).json()
+        self.assertEqual(data['reviews'][0]['comment'], 'Review 12')
+
+    def test_tailor_fragment_renders_only_the_first_page(self):
+        response = self.client.get(reverse('tailor_api', args=[self.tailor.id]), {'section': 'reviews'})
+        self.assertContains(response, 'Review 12')
+        self.assertNotContains(response, '"Review 0"')
+        self.assertContains(response, 'Load more reviews')
@@ -0,0 +1,73 @@
+"""
+Tests for pre-designed stock reservations.
+
+Run with: python manage.py test testing.testingstock
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dorzi.models import StockReservation
+from dorzi.stock import OutOfStock, expire_reservations, release, reserve
+from dress_order.models import Order
+from pre_designed.models import PreDesigned
+from testing.fixtures import create_tailor
+
+
+class StockReservationTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor()
+        self.customer_user = User.objects.create_user(username='customer@example.com', password='pass')
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'),
+                                                  availability=3)
+
+    def availability(self):
+        self.product.refresh_from_db()
+        return self.product.availability
+
+    def test_reservations_never_go_below_zero(self):
+        reserve(self.product, 2)
+        with self.assertRaises(OutOfStock):
+            reserve(self.product, 2)
+        reserve(self.product, 1)
+        self.assertEqual(self.availability(), 0)
+        with self.assertRaises(OutOfStock):
+            reserve(self.product, 1)
+        self.assertEqual(StockReservation.objects.count(), 2)
+
+    def test_release_returns_units_once(self):
+        reservation = reserve(self.product, 2)
+        self.assertTrue(release(reservation))
+        self.assertFalse(release(reservation))
+        self.assertEqual(self.availability(), 3)
+
+    def test_stale_holds_expire(self):
+        stale = reserve(self.product, 1, ttl=timedelta(seconds=-1))
+        reserve(self.product, 1)
+        self.assertEqual(expire_reservations(), 1)
+        self.assertEqual(expire_reservations(), 0)
+        self.assertEqual(self.availability(), 2)
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'expired')
+
+    def test_checkout_commits_and_cancellation_releases(self):
+        self.client.login(username='customer@example.com', password='pass')
+        form = {'product_id': self.product.id, 'tailor_id': self.tailor.id, 'quantity': 2, 'price': '900.00',
+                'full_name': 'Customer', 'phone': '01700000000', 'address': 'Dhaka'}
+        self.client.post(reverse('create_order'), form)
+        order = Order.objects.get()
+        self.assertEqual(order.reservation.status, 'committed')
+        self.assertEqual(self.availability(), 1)
+
+        # Not enough left for a second order of two
+        self.client.post(reverse('create_order'), form)
+        self.assertEqual(Order.objects.count(), 1)
+
+        order.status = 'canceled'
+        order.save()
+        self.assertEqual(self.availability(), 3)
+        self.assertEqual(StockReservation.objects.get().status, 'released')
@@ -0,0 +1,74 @@
+"""
+Tests for tailor_api: sections, Cache-Control and fragment revalidation.
+
+Run with: python manage.py test testing.testingtailorapi
+"""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from pre_designed.models import Image, PreDesigned
+from reviews.models import Reviews
+from testing.fixtures import create_customer, create_tailor
+
+
+class TailorApiTest(TestCase):
+
+    def setUp(self):
+        self.tailor = create_tailor(first_name='Rahim', last_name='Uddin')
+        self.product = PreDesigned.objects.create(tailor=self.tailor, title='Dress', price=Decimal('900.00'))
+        self.image = Image.objects.create(predesigned=self.product, image='photos/dress.jpg')
+        self.customer = create_customer(phone='01700000000')
+        self.client.login(username='customer@example.com', password='pass')
+        self.url = reverse('tailor_api', args=[self.tailor.id])
+
+    def fragment(self, section='portfolio', etag=None):
+        headers = {'If-None-Match': etag} if etag else {}
+        return self.client.get(self.url, {'section': section}, headers=headers)
+
+    def assertChanged(self, etag, section='portfolio'):
+        self.assertEqual(self.fragment(section, etag).status_code, 200)
+
+    def test_json_and_sections(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['name'], 'Rahim Uddin')
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('max-age=300', response['Cache-Control'])
+        self.assertNotIn('ETag', response)
+
+        fragment = self.fragment()
+        self.assertContains(fragment, 'Dress')
+        self.assertIn('private', fragment['Cache-Control'])
+        self.assertIn('max-age=300', fragment['Cache-Control'])
+        self.assertEqual(self.fragment('reviews').status_code, 200)
+        self.assertEqual(self.fragment('unknown').status_code, 400)
+
+    def test_unchanged_fragments_answer_304(self):
+        for section in ('portfolio', 'reviews'):
+            etag = self.fragment(section)['ETag']
+            self.assertEqual(self.fragment(section, etag).status_code, 304)
+
+    def test_portfolio_tag_follows_images_and_contact_details(self):
+        etag = self.fragment()['ETag']
+        added = Image.objects.create(predesigned=self.product, image='photos/extra.jpg')
+        self.assertChanged(etag)
+
+        etag = self.fragment()['ETag']
+        added.delete()
+        self.assertChanged(etag)
+
+        etag = self.fragment()['ETag']
+        self.tailor.user.last_name = 'Mia'
+        self.tailor.user.save()
+        self.assertChanged(etag)
+
+        etag = self.fragment()['ETag']
+        self.customer.phone = '01800000000'
+        self.customer.save()
+        self.assertChanged(etag)
+
+    def test_reviews_tag_follows_new_reviews(self):
+        etag = self.fragment('reviews')['ETag']
+        Reviews.objects.create(customer=self.customer, tailor=self.tailor, rating=4)
+        self.assertChanged(etag, 'reviews')
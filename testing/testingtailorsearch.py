@@ -0,0 +1,104 @@
+"""
+Tests for findTailor's server-side filters and keyset pagination.
+
+Run with: python manage.py test testing.testingtailorsearch
+"""
+import base64
+import json
+from decimal import Decimal
+
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+
+from dorzi.tailor_search import (SORT_OPTIONS, carried_filters, decode_cursor, encode_cursor, filter_tailors,
+                                 page_query, search_tailors)
+from tailor.models import Tailor
+from testing.fixtures import create_tailor
+
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+class CursorTest(TestCase):
+
+    def test_round_trip_per_sort_column(self):
+        for field, value in (('price', Decimal('500.50')), ('average_rating', 4.25), ('id', 17)):
+            with self.subTest(field):
+                self.assertEqual(decode_cursor(encode_cursor(value, 9), field), (value, 9))
+
+    def test_malformed_and_tampered_cursors_are_ignored(self):
+        for cursor in ('', 'not base64!', 'AAAA', raw_cursor('text'), raw_cursor(['1']), raw_cursor(['x', 1]),
+                       raw_cursor(['1', 'y']), raw_cursor(['1', [2]]), raw_cursor(None)):
+            with self.subTest(cursor):
+                self.assertIsNone(decode_cursor(cursor, 'price'))
+
+
+class SearchTest(TestCase):
+
+    def setUp(self):
+        # Equal prices and ratings, so pages have to break ties on id
+        for index, (price, rating) in enumerate([('500.00', 4.0)] * 5 + [('300.00', 2.0)] * 2 + [('900.00', 5.0)]):
+            create_tailor(f'tailor{index}@example.com', NID=f'NID{index}', business_name=f'Shop {index}',
+                          price=Decimal(price), average_rating=rating)
+
+    def walk(self, query, page_size=2):
+        """Ids in page order, following next cursors to the end."""
+        params, ids = QueryDict(query, mutable=True), []
+        while True:
+            tailors, cursor = search_tailors(params, page_size=page_size)
+            ids.extend(tailor.id for tailor in tailors)
+            if cursor is None:
+                return ids
+            params = QueryDict(page_query(params, cursor))
+
+    def test_pages_cover_every_tailor_once_despite_ties(self):
+        for sort, (field, descending) in [('', ('id', False))] + list(SORT_OPTIONS.items()):
+            with self.subTest(sort or 'default'):
+                ids = self.walk(f'sort={sort}')
+                expected = Tailor.objects.order_by(('-' if descending else '') + field,
+                                                   '-id' if descending else 'id')
+                self.assertEqual(ids, list(expected.values_list('id', flat=True)))
+
+    def test_cursor_on_a_tie_continues_after_it(self):
+        params = QueryDict('sort=low-to-high', mutable=True)
+        first, cursor = search_tailors(params, page_size=3)
+        # The page ends inside the 500.00 group
+        self.assertEqual([tailor.price for tailor in first], [Decimal('300.00')] * 2 + [Decimal('500.00')])
+        params['cursor'] = cursor
+        second, _ = search_tailors(params, page_size=3)
+        self.assertEqual([tailor.price for tailor in second], [Decimal('500.00')] * 3)
+        self.assertTrue(all(tailor.id > first[-1].id for tailor in second))
+
+    def test_bad_cursor_starts_from_the_first_page(self):
+        self.assertEqual(search_tailors(QueryDict('cursor=garbage'), page_size=2)[0],
+                         search_tailors(QueryDict(''), page_size=2)[0])
+
+    def test_each_filter(self):
+        Tailor.objects.filter(business_name='Shop 0').update(category='Formal_Shirt', business_location='Sylhet')
+        user = Tailor.objects.get(business_name='Shop 7').user
+        user.first_name = 'Karim'
+        user.save()
+
+        def names(query, **kwargs):
+            return sorted(filter_tailors(QueryDict(query), **kwargs).values_list('business_name', flat=True))
+
+        self.assertEqual(names('search=shop 1'), ['Shop 1'])
+        self.assertEqual(names('search=karim'), ['Shop 7'])
+        self.assertEqual(names('category=shirt'), ['Shop 0'])
+        self.assertEqual(names('category=unknown'), names(''))
+        self.assertEqual(names('location=Sylhet&location=Khulna'), ['Shop 0'])
+        self.assertEqual(names('min_price=600'), ['Shop 7'])
+        self.assertEqual(names('max_price=300'), ['Shop 5', 'Shop 6'])
+        self.assertEqual(names('min_price=abc'), names(''))
+        self.assertEqual(names('min_rating=4.5'), ['Shop 7'])
+        self.assertEqual(names('min_rating=high'), names(''))
+        self.assertNotIn('Shop 7', names('', exclude_user=user))
+
+    def test_search_form_keeps_the_active_filters(self):
+        params = QueryDict('search=shop&location=Dhaka&location=Sylhet&sort=rating&cursor=abc')
+        self.assertEqual(carried_filters(params), [('location', 'Dhaka'), ('location', 'Sylhet'), ('sort', 'rating')])
+        response = self.client.get(reverse('findTailor'), {'location': 'Dhaka', 'sort': 'rating'})
+        self.assertContains(response, '<input type="hidden" name="location" value="Dhaka">', html=True)
+        self.assertContains(response, '<input type="hidden" name="sort" value="rating">', html=True)
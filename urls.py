@@ -20,21 +20,31 @@ from django.urls import path,include
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
+from .instrumentation import metrics_view
+from .catalog_api import API_VERSION, router as catalog_router
 from django.contrib.auth import views as auth_views
 
 urlpatterns = [
+    path(f'api/{API_VERSION}/', include(catalog_router.urls)),
     path('api/tailor/<int:tailor_id>/', views.tailor_api, name='tailor_api'),
+    path('api/tailor/<int:tailor_id>/reviews/', views.tailor_reviews, name='tailor_reviews'),
+    path('api/tailor/<int:tailor_id>/delivery-quote/', views.delivery_quote, name='delivery_quote'),
     path('admin/', admin.site.urls,name='iloveu'),
+    path('perf/metrics/', metrics_view, name='perf_metrics'),
     path('', views.home, name='home'),
     path('about/', views.about, name='about'),
     path('terms/', views.terms, name='terms'),
     path('privacy/', views.privacy, name='privacy'),
     path('findTailor/', views.findTailor, name='findTailor'),
     path('pre-Designed/', views.pre_designed, name='pre_designed'),
+    path('pre-Designed/search/', views.pre_designed_search, name='pre_designed_search'),
+    path('pre-Designed/facets/', views.pre_designed_facets, name='pre_designed_facets'),
+    path('pre-Designed/<int:product_id>/reviews/', views.product_reviews, name='product_reviews'),
     path('login/', views.user_login, name='user_login'),
     path('signup/', views.signup, name='user_signup'),
     path('logout/', views.logout, name='logout'),
     path('profile/', views.customer, name='customer'),
+    path('profile/orders/', views.customer_orders, name='customer_orders'),
     path('updateuser/', views.updateuser, name='updateuser'),
     path('deleteuser/', views.delete_user, name='deleteuser'),
     path('accounts/', include('allauth.urls')),
@@ -56,6 +66,8 @@ urlpatterns = [
     #------------------------------------------
     path('tailor_signup/', views.tailor_signup, name='tailor_signup'),
     path('tailorDeshboard/', views.tailor_dashboard, name='tailor_dashboard'),
+    path('tailorDeshboard/earnings/', views.tailor_earnings, name='tailor_earnings'),
+    path('tailorDeshboard/orders/batch/', views.tailor_order_updates, name='tailor_order_updates'),
     path('tailor_login/', views.tailor_login, name='tailor_login'),
     path('tailor_detail/', views.tailor_details, name='tailor_details'),
     path('updateTailor/',views.updatetailor,name='updatetailor'),
@@ -80,6 +92,9 @@ urlpatterns = [
     #-------------------------------------------
     
     path('favorites/toggle/<int:tailor_id>/', views.toggle_favorite, name='toggle_favorite'),
+    path('favorites/ids/', views.favorite_tailor_ids, name='favorite_tailor_ids'),
+    path('favorites/sync/', views.favorite_tailors_sync, name='favorite_tailors_sync'),
+    path('favorites/<int:tailor_id>/', views.favorite, name='favorite'),
     path('favorites/', views.favorite_tailors, name='favorite_tailors'),
     
     #-------------------------------------------
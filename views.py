@@ -13,15 +13,17 @@ from favorite_dress.models import *
 from favorite_tailor.models import *
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404, render, redirect
+from django.shortcuts import aget_object_or_404, get_object_or_404, render, redirect
 from django.contrib.auth import authenticate, login as auth_login
 from django.contrib.auth import get_user_model
 from django.contrib.auth import logout as auth_logout
 from django.contrib.auth.forms import AuthenticationForm
 from functools import wraps
 from django.contrib import messages  
-from django.db.models import Q, Avg, Count, Sum, F, ExpressionWrapper, DecimalField
+from django.db import transaction
+from django.db.models import Q, Avg, Count, Sum, Max, F, ExpressionWrapper, DecimalField, prefetch_related_objects
 from django.core.exceptions import FieldError
+import hashlib
 import random
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -29,43 +31,101 @@ import json
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_POST, require_http_methods
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.template.loader import render_to_string
+from .tailor_search import carried_filters, search_tailors, page_query
+from .order_feed import order_feed_page, order_counts
+from .catalog_cache import cache_anonymous_page
+from .image_variants import queue_derivatives
+from .earnings import earnings_series, earnings_summary
+from .product_search import search_products
+from .catalog_facets import facet_counts, filter_products, parse_filters
+from .review_feed import rating_histogram, review_entry, review_page
+from .delivery_schedule import custom_order_delivery, custom_order_work, dress_order_delivery
+from .stock import OutOfStock, commit, reserve
+from .order_updates import OrderUpdateError, apply_order_updates, parse_updates
+from .favorites import MAX_SYNC_FAVORITES, UnknownTailor, flip_favorite, set_favorite, sync_favorites, unset_favorite
+from .catalog_api import touch_products
 
+# Everything a tailor card renders inline, grouped per tailor in one query per relation.
+# The portfolio and reviews tabs are lazy-loaded from tailor_api instead.
+TAILOR_CARD_PREFETCH = (
+    'fabrics',
+    'embroideries',
+)
+
+# Sections of the tailor modal served as HTML fragments by tailor_api
+TAILOR_FRAGMENT_TEMPLATES = {
+    'portfolio': 'tailor_portfolio.html',
+    'reviews': 'tailor_reviews.html',
+}
+TAILOR_API_MAX_AGE = 300  # seconds
+
+@cache_anonymous_page
 def home(request):
-    products = PreDesigned.objects.all()
-    tailors = Tailor.objects.all()
-    embroidery = Embroidery.objects.all()
-    fabrics = Fabric.objects.all()
-    favorite_tailor_ids = []
-    if request.user.is_authenticated and hasattr(request.user, 'customer'):
-        favorite_tailors = FavoriteTailor.objects.filter(user=request.user.customer)
-        favorite_tailor_ids = [fav.tailor.id for fav in favorite_tailors]
-    return render(request, 'home.html', {'products': products, 
-                                         'tailors': tailors, 
-                                         'favorite_tailor_ids': favorite_tailor_ids, 
-                                         "fabrics": fabrics, 
-                                         "embroidery": embroidery})
+    tailors = Tailor.objects.select_related('user').prefetch_related(*TAILOR_CARD_PREFETCH)
+    return render(request, 'home.html', {'tailors': tailors})
 
+@cache_anonymous_page
 def findTailor(request):
-    tailors = Tailor.objects.all()
-    products = PreDesigned.objects.all()
-    reviews = Reviews.objects.all()
-    embroidery = Embroidery.objects.all()
-    fabrics = Fabric.objects.all() 
-    favorite_tailor_ids = []
-    if request.user.is_authenticated and hasattr(request.user, 'customer'):
-        favorite_tailors = FavoriteTailor.objects.filter(user=request.user.customer)
-        favorite_tailor_ids = [fav.tailor.id for fav in favorite_tailors]
-    return render(request, 'findTailor.html', {'tailors': tailors, 
-                                               'products': products, 
-                                               'reviews': reviews, 
-                                               'embroidery': embroidery, 
-                                               'favorite_tailor_ids': favorite_tailor_ids,
-                                               'fabrics': fabrics})
+    exclude_user = request.user if request.user.is_authenticated else None
+    tailors, next_cursor = search_tailors(request.GET, exclude_user=exclude_user)
+    prefetch_related_objects(tailors, *TAILOR_CARD_PREFETCH)
+    return render(request, 'findTailor.html', {'tailors': tailors,
+                                               'search': request.GET.get('search', ''),
+                                               'search_filters': carried_filters(request.GET),
+                                               'next_page_query': page_query(request.GET, next_cursor) if next_cursor else ''})
+
+def _search_page(request):
+    try:
+        return max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        return 1
 
+@cache_anonymous_page
 def pre_designed(request):
-    products = PreDesigned.objects.all()
-    return render(request, 'pre_designed.html', {'products': products})
+    query = request.GET.get('q', '').strip()
+    products = filter_products(PreDesigned.objects.all(), parse_filters(request.GET))
+    if not query:
+        return render(request, 'pre_designed.html', {'products': products})
+    page = _search_page(request)
+    products, has_next = search_products(query, page, queryset=products)
+    return render(request, 'pre_designed.html', {'products': products, 'query': query,
+                                                 'page': page, 'has_next': has_next})
+
+def pre_designed_search(request):
+    """
+    Ranked full-text search over the catalog, one page of results as JSON,
+    with facet counts for the same query and filters.
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'q is required'}, status=400)
+    filters = parse_filters(request.GET)
+    page = _search_page(request)
+    products, has_next = search_products(query, page,
+                                         queryset=filter_products(PreDesigned.objects.all(), filters))
+    results = []
+    for product in products:
+        images = list(product.images.all())
+        results.append({
+            'id': product.id,
+            'title': product.title,
+            'category': product.category,
+            'gender': product.gender,
+            'price': str(product.price),
+            'tailor': product.tailor.business_name,
+            'image': images[0].image.url if images else None,
+        })
+    return JsonResponse({'results': results, 'page': page, 'has_next': has_next,
+                         'facets': facet_counts(query, filters)})
+
+def pre_designed_facets(request):
+    """Facet counts for the catalog under the current search text and filters."""
+    return JsonResponse(facet_counts(request.GET.get('q', ''), parse_filters(request.GET)))
 
 def about(request):
     return render(request, 'about.html')
@@ -122,8 +182,11 @@ def create_custom_orders(request, tailor_id):
             base_price = tailor.price
             total_price = base_price + embroidery_total_price
             
-            # Calculate delivery date (21 working days from now)
-            delivery_date = calculate_working_days(datetime.now().date(), 21)
+            # Earliest date the tailor can deliver, given their open orders
+            embroidery_id_list = [int(id) for id in selected_embroidery_ids.split(',') if id.strip()]
+            selected_embroideries = list(Embroidery.objects.filter(id__in=embroidery_id_list, tailor=tailor))
+            delivery_date = custom_order_delivery(tailor, selected_embroideries)
+            work_days = custom_order_work(selected_embroideries)
             
             # Create the custom order
             custom_order = TOrders.objects.create(
@@ -147,6 +210,9 @@ def create_custom_orders(request, tailor_id):
                 special_requests=special_request,
                 delivery_date=delivery_date,
                 price=total_price,  # Now includes embroidery prices
+                # The order's FK holds a single design; work_days counts all of them
+                embroidery=selected_embroideries[0] if len(selected_embroideries) == 1 else None,
+                work_days=work_days,
                 
                 # Measurements - match the TOrders model fields
                 chest=chest,
@@ -162,26 +228,6 @@ def create_custom_orders(request, tailor_id):
                 status='pending',
             )
             
-            # Handle embroidery selection if any
-            if selected_embroidery_ids:
-                embroidery_id_list = [int(id) for id in selected_embroidery_ids.split(',') if id.strip()]
-                selected_embroideries = Embroidery.objects.filter(id__in=embroidery_id_list, tailor=tailor)
-                
-                # Store embroidery info if you have the field in your model
-                # If you have a ManyToMany field, use:
-                # custom_order.embroidery_designs.add(*selected_embroideries)
-                
-                # Or store as JSON if you have a JSON field
-                if hasattr(custom_order, 'selected_embroidery_info'):
-                    custom_order.selected_embroidery_info = json.dumps([
-                        {
-                            'id': emb.id,
-                            'title': emb.title,
-                            'price': str(emb.price)
-                        } for emb in selected_embroideries
-                    ])
-                    custom_order.save()
-            
             messages.success(request, f"Custom order placed successfully! Your order ID is TORD-{custom_order.id:03d}. Total price: ৳{total_price}")
             return redirect('customer')
             
@@ -238,20 +284,27 @@ def create_order(request):
                 messages.error(request, "Selected tailor does not exist.")
                 return redirect('pre_designed')
             
-            # Create the order
-            order = Order.objects.create(
-                customer=request.user,
-                tailor=tailor,
-                product=product,
-                quantity=quantity,
-                price=price,
-                address=address,
-                number=phone,
-                size=size,
-                category=product.category,
-                special_instructions=special_instructions,
-                delivery_date=timezone.now() + timedelta(days=10)  # 10 days from now
-            )
+            # Take the units off sale and create the order together
+            try:
+                with transaction.atomic():
+                    reservation = reserve(product, quantity)
+                    order = Order.objects.create(
+                        customer=request.user,
+                        tailor=tailor,
+                        product=product,
+                        quantity=quantity,
+                        price=price,
+                        address=address,
+                        number=phone,
+                        size=size,
+                        category=product.category,
+                        special_instructions=special_instructions,
+                        delivery_date=dress_order_delivery(tailor, quantity)
+                    )
+                    commit(reservation, order)
+            except OutOfStock as e:
+                messages.error(request, str(e))
+                return redirect('pre_designed')
             
             messages.success(request, f"Order placed successfully! Your order ID is #{order.id}")
             return redirect('customer')
@@ -370,50 +423,36 @@ def tailor_login(request):
 def addDress(request):
     if request.method == 'POST':
         try:
-            # Debugging: Check if request is reaching here
-            print("AddDress POST request received")
-            print("POST data:", request.POST)
-            print("FILES:", request.FILES)
-            
-            # Get the current tailor
             tailor = Tailor.objects.get(user=request.user)
-            print("Tailor found:", tailor)
-            
-            # Create the PreDesigned object
-            dress = PreDesigned.objects.create(
-                tailor=tailor,
-                title=request.POST.get('title'),
-                description=request.POST.get('description', ''),
-                availability=int(request.POST.get('availability', 0)),
-                price=Decimal(request.POST.get('price', 0.0)),
-                category=request.POST.get('category', ''),
-                fabric_type=request.POST.get('fabric_type', ''),
-                thread_type=request.POST.get('thread_type', ''),
-                color=request.POST.get('color', ''),
-                gender=request.POST.get('gender', '')
-            )
-            
-            # Handle estimated time
+
             estimated_time = request.POST.get('estimated_time')
-            if estimated_time and estimated_time.isdigit():
-                dress.estimated_time = timedelta(hours=int(estimated_time))
-            
-            dress.save()
-            print("Dress object created:", dress.id)
-            
-            # Handle multiple image uploads
-            images = request.FILES.getlist('images')
-            print("Images received:", len(images))
-            
-            for image in images:
-                Image.objects.create(predesigned=dress, image=image)
-                print("Image saved:", image.name)
-            
+            with transaction.atomic():
+                dress = PreDesigned.objects.create(
+                    tailor=tailor,
+                    title=request.POST.get('title'),
+                    description=request.POST.get('description', ''),
+                    availability=int(request.POST.get('availability', 0)),
+                    price=Decimal(request.POST.get('price', 0.0)),
+                    category=request.POST.get('category', ''),
+                    fabric_type=request.POST.get('fabric_type', ''),
+                    thread_type=request.POST.get('thread_type', ''),
+                    color=request.POST.get('color', ''),
+                    gender=request.POST.get('gender', ''),
+                    estimated_time=timedelta(hours=int(estimated_time)) if estimated_time and estimated_time.isdigit() else None,
+                )
+
+                # One INSERT for all images; resizing and validation run in the job worker
+                images = Image.objects.bulk_create([
+                    Image(predesigned=dress, image=image) for image in request.FILES.getlist('images')
+                ])
+                # bulk_create skips the Image signals that keep the product's updated_at current
+                touch_products([dress.pk])
+                queue_derivatives(images)
+
             messages.success(request, "Dress added successfully!")
             return redirect('tailor_dashboard')
-            
+
         except Exception as e:
-            print("Error in addDress:", str(e))
             messages.error(request, f"Error adding dress: {str(e)}")
             return redirect('tailor_dashboard')  # Redirect back to dashboard
     
@@ -422,17 +461,18 @@ def addDress(request):
     return redirect('tailor_dashboard')
 
 @login_required
-def get_dress_details(request, product_id):
+async def get_dress_details(request, product_id):
     try:
         # Get the product
-        product = PreDesigned.objects.get(id=product_id)
+        product = await PreDesigned.objects.select_related('tailor').aget(id=product_id)
         
         # Check if the current user owns this product
-        if product.tailor.user != request.user:
+        user = await request.auser()
+        if product.tailor.user_id != user.pk:
             return JsonResponse({'success': False, 'error': 'You do not have permission to view this product.'})
         
         # Get all images for this product
-        images = [request.build_absolute_uri(image.image.url) for image in product.images.all()]
+        images = [request.build_absolute_uri(image.image.url) async for image in product.images.all()]
         
         # Prepare response data
         data = {
@@ -554,106 +594,34 @@ def user_login(request):
 def customer(request):
     user = request.user
     customer = Customer.objects.get(user=user)
-    products =  PreDesigned.objects.all()
-    torder = TOrders.objects.filter(customer=customer).order_by('-order_date')
-    dressorder = Order.objects.filter(customer=user).order_by('-order_date')
     favorite_dresses = FavoriteDress.objects.filter(user=customer)
-    favorite_tailors = FavoriteTailor.objects.filter(user=customer)
+    favorite_tailors = FavoriteTailor.objects.filter(user=customer).select_related('tailor__user')
 
-    all_orders = []
-    for order in torder:
-        if order.deliver is not None:
-            status = "Completed"
-        else:
-            status = "Pending"
-        all_orders.append({
-            'id': order.id,
-            'order_id': f"TORD-{order.id:03d}",
-            'garment': order.detailed_description or "Custom Garment",
-            'category': order.category or "Custom",
-            'tailor': order.tailor,
-            'delivery_date': order.delivery_date,
-            'status': order.status,
-            'order_type': "Custom Order",
-            'amount': order.get_total_price(),
-            'progress': None,  # This is the important field for custom orders
-            'timeline': order.status if hasattr(order, 'timeline') else {},
-            'order_date': order.order_date if hasattr(order, 'order_date') else None,
-            # Custom order specific fields
-            'fabric': order.fabrics if hasattr(order, 'fabrics') else '',
-            'color': getattr(order, 'color', ''),
-            'chest': order.chest,
-            'waist': order.waist,
-            'hip': order.hip,
-            'shoulder': order.shoulder,
-            'sleeve': order.sleeve,
-            'length': order.length,
-            'inseam': order.inseam,
-            'neck': order.neck,
-            'special_notes': order.special_requests if hasattr(order, 'special_requests') else '',
-            # Custom orders 
-            'measurements_confirmed': getattr(order, 'measurements_confirmed', None),
-            'fabric_selected': getattr(order, 'fabric_selected', None),
-            'cutting_started': getattr(order, 'cutting_started', None),
-            'stitching_started': getattr(order, 'stitching_started', None),
-            'deliver': getattr(order, 'deliver', None),
-        })
-    
-    # Process Pre-designed orders
-    for order in dressorder:
-        if order.deliver is not None:
-            status = "Completed"
-        else:
-            status = "Pending"
-        all_orders.append({
-            'id': order.id,
-            'order_id': f"DORD-{order.id:03d}",
-            'garment': order.product.title if order.product else "Pre-designed Garment",
-            'category': order.category or "Pre-designed",
-            'tailor': order.tailor,
-            'delivery_date': order.delivery_date,
-            'status': status,
-            'order_type': "Pre-designed",
-            'amount': order.get_total_price(),
-            'progress': None,
-            'timeline': order.status if hasattr(order, 'timeline') else {},
-            'order_date': order.order_date if hasattr(order, 'order_date') else None,
-            'size': order.size if hasattr(order, 'size') else None,
-            # Pre-designed order specific fields
-            'fabric': order.product.fabric_type if order.product else '',
-            'color': order.product.color if order.product else '',
-            'quantity': order.quantity,
-            'special_instructions': order.special_instructions if hasattr(order, 'special_instructions') else '',
-            # Pre-designed orders 
-            'order_confirmed': getattr(order, 'order_confirmed', None),
-            'production': getattr(order, 'production', None),
-            'quality_check': getattr(order, 'quality_check', None),
-            'deliver': getattr(order, 'deliver', None),
-        })
-    
-    # Sort by delivery_date safely
-    all_orders.sort(key=lambda x: x['delivery_date'] if x['delivery_date'] else datetime.min, reverse=True)
-    
-    # Stats
-    total_orders = len(all_orders)
-    completed_orders = len([order for order in all_orders if order['status'].lower() == 'delivered'])
-    pending_orders = len(all_orders) - completed_orders
+    # First page of the merged order history; the rest comes from customer_orders
+    all_orders, next_orders_cursor = order_feed_page(customer)
+    counts = order_counts(customer)
     favorite_tailors_count = favorite_tailors.count()
     
     return render(request, 'customer.html', {
         'customer': customer,
-        'torder': torder,
-        'dressorder': dressorder,
         'favorite_dresses': favorite_dresses,
         'favorite_tailors': favorite_tailors,
         'all_orders': all_orders,
-        'total_orders': total_orders,
-        'completed_orders': completed_orders,
-        'pending_orders': pending_orders,
+        'next_orders_cursor': next_orders_cursor,
+        'total_orders': counts['total'],
+        'completed_orders': counts['completed'],
+        'pending_orders': counts['pending'],
         'favorite_tailors_count': favorite_tailors_count,
-        'products': products
     })
 
+@login_required
+def customer_orders(request):
+    """Next page of the profile order history, for the "Load more" button."""
+    customer = get_object_or_404(Customer, user=request.user)
+    orders, next_cursor = order_feed_page(customer, cursor=request.GET.get('cursor'))
+    html = render_to_string('customer_order_rows.html', {'orders': orders}, request=request)
+    return JsonResponse({'html': html, 'next_cursor': next_cursor})
+
 @login_required
 def addEmbroidery(request):
     if request.method == 'POST':
@@ -661,29 +629,23 @@ def addEmbroidery(request):
             # Get the current tailor
             tailor = Tailor.objects.get(user=request.user)
             
-            # Create the Embroidery object
-            embroidery = Embroidery.objects.create(
-                tailor=tailor,
-                title=request.POST.get('title'),
-                description=request.POST.get('description', ''),
-                price=request.POST.get('price', 0.0),
-                fabric_type=request.POST.get('fabric_type', ''),
-                thread_type=request.POST.get('thread_type', ''),
-                color=request.POST.get('color', ''),
-                complexity_level=request.POST.get('complexity_level', 'simple'),
-            )
-            
-            # Handle estimated time (convert hours to timedelta)
+            # Estimated time arrives in hours
             estimated_time_hours = request.POST.get('estimated_time')
-            if estimated_time_hours:
-                embroidery.estimated_time = timedelta(hours=int(estimated_time_hours))
-            
-            # Handle image upload
-            design_image = request.FILES.get('design_image')
-            if design_image:
-                embroidery.design_image = design_image
-            
-            embroidery.save()
+
+            # A single INSERT; the design image's derivatives are queued for the job worker
+            with transaction.atomic():
+                Embroidery.objects.create(
+                    tailor=tailor,
+                    title=request.POST.get('title'),
+                    description=request.POST.get('description', ''),
+                    price=request.POST.get('price', 0.0),
+                    fabric_type=request.POST.get('fabric_type', ''),
+                    thread_type=request.POST.get('thread_type', ''),
+                    color=request.POST.get('color', ''),
+                    complexity_level=request.POST.get('complexity_level', 'simple'),
+                    estimated_time=timedelta(hours=int(estimated_time_hours)) if estimated_time_hours else None,
+                    design_image=request.FILES.get('design_image'),
+                )
             
             messages.success(request, "Embroidery design added successfully!")
             return redirect('tailor_dashboard')
@@ -696,13 +658,14 @@ def addEmbroidery(request):
     return render(request, 'addEmbroidery.html')    
 
 @login_required
-def get_embroidery_details(request, embroidery_id):
+async def get_embroidery_details(request, embroidery_id):
     try:
         # Get the embroidery design
-        embroidery = Embroidery.objects.get(id=embroidery_id)
+        embroidery = await Embroidery.objects.select_related('tailor').aget(id=embroidery_id)
         
         # Check if the current user owns this embroidery design
-        if embroidery.tailor.user != request.user:
+        user = await request.auser()
+        if embroidery.tailor.user_id != user.pk:
             return JsonResponse({'success': False, 'error': 'You do not have permission to view this embroidery design.'})
         
         # Prepare response data
@@ -731,28 +694,170 @@ def get_embroidery_details(request, embroidery_id):
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
+def json_login_required(view):
+    """login_required for JSON endpoints: anonymous callers get a 401, not the login page's HTML."""
+    def denied():
+        return JsonResponse({'error': 'Please log in first'}, status=401)
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if not (await request.auser()).is_authenticated:
+                return denied()
+            return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                return denied()
+            return view(request, *args, **kwargs)
+    return wrapper
+
+async def _customer_id(request):
+    user = await request.auser()
+    return await Customer.objects.filter(user=user).values_list('id', flat=True).afirst()
+
 @require_POST
-@login_required
-def toggle_favorite(request, tailor_id):
+@json_login_required
+async def toggle_favorite(request, tailor_id):
+    customer_id = await _customer_id(request)
+    if customer_id is None:
+        return JsonResponse({'error': 'Only customers can keep favorites'}, status=403)
     try:
-        tailor = Tailor.objects.get(id=tailor_id)
-        customer = request.user.customer
-        
-        # Check if already favorited
-        try:
-            favorite = FavoriteTailor.objects.get(user=customer, tailor=tailor)
-            # If it exists, remove it (toggle off)
-            favorite.delete()
-            return JsonResponse({'status': 'removed', 'tailor_id': tailor_id})
-        except FavoriteTailor.DoesNotExist:
-            # If it doesn't exist, create it (toggle on)
-            FavoriteTailor.objects.create(user=customer, tailor=tailor)
-            return JsonResponse({'status': 'added', 'tailor_id': tailor_id})
-            
-    except Tailor.DoesNotExist:
+        added = await sync_to_async(flip_favorite)(customer_id, tailor_id)
+    except UnknownTailor:
         return JsonResponse({'error': 'Tailor not found'}, status=404)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse({'status': 'added' if added else 'removed', 'tailor_id': tailor_id})
+
+@require_http_methods(['PUT', 'DELETE'])
+@json_login_required
+async def favorite(request, tailor_id):
+    """PUT marks the tailor a favorite and DELETE unmarks it; repeating either changes nothing."""
+    customer_id = await _customer_id(request)
+    if customer_id is None:
+        return JsonResponse({'error': 'Only customers can keep favorites'}, status=403)
+    if request.method == 'DELETE':
+        await sync_to_async(unset_favorite)(customer_id, tailor_id)
+        return JsonResponse({'status': 'removed', 'tailor_id': tailor_id})
+    try:
+        await sync_to_async(set_favorite)(customer_id, tailor_id)
+    except UnknownTailor:
+        return JsonResponse({'error': 'Tailor not found'}, status=404)
+    return JsonResponse({'status': 'added', 'tailor_id': tailor_id})
+
+EARNINGS_MAX_DAYS = 366
+
+@login_required
+def tailor_earnings(request):
+    """Dashboard earnings widgets and chart data, read from the daily rollups."""
+    tailor = get_object_or_404(Tailor, user=request.user)
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), EARNINGS_MAX_DAYS)
+    except ValueError:
+        return JsonResponse({'error': 'days must be a number'}, status=400)
+    summary = earnings_summary(tailor)
+    return JsonResponse({
+        'total_earning': str(summary['total_earning']),
+        'monthly_earnings': str(summary['monthly_earnings']),
+        'orders': summary['orders'],
+        'delivered': summary['delivered'],
+        'canceled': summary['canceled'],
+        'open_orders': summary['open_orders'],
+        'daily': earnings_series(tailor, days),
+    })
+
+def _apply_for_tailor(request, raw_updates):
+    tailor = get_object_or_404(Tailor, user=request.user)
+    updates = parse_updates(raw_updates)
+    return apply_order_updates(tailor, updates)
+
+def _json_body(request):
+    try:
+        return json.loads(request.body)
+    except ValueError:
+        return None
+
+@require_POST
+@login_required
+def tailor_order_updates(request):
+    """
+    Change the status and/or timeline dates of many orders at once:
+    ``{"updates": [{"order_type": "custom", "order_id": 7, "status": "processing",
+    "timeline_field": "cutting_started", "date": "2026-05-01"}, ...]}``.
+    Every entry is checked before anything is written; any problem fails the batch.
+    """
+    body = _json_body(request)
+    try:
+        applied = _apply_for_tailor(request, body.get('updates') if isinstance(body, dict) else None)
+    except OrderUpdateError as e:
+        return JsonResponse({'success': False, 'errors': e.errors}, status=400)
+    return JsonResponse({'success': True, 'orders': [
+        {'order_type': kind, 'order_id': order_id,
+         **{name: value.isoformat() if hasattr(value, 'isoformat') else value for name, value in values.items()}}
+        for (kind, order_id), values in applied.items()]})
+
+@require_POST
+@login_required
+def update_order_status(request):
+    """Single-order status change from the dashboard modal."""
+    body = _json_body(request)
+    if not isinstance(body, dict):
+        return JsonResponse({'success': False, 'error': 'Expected a JSON object'}, status=400)
+    try:
+        _apply_for_tailor(request, [{'order_type': body.get('order_type'), 'order_id': body.get('order_id'),
+                                     'status': body.get('new_status')}])
+    except OrderUpdateError as e:
+        return JsonResponse({'success': False, 'error': e.errors[0]['error']}, status=400)
+    return JsonResponse({'success': True})
+
+@require_POST
+@login_required
+def update_timeline_date(request):
+    """Stamp one timeline stage of an order with today's date."""
+    body = _json_body(request)
+    if not isinstance(body, dict):
+        return JsonResponse({'success': False, 'error': 'Expected a JSON object'}, status=400)
+    try:
+        applied = _apply_for_tailor(request, [{'order_type': body.get('order_type'), 'order_id': body.get('order_id'),
+                                               'timeline_field': body.get('timeline_field')}])
+    except OrderUpdateError as e:
+        return JsonResponse({'success': False, 'error': e.errors[0]['error']}, status=400)
+    field = body['timeline_field']
+    day = next(iter(applied.values()))[field]
+    return JsonResponse({'success': True, 'message': f"{field.replace('_', ' ').capitalize()} marked done.",
+                         'date': day.isoformat()})
+
+@json_login_required
+def favorite_tailor_ids(request):
+    """
+    Ids of the signed-in customer's favorite tailors. Catalog pages render every
+    heart empty and fill them in from this, so their HTML is the same for everyone.
+    """
+    ids = FavoriteTailor.objects.filter(user__user=request.user).values_list('tailor_id', flat=True)
+    response = JsonResponse({'tailor_ids': list(ids)})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+@require_http_methods(['PUT'])
+@json_login_required
+def favorite_tailors_sync(request):
+    """
+    Replace the customer's favorites with ``{"tailor_ids": [...]}`` and return
+    the resulting set. Offline clients send their final state once reconnected.
+    """
+    customer = Customer.objects.filter(user=request.user).only('id').first()
+    if customer is None:
+        return JsonResponse({'error': 'Only customers can keep favorites'}, status=403)
+    body = _json_body(request)
+    tailor_ids = body.get('tailor_ids') if isinstance(body, dict) else None
+    if not isinstance(tailor_ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in tailor_ids):
+        return JsonResponse({'error': 'tailor_ids must be a list of numbers'}, status=400)
+    if len(tailor_ids) > MAX_SYNC_FAVORITES:
+        return JsonResponse({'error': f'At most {MAX_SYNC_FAVORITES} favorites'}, status=400)
+    ids, added, removed = sync_favorites(customer.id, tailor_ids)
+    response = JsonResponse({'tailor_ids': ids, 'added': added, 'removed': removed})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 def favorite_tailors(request):
     if not request.user.is_authenticated:
@@ -761,3 +866,147 @@ def favorite_tailors(request):
     
     favorites = FavoriteTailor.objects.filter(user=request.user.customer).select_related('tailor')
     return render(request, 'favorites.html', {'favorites': favorites})
+
+def _review_feed(request, reviews):
+    """
+    One page of a review feed as JSON. The rating histogram covers all of
+    ``reviews`` and is only sent with the first page.
+    """
+    cursor = request.GET.get('cursor')
+    page, next_cursor = review_page(reviews, cursor=cursor)
+    data = {'reviews': [review_entry(review) for review in page], 'next_cursor': next_cursor}
+    if not cursor:
+        data['histogram'] = rating_histogram(reviews)
+    return JsonResponse(data)
+
+def product_reviews(request, product_id):
+    product = get_object_or_404(PreDesigned, id=product_id)
+    return _review_feed(request, Reviews.objects.filter(product=product))
+
+def tailor_reviews(request, tailor_id):
+    tailor = get_object_or_404(Tailor, id=tailor_id)
+    return _review_feed(request, Reviews.objects.filter(tailor=tailor))
+
+def delivery_quote(request, tailor_id):
+    """
+    Earliest delivery date for a new order from this tailor: ``?type=custom``
+    with optional ``embroidery`` ids, or ``?type=dress`` with a ``quantity``.
+    """
+    tailor = get_object_or_404(Tailor.objects.select_related('workload'), id=tailor_id)
+    order_type = request.GET.get('type', 'custom')
+    try:
+        if order_type == 'custom':
+            ids = [int(id) for id in request.GET.get('embroidery', '').split(',') if id.strip()]
+            delivery_date = custom_order_delivery(tailor, Embroidery.objects.filter(id__in=ids, tailor=tailor))
+        elif order_type == 'dress':
+            delivery_date = dress_order_delivery(tailor, max(int(request.GET.get('quantity', 1)), 1))
+        else:
+            return JsonResponse({'error': f'Unknown type: {order_type}'}, status=400)
+    except ValueError:
+        return JsonResponse({'error': 'embroidery and quantity must be numbers'}, status=400)
+    workload = getattr(tailor, 'workload', None)
+    return JsonResponse({
+        'delivery_date': delivery_date.isoformat(),
+        'open_orders': workload.open_orders if workload else 0,
+        'backlog_days': str(workload.backlog_days) if workload else '0.00',
+    })
+
+def _tailor_api_etag(request, tailor_id):
+    """
+    ETag for a tailor_api fragment, built from the count and latest change of
+    the rows it renders so adds, edits and deletes all produce a new tag.
+    """
+    section = request.GET.get('section')
+    if section == 'portfolio':
+        state = list(PreDesigned.objects.filter(tailor_id=tailor_id).aggregate(
+            count=Count('id', distinct=True), latest=Max('updated_at'),
+            images=Count('images'), last_image=Max('images__id')).values())
+        # The cards also show the tailor's business details and name
+        state += list(Tailor.objects.filter(pk=tailor_id)
+                      .values_list('updated_at', 'user__first_name', 'user__last_name').first() or ())
+    elif section == 'reviews':
+        state = list(Reviews.objects.filter(tailor_id=tailor_id).aggregate(
+            count=Count('id'), latest=Max('timestamp'), total=Sum('rating')).values())
+    else:
+        return None
+    # Fragments embed the visitor's CSRF token and contact details
+    user = request.user
+    customer = getattr(user, 'customer', None)
+    visitor = [user.pk, user.get_full_name() if user.is_authenticated else '',
+               customer.phone if customer else '', customer.address if customer else '']
+    values = [section, tailor_id] + visitor + state
+    # Hashed, as the visitor's contact details must not travel in a header
+    return hashlib.md5('-'.join(str(value) for value in values).encode()).hexdigest()
+
+def _render_tailor_fragment(request, tailor, section):
+    if section == 'portfolio':
+        context = {'products': PreDesigned.objects.filter(tailor=tailor)
+                                          .select_related('tailor__user')
+                                          .prefetch_related('images')}
+    else:
+        # First page only; the fragment's "Load more" pages through tailor_reviews
+        reviews = Reviews.objects.filter(tailor=tailor)
+        page, next_cursor = review_page(reviews)
+        context = {'tailor': tailor, 'reviews': page, 'next_cursor': next_cursor,
+                   'histogram': rating_histogram(reviews)}
+    return render(request, TAILOR_FRAGMENT_TEMPLATES[section], context)
+
+async def tailor_api(request, tailor_id):
+    # condition() would call the etag function on the event loop, where the ORM is off limits
+    etag = await sync_to_async(_tailor_api_etag)(request, tailor_id)
+    etag = quote_etag(etag) if etag else None
+    if etag:
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+
+    tailor = await aget_object_or_404(Tailor.objects.select_related('user'), id=tailor_id)
+    section = request.GET.get('section')
+
+    if section in TAILOR_FRAGMENT_TEMPLATES:
+        # Templates read the visitor's customer profile lazily, so they render on a thread
+        response = await sync_to_async(_render_tailor_fragment)(request, tailor, section)
+        patch_cache_control(response, private=True, max_age=TAILOR_API_MAX_AGE)
+        if etag:
+            response.headers['ETag'] = etag
+        return response
+
+    if section:
+        return JsonResponse({'error': f'Unknown section: {section}'}, status=400)
+
+    data = {
+        'id': tailor.id,
+        'name': tailor.user.get_full_name(),
+        'business_name': tailor.business_name,
+        'business_location': tailor.business_location,
+        'category': tailor.category,
+        'expertise': tailor.expertise,
+        'price': str(tailor.price),
+        'average_rating': tailor.average_rating,
+        'profile_picture': request.build_absolute_uri(tailor.profile_picture.url) if tailor.profile_picture else None,
+        'fabrics': [
+            {
+                'id': fabric.id,
+                'name': fabric.name,
+                'fabric_type': fabric.fabric_type,
+                'color': fabric.color,
+                'price_per_meter': str(fabric.price_per_meter),
+                'length_available': str(fabric.length_available),
+                'image': request.build_absolute_uri(fabric.image.url) if fabric.image else None,
+            }
+            async for fabric in tailor.fabrics.filter(is_available=True)
+        ],
+        'embroidery': [
+            {
+                'id': design.id,
+                'title': design.title,
+                'fabric_type': design.fabric_type,
+                'price': str(design.price),
+                'design_image': request.build_absolute_uri(design.design_image.url) if design.design_image else None,
+            }
+            async for design in tailor.embroideries.all()
+        ],
+    }
+    response = JsonResponse(data)
+    patch_cache_control(response, public=True, max_age=TAILOR_API_MAX_AGE)
+    return response